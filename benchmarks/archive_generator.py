@@ -0,0 +1,117 @@
+"""Generate synthetic zip archives of text files with urls.
+
+Usage:
+    python -m benchmarks.archive_generator output.zip [--members N]
+        [--member-size BYTES] [--url-density URLS_PER_KIB]
+        [--duplicate-ratio RATIO] [--non-utf8-share SHARE] [--seed N]
+
+Archives are reproducible: the same spec always gives the same bytes.
+"""
+import argparse
+import io
+import random
+import zipfile
+from typing import NamedTuple
+
+WORDS = (
+    "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod "
+    "tempor incididunt ut labore et dolore magna aliqua: see, e.g., "
+    "http: or ftp without a host, пример текста"
+).split()
+INVALID_UTF8 = b"\xff\xfe"
+
+
+class ArchiveSpec(NamedTuple):
+    """Shape of a synthetic archive.
+
+    Attributes:
+        members (int): The number of files.
+        member_size (int): The approximate size of every file in bytes.
+        url_density (float): The number of urls per KiB of text.
+        duplicate_ratio (float): The share of urls repeating an earlier
+            url of the archive.
+        non_utf8_share (float): The share of files with invalid utf-8,
+            which are reported as undecodable.
+        seed (int): The seed of the random generator.
+    """
+
+    members: int = 200
+    member_size: int = 64 * 1024
+    url_density: float = 2.0
+    duplicate_ratio: float = 0.3
+    non_utf8_share: float = 0.05
+    seed: int = 0
+
+
+def generate_archive(spec: ArchiveSpec) -> tuple[bytes, set[str]]:
+    """Build a zip archive following the spec.
+
+    Returns:
+        tuple: The archive and the distinct urls of its valid utf-8 files,
+        which parsing the archive must find.
+    """
+    rng = random.Random(spec.seed)
+    emitted = []
+    expected = set()
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zipf:
+        for index in range(spec.members):
+            url_count = round(spec.member_size / 1024 * spec.url_density)
+            urls = []
+            for _ in range(url_count):
+                if emitted and rng.random() < spec.duplicate_ratio:
+                    urls.append(rng.choice(emitted))
+                    continue
+                number = len(emitted)
+                url = (
+                    f"https://host{number}.example{number % 97}.com"
+                    f"/path/{number}?q={rng.randrange(10**6)}"
+                )
+                emitted.append(url)
+                urls.append(url)
+            # Words are 6 bytes long on average, separators included.
+            words = rng.choices(WORDS, k=max(spec.member_size // 6, 1))
+            for url in urls:
+                words.insert(rng.randrange(len(words) + 1), url)
+            content = " ".join(words).encode()
+            if rng.random() < spec.non_utf8_share:
+                middle = len(content) // 2
+                content = content[:middle] + INVALID_UTF8 + content[middle:]
+            else:
+                expected.update(urls)
+            zipf.writestr(f"member{index:06d}.txt", content)
+    return buffer.getvalue(), expected
+
+
+def add_spec_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add options for every field of `ArchiveSpec` to a parser."""
+    defaults = ArchiveSpec()
+    for name, value in defaults._asdict().items():
+        parser.add_argument(
+            "--" + name.replace("_", "-"),
+            type=type(value),
+            default=value,
+        )
+
+
+def spec_from_arguments(arguments: argparse.Namespace) -> ArchiveSpec:
+    """Build a spec from options added by `add_spec_arguments`."""
+    return ArchiveSpec(
+        **{name: getattr(arguments, name) for name in ArchiveSpec._fields}
+    )
+
+
+def main() -> None:
+    """Write an archive generated from command line options."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("output")
+    add_spec_arguments(parser)
+    arguments = parser.parse_args()
+    archive, expected = generate_archive(spec_from_arguments(arguments))
+    with open(arguments.output, "wb") as file:
+        file.write(archive)
+    print(f"{len(archive)} bytes, {len(expected)} distinct urls")
+
+
+if __name__ == "__main__":
+    main()
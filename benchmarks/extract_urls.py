@@ -0,0 +1,116 @@
+"""Compare `UrlExtractor` with a regex over the decoded text.
+
+Usage:
+    python -m benchmarks.extract_urls [file ...]
+
+Synthetic corpora are always measured, files given on the command line,
+e.g. HTML pages or crawler dumps, are measured as real-world corpora.
+Both engines must find the same urls, the run fails otherwise.
+"""
+import io
+import json
+import random
+import sys
+import time
+from typing import Callable
+
+from web_resource_watchdog.utils.url_extractor import (
+    URL_OVERLAP,
+    URL_PATTERN,
+    UrlExtractor,
+)
+
+CORPUS_SIZE = 8 * 1024 * 1024
+CHUNK_SIZE = 1024 * 1024
+WORDS = (
+    "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod "
+    "tempor incididunt ut labore et dolore magna aliqua: see, e.g., "
+    "http: or ftp without a host, пример текста"
+).split()
+
+
+def synthetic_corpora() -> dict[str, bytes]:
+    """Build text with few urls, text full of urls and JSON lines."""
+    rng = random.Random(0)
+
+    def text(url_every: int) -> bytes:
+        parts = []
+        size = 0
+        while size < CORPUS_SIZE:
+            if rng.randrange(url_every) == 0:
+                word = f"https://host{rng.randrange(10**6)}.example.com/p?q=1"
+            else:
+                word = rng.choice(WORDS)
+            parts.append(word)
+            size += len(word) + 1
+        return " ".join(parts).encode()
+
+    lines = []
+    size = 0
+    while size < CORPUS_SIZE:
+        line = json.dumps(
+            {
+                "title": " ".join(rng.choices(WORDS, k=30)),
+                "url": f"http://site{rng.randrange(10**6)}.org/a/b",
+            },
+            ensure_ascii=False,
+        )
+        lines.append(line)
+        size += len(line) + 1
+    return {
+        "sparse text": text(10_000),
+        "dense text": text(5),
+        "json lines": "\n".join(lines).encode(),
+    }
+
+
+def measure(function: Callable[[], set]) -> tuple[float, set]:
+    """Return the best time of three runs and the found urls."""
+    best = float("inf")
+    for _ in range(3):
+        started = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def run(corpora: dict[str, bytes]) -> None:
+    """Print MB/s of both engines on every corpus, read whole and chunked."""
+    extractor = UrlExtractor()
+    engines = {
+        "regex": lambda data: set(URL_PATTERN.findall(data.decode())),
+        # The fallback used for patterns without an anchor.
+        "regex chunked": lambda data: extractor._find_in_text_stream(
+            io.BytesIO(data), CHUNK_SIZE, URL_OVERLAP
+        ),
+        "extractor": lambda data: set(extractor.findall(data)),
+        "extractor chunked": lambda data: extractor.find_in_stream(
+            io.BytesIO(data), CHUNK_SIZE
+        ),
+    }
+    for name, data in corpora.items():
+        print(f"{name} ({len(data) / 2**20:.1f} MiB)")
+        expected = None
+        for engine, function in engines.items():
+            seconds, urls = measure(lambda: function(data))
+            if expected is None:
+                expected = urls
+            elif urls != expected:
+                raise SystemExit(f"{engine} found other urls in {name}.")
+            print(
+                f"  {engine:<18}{len(data) / 2**20 / seconds:>10.1f} MB/s"
+                f"  {len(urls)} urls"
+            )
+
+
+def main() -> None:
+    """Run the benchmark on synthetic corpora and the given files."""
+    corpora = synthetic_corpora()
+    for path in sys.argv[1:]:
+        with open(path, "rb") as file:
+            corpora[path] = file.read()
+    run(corpora)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Measure the cold start of the API, worker and CLI entry points.
+
+Usage:
+    python -m benchmarks.import_time [--output FILE] [--baseline FILE]
+        [--tolerance FRACTION] [--repeats N]
+
+Every entry point is started in a fresh interpreter, the best of
+`--repeats` runs is taken and the start of a bare interpreter is
+subtracted, so only the imports and the app setup are measured:
+
+- import: `import web_resource_watchdog`;
+- api: `create_app()`, as served by gunicorn;
+- cli: `create_app(api=False)`, as used by `flask db`;
+- worker: `create_worker()`, as loaded by `celery -A`.
+
+The run fails if the worker imports views, error handlers or migrations.
+Results are written and compared like those of `benchmarks.ingest`.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.results import check_baseline, metric, write_results
+
+ENTRY_POINTS = {
+    "import": "import web_resource_watchdog",
+    "api": "from web_resource_watchdog import create_app; create_app()",
+    "cli": "from web_resource_watchdog import create_app; "
+    "create_app(api=False)",
+    "worker": "from web_resource_watchdog import create_worker; "
+    "create_worker()",
+}
+WORKER_EXCLUDED = (
+    "web_resource_watchdog.api_views",
+    "web_resource_watchdog.error_handlers",
+    "flask_migrate",
+    "alembic",
+)
+PRINT_MODULES = "; import sys, json; print(json.dumps(sorted(sys.modules)))"
+
+
+def start(code: str, env: dict) -> tuple[float, list[str]]:
+    """Run code in a fresh interpreter.
+
+    Returns:
+        tuple: The wall time in seconds and the modules imported.
+    """
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-c", code + PRINT_MODULES],
+        capture_output=True,
+        check=True,
+        env=env,
+        text=True,
+    )
+    seconds = time.perf_counter() - started
+    return seconds, json.loads(completed.stdout.splitlines()[-1])
+
+
+def best_start(code: str, env: dict, repeats: int) -> tuple[float, list]:
+    """Return the best wall time of `repeats` starts and the modules."""
+    runs = [start(code, env) for _ in range(repeats)]
+    return min(seconds for seconds, _ in runs), runs[-1][1]
+
+
+def main() -> None:
+    """Start every entry point, write the results and compare them."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--output", default="import-time-results.json")
+    parser.add_argument("--baseline")
+    parser.add_argument("--tolerance", type=float, default=0.15)
+    arguments = parser.parse_args()
+    with tempfile.TemporaryDirectory(prefix="wrw-bench-") as scratch_dir:
+        env = {
+            **os.environ,
+            "FLASK_ENV": "production",
+            "SQLALCHEMY_DATABASE_URI": "sqlite:///"
+            + os.path.join(scratch_dir, "app.sqlite3"),
+        }
+        interpreter, _ = best_start("pass", env, arguments.repeats)
+        metrics = {}
+        modules = {}
+        for name, code in ENTRY_POINTS.items():
+            seconds, modules[name] = best_start(code, env, arguments.repeats)
+            metrics[f"cold_start.{name}_s"] = metric(
+                seconds - interpreter, "s", better="lower"
+            )
+    write_results(
+        arguments.output,
+        metrics,
+        interpreter_s=interpreter,
+        modules={name: len(loaded) for name, loaded in modules.items()},
+    )
+    leaked = [
+        module
+        for module in modules["worker"]
+        if module.startswith(WORKER_EXCLUDED)
+    ]
+    if leaked:
+        raise SystemExit(f"The worker imports {', '.join(leaked)}.")
+    if arguments.baseline:
+        check_baseline(metrics, arguments.baseline, arguments.tolerance)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+"""Measure the ingest pipeline on synthetic archives.
+
+Usage:
+    python -m benchmarks.ingest [--output FILE] [--baseline FILE]
+        [--tolerance FRACTION] [--rows N] [archive options]
+
+Archive options are those of `benchmarks.archive_generator`. Every
+scenario is measured as the best of three runs:
+
+- extract: `parse_archive` over the generated zip, in uncompressed MB/s;
+- insert: `WebResource.bulk_insert` and `WebResource.bulk_create` of
+  `--rows` urls, in rows/s, on a temporary SQLite database and, if
+  `BENCH_POSTGRES_URI` is set, on that PostgreSQL database;
+- e2e: the time from posting the archive to `add_resource_from_zip`
+  until its urls are committed, with Celery tasks run eagerly. Like the
+  pipeline it needs the Redis result backend and is skipped without it.
+
+The app is pointed to a temporary SQLite database and upload spool before
+it is imported, so no real data is touched. Tables are created and
+dropped in the `BENCH_POSTGRES_URI` database, it must be a scratch one,
+the run stops if it has any tables.
+Use a scratch Redis too, the e2e runs post archives of new seeds, so they
+are not taken for repeated uploads or known urls, but leave keys behind.
+
+Results are written as JSON to `--output`. With `--baseline`, a results
+file of an earlier run, every metric is compared with the stored one and
+the run fails if any is worse by more than `--tolerance`.
+"""
+import argparse
+import io
+import os
+import shutil
+import tempfile
+import time
+import zipfile
+from typing import Any, Callable
+
+SCRATCH_DIR = tempfile.mkdtemp(prefix="wrw-bench-")
+APP_DATABASE_URI = "sqlite:///" + os.path.join(SCRATCH_DIR, "app.sqlite3")
+os.environ["FLASK_ENV"] = "production"
+os.environ["SQLALCHEMY_DATABASE_URI"] = APP_DATABASE_URI
+os.environ["UPLOAD_SPOOL_DIR"] = os.path.join(SCRATCH_DIR, "spool")
+
+from redis import RedisError  # noqa: E402
+from sqlalchemy import create_engine, inspect  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from benchmarks.archive_generator import (  # noqa: E402
+    ArchiveSpec,
+    add_spec_arguments,
+    generate_archive,
+    spec_from_arguments,
+)
+from benchmarks.results import (  # noqa: E402
+    check_baseline,
+    metric,
+    write_results,
+)
+from web_resource_watchdog import celery_app, db, flask_app  # noqa: E402
+from web_resource_watchdog.models import WebResource  # noqa: E402
+from web_resource_watchdog.settings import Config  # noqa: E402
+from web_resource_watchdog.utils.zipfile import parse_archive  # noqa: E402
+
+REPEATS = 3
+CHUNK_SIZE = 1024 * 1024
+
+
+def best_of(
+    function: Callable[[], Any], setup: Callable[[], None] | None = None
+) -> tuple[float, Any]:
+    """Return the best time of `REPEATS` runs and the last result.
+
+    `setup` runs before every run and is not timed.
+    """
+    best = float("inf")
+    result = None
+    for _ in range(REPEATS):
+        if setup is not None:
+            setup()
+        started = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def measure_extract(archive: bytes, expected: set[str]) -> dict:
+    """Measure url extraction from the archive in uncompressed MB/s."""
+    with zipfile.ZipFile(io.BytesIO(archive)) as zipf:
+        size = sum(info.file_size for info in zipf.infolist())
+    seconds, result = best_of(
+        lambda: parse_archive(
+            archive, chunk_size=CHUNK_SIZE, overlap=Config.URL_MAX_LENGTH
+        )
+    )
+    if set(result["data"]) != expected:
+        raise SystemExit("Extraction found other urls than generated.")
+    return {"extract.mb_per_s": metric(size / 2**20 / seconds, "MB/s")}
+
+
+def measure_insert(name: str, database_uri: str, urls: list[str]) -> dict:
+    """Measure bulk inserts of new urls into a database in rows/s."""
+    engine = create_engine(database_uri)
+    if inspect(engine).get_table_names():
+        engine.dispose()
+        raise SystemExit(f"The {name} benchmark database must have no tables.")
+    metrics = {}
+    try:
+        for method in ("bulk_insert", "bulk_create"):
+
+            def reset() -> None:
+                db.metadata.drop_all(engine)
+                db.metadata.create_all(engine)
+
+            def insert() -> int:
+                with Session(engine) as session:
+                    getattr(WebResource, method)(urls, session=session)
+                    return session.query(WebResource).count()
+
+            seconds, count = best_of(insert, reset)
+            if count != len(urls):
+                raise SystemExit(f"{method} on {name} lost urls.")
+            metrics[f"insert.{name}.{method}.rows_per_s"] = metric(
+                len(urls) / seconds, "rows/s"
+            )
+    finally:
+        db.metadata.drop_all(engine)
+        engine.dispose()
+    return metrics
+
+
+def measure_e2e(spec: ArchiveSpec) -> dict:
+    """Measure the latency from upload to committed urls in seconds.
+
+    Every run posts an archive of another seed, so uploads are neither
+    deduplicated nor their urls known.
+    """
+    try:
+        celery_app.backend.client.ping()
+    except RedisError:
+        print("e2e: skipped, the Redis result backend is unavailable.")
+        return {}
+    client = flask_app.test_client()
+    celery_app.conf.task_always_eager = True
+    best = float("inf")
+    try:
+        with flask_app.app_context():
+            for run in range(REPEATS):
+                archive, expected = generate_archive(
+                    spec._replace(seed=spec.seed + run + 1)
+                )
+                db.drop_all()
+                db.create_all()
+                started = time.perf_counter()
+                response = client.post(
+                    "/api/v1/add_resource_from_zip/",
+                    data=archive,
+                    content_type="application/zip",
+                )
+                best = min(best, time.perf_counter() - started)
+                if response.status_code != 201:
+                    raise SystemExit(f"Upload failed: {response.json}.")
+                if WebResource.query.count() != len(expected):
+                    raise SystemExit("Upload did not commit all urls.")
+                db.session.remove()
+            db.drop_all()
+    finally:
+        celery_app.conf.task_always_eager = False
+    return {"e2e.sqlite.latency_s": metric(best, "s", better="lower")}
+
+
+def main() -> None:
+    """Run all scenarios, write the results and compare them."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--output", default="ingest-results.json")
+    parser.add_argument("--baseline")
+    parser.add_argument("--tolerance", type=float, default=0.15)
+    add_spec_arguments(parser)
+    arguments = parser.parse_args()
+    spec = spec_from_arguments(arguments)
+    urls = [
+        f"https://host{index}.example.com/page?id={index}"
+        for index in range(arguments.rows)
+    ]
+    databases = {
+        "sqlite": "sqlite:///" + os.path.join(SCRATCH_DIR, "insert.sqlite3")
+    }
+    if os.getenv("BENCH_POSTGRES_URI"):
+        databases["postgresql"] = os.environ["BENCH_POSTGRES_URI"]
+    try:
+        archive, expected = generate_archive(spec)
+        metrics = measure_extract(archive, expected)
+        for name, database_uri in databases.items():
+            metrics.update(measure_insert(name, database_uri, urls))
+        metrics.update(measure_e2e(spec))
+    finally:
+        shutil.rmtree(SCRATCH_DIR, ignore_errors=True)
+    write_results(
+        arguments.output,
+        metrics,
+        spec=spec._asdict(),
+        rows=arguments.rows,
+    )
+    if arguments.baseline:
+        check_baseline(metrics, arguments.baseline, arguments.tolerance)
+
+
+if __name__ == "__main__":
+    main()
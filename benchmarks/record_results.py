@@ -0,0 +1,82 @@
+"""Measure throughput of `WebResourceStatus.record_results`.
+
+Usage:
+    python -m benchmarks.record_results [rows]
+
+The database is a temporary SQLite file unless `BENCH_DATABASE_URI` points
+to another one, e.g. a scratch PostgreSQL database. It must have no tables,
+the tables created for the run are dropped after it.
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import create_engine, inspect, select
+from sqlalchemy.orm import Session
+
+from web_resource_watchdog import db
+from web_resource_watchdog.models import WebResource, WebResourceStatus
+
+BATCH_SIZES = (1, 100, 10_000)
+
+
+def run(rows: int, session: Session) -> dict[int, float]:
+    """Record `rows` results per batch size and return rows per second."""
+    resource_ids = list(session.scalars(select(WebResource.id)))
+    throughput = {}
+    for batch_size in BATCH_SIZES:
+        # Small batches are slow, keep their run time comparable.
+        count = min(rows, batch_size * 1000)
+        now = datetime.now(timezone.utc)
+        results = [
+            (
+                resource_ids[index % len(resource_ids)],
+                200,
+                0.1,
+                now + timedelta(microseconds=index),
+                True,
+            )
+            for index in range(count)
+        ]
+        started = time.perf_counter()
+        WebResourceStatus.record_results(
+            results, batch_size=batch_size, session=session
+        )
+        throughput[batch_size] = count / (time.perf_counter() - started)
+    return throughput
+
+
+def main() -> None:
+    """Run the benchmark and print rows per second per batch size."""
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(
+            os.getenv(
+                "BENCH_DATABASE_URI",
+                "sqlite:///" + os.path.join(directory, "bench.sqlite3"),
+            )
+        )
+        if inspect(engine).get_table_names():
+            engine.dispose()
+            raise SystemExit("The benchmark database must have no tables.")
+        db.metadata.create_all(engine)
+        try:
+            with Session(engine) as session:
+                WebResource.bulk_insert(
+                    (
+                        f"https://host{index}.example.com/"
+                        for index in range(rows)
+                    ),
+                    session=session,
+                )
+                for batch_size, value in run(rows, session).items():
+                    print(f"batch_size={batch_size:>6}  {value:>10.0f} rows/s")
+        finally:
+            db.metadata.drop_all(engine)
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Results files shared by the benchmarks.
+
+A results file is a JSON object describing the run, with the measured
+values under "metrics", each stored with its unit and whether higher or
+lower is better, so later runs can be compared with it.
+"""
+import json
+import platform
+import subprocess
+from datetime import datetime, timezone
+
+
+def metric(value: float, unit: str, better: str = "higher") -> dict:
+    """Build a metric entry of the results file."""
+    return {"value": value, "unit": unit, "better": better}
+
+
+def compare(metrics: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Print changes against a baseline and return regressed metrics."""
+    regressions = []
+    for name, entry in metrics.items():
+        stored = baseline.get(name)
+        if stored is None or not stored["value"]:
+            print(f"  {name:<40} no baseline")
+            continue
+        change = entry["value"] / stored["value"] - 1
+        worse = -change if entry["better"] == "higher" else change
+        flag = "REGRESSION" if worse > tolerance else ""
+        print(
+            f"  {name:<40}{stored['value']:>12.3f}{entry['value']:>12.3f}"
+            f"{change:>+9.1%}  {flag}"
+        )
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+def git_commit() -> str | None:
+    """Return the checked out commit, None outside a git tree."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def write_results(output: str, metrics: dict, **details) -> None:
+    """Write the metrics with the run details and print them."""
+    results = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        **details,
+        "metrics": metrics,
+    }
+    with open(output, "w") as file:
+        json.dump(results, file, indent=2)
+    for name, entry in metrics.items():
+        print(f"{name:<40}{entry['value']:>12.3f} {entry['unit']}")
+
+
+def check_baseline(metrics: dict, baseline: str, tolerance: float) -> None:
+    """Compare the metrics with a results file, exit on regressions."""
+    with open(baseline) as file:
+        stored = json.load(file)["metrics"]
+    print(f"Compared with {baseline}:")
+    print(f"  {'metric':<40}{'baseline':>12}{'current':>12}{'change':>9}")
+    regressions = compare(metrics, stored, tolerance)
+    if regressions:
+        raise SystemExit(f"Regressed: {', '.join(regressions)}.")
@@ -0,0 +1,54 @@
+"""Measure throughput of `split_host`.
+
+Usage:
+    python -m benchmarks.split_host [hosts]
+
+Hosts are split once uncached, then repeatedly through the LRU cache, as
+on bulk paths where most urls share a few thousand hosts.
+"""
+import sys
+import time
+
+from web_resource_watchdog.utils.public_suffix import (
+    get_suffix_trie,
+    split_host,
+)
+
+SUFFIXES = ("com", "co.uk", "org", "com.br", "de", "xn--p1ai", "github.io")
+ROUNDS = 20
+
+
+def run(count: int) -> dict[str, float]:
+    """Split `count` distinct hosts and return splits per second."""
+    hosts = [
+        f"www.host{index}.{SUFFIXES[index % len(SUFFIXES)]}"
+        for index in range(count)
+    ]
+    started = time.perf_counter()
+    get_suffix_trie()
+    throughput = {"trie_compile_ms": (time.perf_counter() - started) * 1000}
+    split_host.cache_clear()
+    started = time.perf_counter()
+    for host in hosts:
+        split_host.__wrapped__(host)
+    throughput["uncached"] = count / (time.perf_counter() - started)
+    for host in hosts:
+        split_host(host)
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        for host in hosts:
+            split_host(host)
+    throughput["cached"] = count * ROUNDS / (time.perf_counter() - started)
+    return throughput
+
+
+def main() -> None:
+    """Run the benchmark and print splits per second."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    for name, value in run(count).items():
+        unit = "" if name.endswith("_ms") else " splits/s"
+        print(f"{name:<16}{value:>12.1f}{unit}")
+
+
+if __name__ == "__main__":
+    main()
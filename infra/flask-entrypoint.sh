@@ -4,13 +4,17 @@ until cd /app/; do
   echo "Waiting for server volume..."
 done
 
+# Metrics of all gunicorn workers are shared through this directory
+rm -rf "$PROMETHEUS_MULTIPROC_DIR" && mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+
 # Apply database migrations
 echo "Applying database migrations ..."
-until flask db upgrade; do
+until flask --app "web_resource_watchdog:create_app(api=False)" db upgrade; do
   echo "Waiting for db to be ready..."
   sleep 2
 done
 
 # Start server
 echo "Starting server ..."
-gunicorn -w "$WORKERS" web_resource_watchdog:flask_app -b 0.0.0.0:"$GUNICORN_PORT"
+# Threads keep event streams from blocking whole workers
+gunicorn -c infra/gunicorn.conf.py -w "$WORKERS" --threads "${THREADS:-16}" "web_resource_watchdog:create_app()" -b 0.0.0.0:"$GUNICORN_PORT"
@@ -0,0 +1,7 @@
+#!/bin/sh
+
+# The upload limit of the app plus room for multipart headers, see
+# UPLOAD_MAX_SIZE and UPLOAD_MAX_CONTENT_LENGTH in settings.py
+export NGINX_UPLOAD_MAX_BODY_SIZE=$((${UPLOAD_MAX_SIZE:-536870912} + 1048576))
+
+exec /docker-entrypoint.sh nginx -g "daemon off;"
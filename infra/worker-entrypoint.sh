@@ -4,4 +4,7 @@ until cd /app/; do
   echo "Waiting for server volume..."
 done
 
+# Metrics of all prefork processes are shared through this directory
+rm -rf "$PROMETHEUS_MULTIPROC_DIR" && mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+
 celery -A web_resource_watchdog.celery_app worker --loglevel=info
@@ -0,0 +1,145 @@
+"""Move screenshots to a content-addressed store
+
+Revision ID: a41f6c3d9e27
+Revises: 5b2d7c9e4f31
+Create Date: 2026-10-18 11:12:44.208531
+
+"""
+import hashlib
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "a41f6c3d9e27"
+down_revision = "5b2d7c9e4f31"
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 100
+IMAGE_MAGICS = (
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF8", "image/gif"),
+    (b"RIFF", "image/webp"),
+)
+
+web_resource = sa.table(
+    "web_resource",
+    sa.column("id", sa.Integer),
+    sa.column("screenshot", sa.LargeBinary),
+    sa.column("screenshot_sha256", sa.String),
+)
+screenshot = sa.table(
+    "screenshot",
+    sa.column("sha256", sa.String),
+    sa.column("content_type", sa.String),
+    sa.column("size", sa.Integer),
+    sa.column("content", sa.LargeBinary),
+)
+
+
+def _content_type(content: bytes) -> str:
+    """Guess the media type of a stored screenshot from its first bytes."""
+    for magic, content_type in IMAGE_MAGICS:
+        if content.startswith(magic):
+            return content_type
+    return "application/octet-stream"
+
+
+def upgrade():
+    op.create_table(
+        "screenshot",
+        sa.Column("sha256", sa.String(length=64), nullable=False),
+        sa.Column("content_type", sa.String(), nullable=False),
+        sa.Column("size", sa.Integer(), nullable=False),
+        sa.Column("content", sa.LargeBinary(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("(CURRENT_TIMESTAMP)"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("sha256"),
+    )
+    with op.batch_alter_table("web_resource", schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column("screenshot_sha256", sa.String(length=64), nullable=True)
+        )
+
+    # Copy the blobs in keyset batches, each distinct image once.
+    connection = op.get_bind()
+    stored = set()
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.select(web_resource.c.id, web_resource.c.screenshot)
+            .where(
+                web_resource.c.id > last_id,
+                web_resource.c.screenshot.is_not(None),
+            )
+            .order_by(web_resource.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        for resource_id, content in rows:
+            content = bytes(content)
+            sha256 = hashlib.sha256(content).hexdigest()
+            if sha256 not in stored:
+                connection.execute(
+                    screenshot.insert().values(
+                        sha256=sha256,
+                        content_type=_content_type(content),
+                        size=len(content),
+                        content=content,
+                    )
+                )
+                stored.add(sha256)
+            connection.execute(
+                web_resource.update()
+                .where(web_resource.c.id == resource_id)
+                .values(screenshot_sha256=sha256)
+            )
+        last_id = rows[-1].id
+
+    with op.batch_alter_table("web_resource", schema=None) as batch_op:
+        batch_op.create_index(
+            batch_op.f("ix_web_resource_screenshot_sha256"),
+            ["screenshot_sha256"],
+            unique=False,
+        )
+        batch_op.create_foreign_key(
+            "fk_web_resource_screenshot_sha256",
+            "screenshot",
+            ["screenshot_sha256"],
+            ["sha256"],
+        )
+        batch_op.drop_column("screenshot")
+
+
+def downgrade():
+    with op.batch_alter_table("web_resource", schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column("screenshot", sa.LargeBinary(), nullable=True)
+        )
+
+    connection = op.get_bind()
+    connection.execute(
+        web_resource.update()
+        .where(web_resource.c.screenshot_sha256.is_not(None))
+        .values(
+            screenshot=sa.select(screenshot.c.content)
+            .where(screenshot.c.sha256 == web_resource.c.screenshot_sha256)
+            .scalar_subquery()
+        )
+    )
+
+    with op.batch_alter_table("web_resource", schema=None) as batch_op:
+        batch_op.drop_constraint(
+            "fk_web_resource_screenshot_sha256", type_="foreignkey"
+        )
+        batch_op.drop_index(batch_op.f("ix_web_resource_screenshot_sha256"))
+        batch_op.drop_column("screenshot_sha256")
+
+    op.drop_table("screenshot")
@@ -1,9 +1,15 @@
+import asyncio
 import sys
+import threading
+import time
+from collections import defaultdict, deque
 from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
 
 import pytest
 from dotenv import load_dotenv
 from mixer.backend.flask import mixer as _mixer
+from redis import RedisError
 
 load_dotenv()
 
@@ -11,7 +17,7 @@ BASE_DIR = Path(__file__).resolve(strict=True).parent.parent
 sys.path.append(str(BASE_DIR))
 
 try:
-    from web_resource_watchdog import db, flask_app
+    from web_resource_watchdog import celery_app, db, flask_app
     from web_resource_watchdog.models import WebResource
 except NameError:
     raise AssertionError(
@@ -55,6 +61,14 @@ def client(_app):
     return _app.test_client()
 
 
+@pytest.fixture
+def eager_celery():
+    """Fixture running Celery tasks synchronously in the test process."""
+    celery_app.conf.task_always_eager = True
+    yield celery_app
+    celery_app.conf.task_always_eager = False
+
+
 @pytest.fixture
 def mixer():
     """Fixture for initializing the mixer with a Flask application."""
@@ -66,3 +80,253 @@ def mixer():
 def short_python_url(mixer):
     """Fixture for creating a short URL for Python's official website."""
     return mixer.blend(WebResource, full_url="https://www.python.org")
+
+
+class StandInServer:
+    """Local HTTP server with controllable latency and failures.
+
+    The response is driven by query parameters of the requested url:
+    `status` sets the status code, `head_status` overrides it for HEAD
+    requests, `delay` sleeps before answering and `drop` closes the
+    connection without a response.
+    """
+
+    def __init__(self):
+        self.connections = 0
+        self.requests = []
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever)
+
+    def start(self):
+        """Start the server in a background thread."""
+        self.thread.start()
+        self.server = asyncio.run_coroutine_threadsafe(
+            asyncio.start_server(self.handle, "127.0.0.1", 0), self.loop
+        ).result()
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    def stop(self):
+        """Stop the server, its connections and its event loop."""
+        asyncio.run_coroutine_threadsafe(self.shutdown(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+    async def shutdown(self):
+        """Close the server and cancel connection handlers."""
+        self.server.close()
+        handlers = asyncio.all_tasks() - {asyncio.current_task()}
+        for handler in handlers:
+            handler.cancel()
+        await asyncio.gather(*handlers, return_exceptions=True)
+
+    def url(self, path: str = "/") -> str:
+        """Return an url of the server."""
+        return f"http://127.0.0.1:{self.port}{path}"
+
+    async def handle(self, reader, writer):
+        """Answer keep-alive HTTP requests of a single connection."""
+        self.connections += 1
+        try:
+            while request_line := await reader.readline():
+                method, path, _ = request_line.decode().split()
+                while await reader.readline() not in (b"\r\n", b""):
+                    pass
+                self.requests.append((method, path))
+                params = parse_qs(urlsplit(path).query)
+                await asyncio.sleep(float(params.get("delay", [0])[0]))
+                if "drop" in params:
+                    break
+                status = params.get("status", ["200"])[0]
+                if method == "HEAD":
+                    status = params.get("head_status", [status])[0]
+                writer.write(
+                    f"HTTP/1.1 {status} Status\r\n"
+                    "Content-Length: 0\r\n\r\n".encode()
+                )
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+@pytest.fixture
+def stand_in_server():
+    """Fixture for a local HTTP server to check availability against."""
+    server = StandInServer()
+    server.start()
+    yield server
+    server.stop()
+
+
+def _encode(value) -> bytes:
+    """Encode a value the way Redis stores it."""
+    return value if isinstance(value, bytes) else str(value).encode()
+
+
+class FakeRedis:
+    """In-memory stand-in for the Redis commands the app uses.
+
+    Other commands raise `RedisError` like an unreachable server, so the
+    code under test takes its fail-open path. Expiry is not simulated.
+    """
+
+    def __init__(self):
+        self.values = {}
+        self.subscribers = defaultdict(list)
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        raise RedisError(f"FakeRedis does not support {name}.")
+
+    def get(self, key: str) -> bytes | None:
+        """Return a string value."""
+        return self.values.get(key)
+
+    def set(self, key: str, value, ex=None, nx: bool = False) -> bool | None:
+        """Set a string value, unless it exists with `nx`."""
+        if nx and key in self.values:
+            return None
+        self.values[key] = _encode(value)
+        return True
+
+    def delete(self, *keys: str) -> int:
+        """Delete keys and return how many existed."""
+        return sum(self.values.pop(key, None) is not None for key in keys)
+
+    def exists(self, *keys: str) -> int:
+        """Return how many of the keys exist."""
+        return sum(key in self.values for key in keys)
+
+    def expire(self, key: str, seconds: int) -> bool:
+        """Pretend to set a timeout on a key."""
+        return key in self.values
+
+    def hincrby(self, key: str, field: str, amount: int = 1) -> int:
+        """Increment a hash field and return its new value."""
+        fields = self.values.setdefault(key, {})
+        value = int(fields.get(_encode(field), 0)) + amount
+        fields[_encode(field)] = _encode(value)
+        return value
+
+    def hgetall(self, key: str) -> dict[bytes, bytes]:
+        """Return all fields of a hash."""
+        return dict(self.values.get(key, {}))
+
+    def lpush(self, key: str, *values) -> int:
+        """Prepend values to a list and return its length."""
+        items = self.values.setdefault(key, [])
+        for value in values:
+            items.insert(0, _encode(value))
+        return len(items)
+
+    def lrange(self, key: str, start: int, end: int) -> list[bytes]:
+        """Return a range of a list, `end` included."""
+        items = self.values.get(key, [])
+        stop = None if end == -1 else end + 1
+        return items[start:stop]
+
+    def sadd(self, key: str, *values) -> int:
+        """Add members to a set and return how many were new."""
+        members = self.values.setdefault(key, set())
+        new = {_encode(value) for value in values} - members
+        members.update(new)
+        return len(new)
+
+    def srem(self, key: str, *values) -> int:
+        """Remove members from a set and return how many existed."""
+        members = self.values.get(key, set())
+        removed = {_encode(value) for value in values} & members
+        members.difference_update(removed)
+        return len(removed)
+
+    def smismember(self, key: str, values: list) -> list[int]:
+        """Return whether each value is a member of a set."""
+        members = self.values.get(key, set())
+        return [int(_encode(value) in members) for value in values]
+
+    def publish(self, channel: str, message) -> int:
+        """Queue a message for subscribers of a channel."""
+        for queue in self.subscribers[channel]:
+            queue.append(
+                {"type": "message", "channel": channel, "data": message}
+            )
+        return len(self.subscribers[channel])
+
+    def pipeline(self) -> "FakePipeline":
+        """Return a pipeline of commands."""
+        return FakePipeline(self)
+
+    def pubsub(self, ignore_subscribe_messages: bool = False):
+        """Return a subscription without channels."""
+        return FakePubSub(self)
+
+
+class FakePipeline:
+    """Commands of a `FakeRedis` queued until `execute`."""
+
+    def __init__(self, client: FakeRedis):
+        self.client = client
+        self.commands = []
+
+    def __enter__(self) -> "FakePipeline":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.commands.clear()
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        def queue(*args, **kwargs) -> "FakePipeline":
+            self.commands.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    def execute(self) -> list:
+        """Run the queued commands and return their results."""
+        commands, self.commands = self.commands, []
+        return [
+            getattr(self.client, name)(*args, **kwargs)
+            for name, args, kwargs in commands
+        ]
+
+
+class FakePubSub:
+    """Subscription to channels of a `FakeRedis`."""
+
+    def __init__(self, client: FakeRedis):
+        self.client = client
+        self.messages = deque()
+        self.channels = []
+
+    def subscribe(self, *channels: str) -> None:
+        """Receive messages published to channels."""
+        for channel in channels:
+            self.client.subscribers[channel].append(self.messages)
+            self.channels.append(channel)
+
+    def get_message(self, timeout: float = 0.0) -> dict | None:
+        """Return the next message, None after `timeout` without one."""
+        if self.messages:
+            return self.messages.popleft()
+        time.sleep(timeout)
+        return None
+
+    def close(self) -> None:
+        """Stop receiving messages."""
+        for channel in self.channels:
+            self.client.subscribers[channel].remove(self.messages)
+        self.channels.clear()
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    """Fixture replacing the Redis client of the result backend."""
+    client = FakeRedis()
+    monkeypatch.setattr(celery_app.backend, "client", client)
+    return client
@@ -20,14 +20,15 @@ def test_add_resource(client):
         "fail_count",
         "full_url",
         "id",
+        "last_success_at",
         "protocol",
         "query_params",
-        "screenshot",
+        "screenshot_sha256",
         "url_path",
     ], (
         "POST request body to add_resource must contain "
-        "`created, domain, domain_zone full_url, protocol, "
-        "query_params, screenshot, url_path` keys"
+        "`created, domain, domain_zone full_url, last_success_at, "
+        "protocol, query_params, screenshot_sha256, url_path` keys"
     )
     assert got.json == {
         "id": 1,
@@ -35,9 +36,10 @@ def test_add_resource(client):
         "domain_zone": "org",
         "fail_count": 0,
         "full_url": py_url,
+        "last_success_at": None,
         "protocol": "https",
         "query_params": "",
-        "screenshot": None,
+        "screenshot_sha256": None,
         "url_path": "",
     }, "Response is different from expected"
 
@@ -60,3 +62,25 @@ def test_add_resource_empty_body(client):
         "The response body message without a request "
         "body does not comply with the specification."
     )
+
+
+def test_add_resource_rejects_public_suffix_hosts(client):
+    """Test that a host without a domain under its suffix gets 400."""
+    got = client.post(
+        "/api/v1/add_resource/", json={"full_url": "http://co.uk"}
+    )
+    assert (
+        got.status_code == HTTPStatus.BAD_REQUEST
+    ), "POST of an url without a domain must return status code 400."
+    assert got.json == {"error": "Host co.uk has no domain under its suffix."}
+
+
+def test_add_resource_malformed_json(client):
+    """Test that a body which is not JSON gets a JSON error with 400."""
+    got = client.post(
+        "/api/v1/add_resource/",
+        data=b'{"full_url": "https://www.python.org"',
+        content_type="application/json",
+    )
+    assert got.status_code == HTTPStatus.BAD_REQUEST
+    assert got.json == {"error": "Request body is not valid JSON."}
@@ -0,0 +1,280 @@
+import hashlib
+import io
+import os
+import tarfile
+import zipfile
+from http import HTTPStatus
+
+import pytest
+from werkzeug.datastructures import FileStorage
+from werkzeug.test import encode_multipart
+
+import web_resource_watchdog.api_views.v1.resource as resource_views
+from web_resource_watchdog.models import WebResource
+from web_resource_watchdog.settings import Config
+from web_resource_watchdog.utils.spool import get_blob_store
+
+
+def make_zip(members: dict[str, bytes]) -> io.BytesIO:
+    """Build an in-memory zip archive from a name to content mapping."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zipf:
+        for name, content in members.items():
+            zipf.writestr(name, content)
+    buffer.seek(0)
+    return buffer
+
+
+def test_add_resource_from_zip(client, eager_celery):
+    """Test that a zip upload is parsed and its urls are saved."""
+    spool_dir = get_blob_store().root
+    spooled_before = set(os.listdir(spool_dir))
+    got = client.post(
+        "/api/v1/add_resource_from_zip/",
+        data={
+            "file": (
+                make_zip({"links.txt": b"see https://www.python.org/about"}),
+                "links.zip",
+            )
+        },
+        content_type="multipart/form-data",
+    )
+    assert got.status_code == HTTPStatus.CREATED, (
+        "POST to add_resource_from_zip endpoint should return "
+        "status code 201."
+    )
+    assert "task_id" in got.json, "Response must contain `task_id` key"
+    assert [resource.full_url for resource in WebResource.query.all()] == [
+        "https://www.python.org/about"
+    ], "Urls from zip file must be saved"
+    assert (
+        set(os.listdir(spool_dir)) <= spooled_before
+    ), "Spooled upload must be removed after the task finishes"
+
+
+def test_add_resource_from_zip_fan_out(client, eager_celery, monkeypatch):
+    """Test that a zip scanned by several processes saves every url."""
+    monkeypatch.setattr(Config, "ZIP_FAN_OUT_THRESHOLD", 0)
+    monkeypatch.setattr(Config, "ZIP_FAN_OUT_PARALLELISM", 2)
+    urls = [f"https://www.example{index}.com" for index in range(4)]
+    got = client.post(
+        "/api/v1/add_resource_from_zip/",
+        data={
+            "file": (
+                make_zip({f"{url[12:]}.txt": url.encode() for url in urls}),
+                "links.zip",
+            )
+        },
+        content_type="multipart/form-data",
+    )
+    assert got.status_code == HTTPStatus.CREATED
+    assert (
+        sorted(resource.full_url for resource in WebResource.query.all())
+        == urls
+    ), "Urls from every member group must be saved"
+
+
+def test_add_resource_from_tar_gz_sniffs_format(client, eager_celery):
+    """Test that the format is sniffed from the content, not the name."""
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as tar:
+        content = b"see https://www.python.org/about"
+        info = tarfile.TarInfo("links.txt")
+        info.size = len(content)
+        tar.addfile(info, io.BytesIO(content))
+    buffer.seek(0)
+    got = client.post(
+        "/api/v1/add_resource_from_zip/",
+        data={"file": (buffer, "links.dump")},
+        content_type="multipart/form-data",
+    )
+    assert got.status_code == HTTPStatus.CREATED
+    assert [resource.full_url for resource in WebResource.query.all()] == [
+        "https://www.python.org/about"
+    ], "Urls from tar.gz archive must be saved"
+
+
+def test_add_resource_from_zip_rejects_unknown_format(client):
+    """Test that uploads which are not archives are rejected."""
+    got = client.post(
+        "/api/v1/add_resource_from_zip/",
+        data={"file": (io.BytesIO(b"https://www.python.org"), "links.zip")},
+        content_type="multipart/form-data",
+    )
+    assert got.status_code == HTTPStatus.BAD_REQUEST
+    assert got.json == {"error": "Unsupported archive format."}
+
+
+def test_add_resource_from_zip_rejects_zip_bomb(client, monkeypatch):
+    """Test that archives over the size limits get 400, not 500."""
+    monkeypatch.setattr(Config, "ARCHIVE_MAX_SIZE", 1000)
+    got = client.post(
+        "/api/v1/add_resource_from_zip/",
+        data={"file": (make_zip({"zeros.txt": b"0" * 2000}), "bomb.zip")},
+        content_type="multipart/form-data",
+    )
+    assert got.status_code == HTTPStatus.BAD_REQUEST
+    assert got.json == {
+        "error": "Archive is larger than 1000 bytes uncompressed."
+    }
+    got = client.post(
+        "/api/v1/add_resource_from_zip/",
+        data={"file": (io.BytesIO(b"PK\x03\x04broken"), "broken.zip")},
+        content_type="multipart/form-data",
+    )
+    assert got.status_code == HTTPStatus.BAD_REQUEST
+    assert got.json == {"error": "Invalid zip file."}
+
+
+def test_add_resource_from_zip_accepts_raw_body(client, eager_celery):
+    """Test that an archive sent as the raw request body is parsed."""
+    got = client.post(
+        "/api/v1/add_resource_from_zip/",
+        data=make_zip({"links.txt": b"https://www.python.org"}).getvalue(),
+        content_type="application/octet-stream",
+    )
+    assert got.status_code == HTTPStatus.CREATED
+    assert [resource.full_url for resource in WebResource.query.all()] == [
+        "https://www.python.org"
+    ]
+
+
+def test_add_resource_from_zip_limits_upload_size(client, monkeypatch):
+    """Test that large uploads get 413 and leave nothing in the spool."""
+    spool_dir = get_blob_store().root
+    spooled_before = set(os.listdir(spool_dir))
+    archive = make_zip({"links.txt": os.urandom(4096)}).getvalue()
+    monkeypatch.setattr(Config, "UPLOAD_MAX_SIZE", 1024)
+    got = client.post(
+        "/api/v1/add_resource_from_zip/",
+        data=archive,
+        content_type="application/octet-stream",
+    )
+    assert got.status_code == HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+    assert got.json == {"error": "Upload is larger than 1024 bytes."}
+    assert set(os.listdir(spool_dir)) == spooled_before
+    monkeypatch.setattr(Config, "UPLOAD_MAX_CONTENT_LENGTH", 1024)
+    got = client.post(
+        "/api/v1/add_resource_from_zip/",
+        data={"file": (io.BytesIO(archive), "links.zip")},
+        content_type="multipart/form-data",
+    )
+    assert got.status_code == HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+    assert got.json == {"error": "Request body is too large."}
+
+
+def post_archive(client, archive: bytes):
+    """Upload an archive as the raw request body."""
+    return client.post(
+        "/api/v1/add_resource_from_zip/",
+        data=archive,
+        content_type="application/octet-stream",
+    )
+
+
+def test_add_resource_from_zip_deduplicates_uploads(
+    client, eager_celery, fake_redis
+):
+    """Test that a repeat upload is answered with the first task."""
+    archive = make_zip({"links.txt": b"https://www.python.org"}).getvalue()
+    first = post_archive(client, archive)
+    assert first.status_code == HTTPStatus.CREATED
+    spooled_before = set(os.listdir(get_blob_store().root))
+    got = post_archive(client, archive)
+    assert got.status_code == HTTPStatus.OK
+    assert got.json == {
+        "message": "Archive was already uploaded.",
+        "task_id": first.json["task_id"],
+    }
+    assert set(os.listdir(get_blob_store().root)) == spooled_before
+
+
+def test_add_resource_from_zip_reclaims_failed_uploads(
+    client, eager_celery, fake_redis
+):
+    """Test that an upload whose first job failed is processed again."""
+    archive = make_zip({"links.txt": b"https://www.python.org"}).getvalue()
+    first = post_archive(client, archive)
+    fake_redis.set(
+        Config.TASK_STATE_KEY.format(task_id=first.json["task_id"]),
+        '{"event": "failed", "error": "Worker lost."}',
+    )
+    second = post_archive(client, archive)
+    assert second.status_code == HTTPStatus.CREATED
+    assert second.json["task_id"] != first.json["task_id"]
+    got = post_archive(client, archive)
+    assert got.json["task_id"] == second.json["task_id"]
+
+
+def test_add_resource_from_zip_reclaims_lost_uploads(
+    client, eager_celery, fake_redis
+):
+    """Test that an upload whose job was killed is processed again."""
+    archive = make_zip({"links.txt": b"https://www.python.org"}).getvalue()
+    sha256 = hashlib.sha256(archive).hexdigest()
+    fake_redis.set(Config.UPLOAD_DIGEST_KEY.format(sha256=sha256), "killed")
+    got = post_archive(client, archive)
+    assert got.status_code == HTTPStatus.CREATED, "Lost jobs must be redone"
+    assert got.json["task_id"] != "killed"
+
+
+def test_add_resource_from_zip_reuses_running_uploads(
+    client, eager_celery, fake_redis
+):
+    """Test that an upload whose job is still alive is not redone."""
+    archive = make_zip({"links.txt": b"https://www.python.org"}).getvalue()
+    sha256 = hashlib.sha256(archive).hexdigest()
+    fake_redis.set(Config.UPLOAD_DIGEST_KEY.format(sha256=sha256), "running")
+    fake_redis.set(Config.TASK_ALIVE_KEY.format(task_id="running"), 1)
+    got = post_archive(client, archive)
+    assert got.status_code == HTTPStatus.OK
+    assert got.json["task_id"] == "running"
+
+
+def test_add_resource_from_zip_releases_upload_on_dispatch_error(
+    client, fake_redis, monkeypatch
+):
+    """Test that an upload which was not dispatched can be sent again."""
+
+    class BrokenTask:
+        def s(self, *args, **kwargs):
+            raise ConnectionError("Broker is down.")
+
+    monkeypatch.setattr(resource_views, "find_resources", BrokenTask())
+    spooled_before = set(os.listdir(get_blob_store().root))
+    archive = make_zip({"links.txt": b"https://www.python.org"}).getvalue()
+    with pytest.raises(ConnectionError):
+        post_archive(client, archive)
+    assert set(os.listdir(get_blob_store().root)) == spooled_before
+    assert fake_redis.values == {}, "Upload digest must be released"
+
+
+def post_chunked_form(client, archive: bytes):
+    """Upload an archive as a multipart form without a Content-Length."""
+    boundary, body = encode_multipart(
+        {"file": FileStorage(io.BytesIO(archive), "links.zip")}
+    )
+    return client.post(
+        "/api/v1/add_resource_from_zip/",
+        input_stream=io.BytesIO(body),
+        content_type=f"multipart/form-data; boundary={boundary}",
+        headers={"Transfer-Encoding": "chunked"},
+        environ_overrides={"wsgi.input_terminated": True},
+    )
+
+
+def test_add_resource_from_zip_limits_chunked_uploads(
+    client, eager_celery, monkeypatch
+):
+    """Test that chunked uploads are stopped at the request size limit."""
+    spool_dir = get_blob_store().root
+    spooled_before = set(os.listdir(spool_dir))
+    monkeypatch.setattr(Config, "UPLOAD_MAX_CONTENT_LENGTH", 1024)
+    archive = make_zip({"links.txt": os.urandom(4096)}).getvalue()
+    got = post_chunked_form(client, archive)
+    assert got.status_code == HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+    assert got.json == {"error": "Request body is too large."}
+    assert set(os.listdir(spool_dir)) == spooled_before
+    archive = make_zip({"links.txt": b"https://www.python.org"}).getvalue()
+    got = post_chunked_form(client, archive)
+    assert got.status_code == HTTPStatus.CREATED
@@ -0,0 +1,96 @@
+import json
+from http import HTTPStatus
+
+from web_resource_watchdog.models import WebResource
+from web_resource_watchdog.settings import Config
+
+
+def test_add_resources_from_json_array(client, monkeypatch):
+    """Test that every item of a JSON array gets its own result."""
+    monkeypatch.setattr(Config, "BULK_INSERT_BATCH_SIZE", 2)
+    monkeypatch.setattr(Config, "RESOURCES_BATCH_CHUNK_SIZE", 7)
+    WebResource.create({"full_url": "https://www.python.org"})
+    got = client.post(
+        "/api/v1/add_resources/",
+        json=[
+            {"full_url": "https://docs.python.org"},
+            {"full_url": "https://www.python.org"},
+            {"full_url": "not an url"},
+            {"full_url": "https://pypi.org"},
+            {"full_url": "https://docs.python.org"},
+            {"full_url": "https://localhost"},
+        ],
+    )
+    assert got.status_code == HTTPStatus.OK
+    assert [(result["index"], result["status"]) for result in got.json] == [
+        (0, "created"),
+        (1, "duplicate"),
+        (2, "invalid"),
+        (3, "created"),
+        (4, "duplicate"),
+        (5, "invalid"),
+    ], "Results must be returned in order of items"
+    assert got.json[0]["id"] == (
+        WebResource.query.filter_by(full_url="https://docs.python.org")
+        .one()
+        .id
+    )
+    assert WebResource.query.count() == 3
+
+
+def test_add_resources_from_ndjson(client):
+    """Test that NDJSON lines are validated one by one."""
+    got = client.post(
+        "/api/v1/add_resources/",
+        data=b'{"full_url": "https://www.python.org"}\n'
+        b"\n"
+        b"{broken\n"
+        b'{"full_url": "https://docs.python.org"}\n',
+        content_type="application/x-ndjson",
+    )
+    assert got.status_code == HTTPStatus.OK
+    assert got.mimetype == "application/x-ndjson"
+    results = [json.loads(line) for line in got.data.splitlines()]
+    assert [result["status"] for result in results] == [
+        "created",
+        "invalid",
+        "created",
+    ]
+    assert [result["index"] for result in results] == [0, 1, 2]
+
+
+def test_add_resources_reports_malformed_array(client):
+    """Test that a body which stops being JSON ends the results."""
+    got = client.post(
+        "/api/v1/add_resources/",
+        data=b'[{"full_url": "https://www.python.org"} {"full_url"',
+        content_type="application/json",
+    )
+    assert got.json == [
+        {
+            "index": 0,
+            "full_url": "https://www.python.org",
+            "status": "created",
+            "id": 1,
+        },
+        {"status": "invalid", "errors": ["Malformed JSON array."]},
+    ]
+    got = client.post(
+        "/api/v1/add_resources/", data=b"x", content_type="text/plain"
+    )
+    assert got.status_code == HTTPStatus.UNSUPPORTED_MEDIA_TYPE
+
+
+def test_add_resources_is_not_capped_by_upload_limit(client, monkeypatch):
+    """Test that the upload size limit does not apply to streamed items."""
+    monkeypatch.setattr(Config, "UPLOAD_MAX_SIZE", 16)
+    monkeypatch.setattr(Config, "UPLOAD_MAX_CONTENT_LENGTH", 16)
+    got = client.post(
+        "/api/v1/add_resources/",
+        data=b'{"full_url": "https://www.python.org"}\n',
+        content_type="application/x-ndjson",
+    )
+    assert got.status_code == HTTPStatus.OK
+    assert [json.loads(line)["status"] for line in got.data.splitlines()] == [
+        "created"
+    ]
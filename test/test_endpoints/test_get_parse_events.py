@@ -0,0 +1,20 @@
+from http import HTTPStatus
+
+from web_resource_watchdog.utils.task_events import publish_task_event
+
+
+def test_get_parse_events_streams_final_state(client, fake_redis):
+    """Test the Server-Sent Events framing of a finished task."""
+    publish_task_event(
+        "task", "completed", {"status": "completed", "inserted": 1}
+    )
+    got = client.get("/api/v1/get_parse_events/task/")
+    assert got.status_code == HTTPStatus.OK
+    assert got.mimetype == "text/event-stream"
+    assert got.headers["Cache-Control"] == "no-cache"
+    assert got.headers["X-Accel-Buffering"] == "no"
+    assert got.get_data(as_text=True) == (
+        "event: completed\n"
+        'data: {"event": "completed", "status": "completed", "inserted": 1}'
+        "\n\n"
+    ), "A finished task must be answered with its final event only"
@@ -0,0 +1,69 @@
+from http import HTTPStatus
+
+from web_resource_watchdog import db
+from web_resource_watchdog.models import WebResource
+
+
+def test_list_resources_pages_with_cursor(client):
+    """Test that pages follow each other by cursor without gaps."""
+    urls = [f"https://www.example{index}.com" for index in range(5)]
+    WebResource.bulk_insert(urls)
+    got = client.get("/api/v1/resources/?limit=2")
+    assert got.status_code == HTTPStatus.OK
+    pages = [got.json]
+    while pages[-1]["next_cursor"] is not None:
+        pages.append(
+            client.get(
+                "/api/v1/resources/",
+                query_string={
+                    "limit": 2,
+                    "cursor": pages[-1]["next_cursor"],
+                },
+            ).json
+        )
+    assert [len(page["resources"]) for page in pages] == [2, 2, 1]
+    assert [
+        resource["full_url"]
+        for page in pages
+        for resource in page["resources"]
+    ] == urls, "Pages must list every resource once, ordered by id"
+    assert (
+        "screenshot" not in pages[0]["resources"][0]
+    ), "Listing must not return screenshots"
+
+
+def test_list_resources_filters(client):
+    """Test that resource and status filters are combined."""
+    WebResource.bulk_insert(
+        [
+            "https://www.python.org",
+            "http://docs.python.org",
+            "https://www.example.com",
+        ]
+    )
+    python, docs, _ = WebResource.query.order_by(WebResource.id).all()
+    python.status_codes.is_available = True
+    docs.status_codes.is_available = True
+    db.session.commit()
+    got = client.get(
+        "/api/v1/resources/",
+        query_string={"domain_zone": "org", "is_available": "true"},
+    )
+    assert [resource["full_url"] for resource in got.json["resources"]] == [
+        "https://www.python.org",
+        "http://docs.python.org",
+    ]
+    got = client.get(
+        "/api/v1/resources/",
+        query_string={"protocol": "http", "is_available": "true"},
+    )
+    assert [resource["id"] for resource in got.json["resources"]] == [docs.id]
+
+
+def test_list_resources_rejects_invalid_parameters(client):
+    """Test that invalid query parameters are reported with status 400."""
+    for query_string in ({"limit": 0}, {"is_watched": "maybe"}, {"x": 1}):
+        got = client.get("/api/v1/resources/", query_string=query_string)
+        assert (
+            got.status_code == HTTPStatus.BAD_REQUEST
+        ), f"Query {query_string} must be rejected"
@@ -0,0 +1,44 @@
+from http import HTTPStatus
+
+from web_resource_watchdog.models import WebResource
+
+image = b"\x89PNG\r\n\x1a\n" + bytes(range(256)) * 100
+
+
+def test_resource_screenshot_upload_and_download(client):
+    """Test that a stored screenshot is streamed back with its ETag."""
+    WebResource.bulk_insert(["https://www.python.org"])
+    url = "/api/v1/resources/1/screenshot/"
+    assert (
+        client.get(url).status_code == HTTPStatus.NOT_FOUND
+    ), "Missing screenshot must return 404"
+    got = client.put(url, data=image, content_type="image/png")
+    assert got.status_code == HTTPStatus.OK
+    digest = got.json["screenshot_sha256"]
+    got = client.get(url)
+    assert got.status_code == HTTPStatus.OK
+    assert got.data == image, "Downloaded screenshot must equal the upload"
+    assert got.mimetype == "image/png"
+    assert got.headers["ETag"] == f'"{digest}"'
+    got = client.get(url, headers={"If-None-Match": f'"{digest}"'})
+    assert (
+        got.status_code == HTTPStatus.NOT_MODIFIED
+    ), "Matching If-None-Match must return 304"
+    assert got.data == b""
+
+
+def test_resource_screenshot_rejects_invalid_uploads(client):
+    """Test that non-image bodies and unknown resources are rejected."""
+    WebResource.bulk_insert(["https://www.python.org"])
+    got = client.put(
+        "/api/v1/resources/1/screenshot/",
+        data=b"text",
+        content_type="text/plain",
+    )
+    assert got.status_code == HTTPStatus.UNSUPPORTED_MEDIA_TYPE
+    got = client.put(
+        "/api/v1/resources/2/screenshot/",
+        data=image,
+        content_type="image/png",
+    )
+    assert got.status_code == HTTPStatus.NOT_FOUND
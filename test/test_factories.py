@@ -0,0 +1,141 @@
+import json
+import subprocess
+import sys
+
+from conftest import BASE_DIR
+from sqlalchemy import func, select
+
+from web_resource_watchdog import db
+from web_resource_watchdog.factories import create_database, create_flask_app
+from web_resource_watchdog.factories.orm_factory import use_primary
+from web_resource_watchdog.models import Screenshot, WebResource
+from web_resource_watchdog.settings import Config
+
+
+def evaluate_fresh(code: str, expression: str) -> object:
+    """Run code in a fresh interpreter and return an expression of it.
+
+    Apps are created in their own interpreters, as every new Celery app
+    becomes the default one of the process.
+    """
+    completed = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            f"{code}\nimport json, sys\nprint(json.dumps({expression}))",
+        ],
+        capture_output=True,
+        check=True,
+        cwd=BASE_DIR,
+        text=True,
+    )
+    return json.loads(completed.stdout.splitlines()[-1])
+
+
+def test_worker_does_not_import_views():
+    """Test that the worker registers tasks without the API modules."""
+    modules, tasks = evaluate_fresh(
+        "from web_resource_watchdog import create_worker\n"
+        "worker = create_worker()",
+        "[sorted(sys.modules), sorted(worker.tasks)]",
+    )
+    assert (
+        "web_resource_watchdog.tasks.resource.save_resources_to_db" in tasks
+    ), "Check, that the worker registers the tasks"
+    for module in (
+        "web_resource_watchdog.api_views",
+        "web_resource_watchdog.error_handlers",
+        "flask_migrate",
+    ):
+        assert (
+            module not in modules
+        ), f"Check, that the worker does not import {module}"
+
+
+def test_app_registers_api_only_if_asked():
+    """Test that the CLI app goes without the blueprint and metrics."""
+    api_rules, cli_rules, cli_extensions = evaluate_fresh(
+        "from web_resource_watchdog import create_app\n"
+        "api, cli = create_app(), create_app(api=False)",
+        "[[str(rule) for rule in api.url_map.iter_rules()], "
+        "[str(rule) for rule in cli.url_map.iter_rules()], "
+        "sorted(cli.extensions)]",
+    )
+    assert (
+        "/api/v1/add_resource/" in api_rules and "/metrics" in api_rules
+    ), "Check, that the API app has the blueprint and metrics"
+    assert all(
+        not rule.startswith("/api/") and rule != "/metrics"
+        for rule in cli_rules
+    ), "Check, that the CLI app has no API routes"
+    assert {"celery", "migrate", "sqlalchemy"} <= set(
+        cli_extensions
+    ), "Check, that the CLI app has the ORM, migrations and Celery"
+
+
+def test_session_reads_from_replica_until_it_writes(tmp_path):
+    """Test that sessions read their own writes from the primary."""
+
+    class ReplicaConfig(Config):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'primary.db'}"
+        SQLALCHEMY_REPLICA_URIS = [f"sqlite:///{tmp_path / 'replica.db'}"]
+
+    flask_app = create_flask_app(ReplicaConfig)
+    create_database(flask_app, migrations=False)
+    count = select(func.count()).select_from(WebResource)
+    with flask_app.app_context():
+        primary = db.engine
+        (replica,) = flask_app.extensions["sqlalchemy_replicas"]
+        for engine in (primary, replica):
+            db.metadata.create_all(engine)
+        session = db.session()
+        assert (
+            session.get_bind(clause=count) is replica
+        ), "Check, that selects go to the replica"
+        assert not session.pinned, "Check, that reads do not pin the session"
+        WebResource.bulk_insert(["https://www.python.org"])
+        assert session.pinned, "Check, that writes pin the session"
+        assert (
+            session.scalar(count) == 1
+        ), "Check, that the session reads its writes from the primary"
+        db.session.remove()
+        assert (
+            db.session.scalar(count) == 0
+        ), "Check, that new sessions read from the replica"
+        assert (
+            db.session.get_bind(clause=select(WebResource).with_for_update())
+            is primary
+        ), "Check, that locking selects go to the primary"
+        for engine in (primary, replica):
+            engine.dispose()
+
+
+def test_read_then_write_helpers_read_from_primary(tmp_path):
+    """Test that helpers deciding on writes do not read a lagging replica."""
+
+    class ReplicaConfig(Config):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'primary.db'}"
+        SQLALCHEMY_REPLICA_URIS = [f"sqlite:///{tmp_path / 'replica.db'}"]
+
+    flask_app = create_flask_app(ReplicaConfig)
+    create_database(flask_app, migrations=False)
+    with flask_app.app_context():
+        primary = db.engine
+        (replica,) = flask_app.extensions["sqlalchemy_replicas"]
+        for engine in (primary, replica):
+            db.metadata.create_all(engine)
+        WebResource.bulk_insert(["https://www.python.org"])
+        db.session.remove()
+        resource_id = db.session.scalar(select(WebResource.id))
+        assert resource_id is None, "Check, that the replica lags behind"
+        db.session.remove()
+        assert (
+            WebResource.set_screenshot(1, b"png", "image/png") is not None
+        ), "Check, that set_screenshot finds the resource on the primary"
+        db.session.remove()
+        use_primary(db.session)
+        assert db.session().pinned, "Check, that use_primary pins the session"
+        assert db.session.scalar(select(func.count(Screenshot.sha256))) == 1
+        db.session.remove()
+        for engine in (primary, replica):
+            engine.dispose()
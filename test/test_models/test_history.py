@@ -0,0 +1,106 @@
+from datetime import datetime, timedelta, timezone
+from http import HTTPStatus
+
+from web_resource_watchdog.models import (
+    WebResource,
+    WebResourceCheck,
+    WebResourceRollup,
+)
+from web_resource_watchdog.utils.http_checker import CheckResult
+
+DAY = datetime(2026, 10, 1, tzinfo=timezone.utc)
+
+
+def record_checks(resource_id: int) -> None:
+    """Record four checks in the first hour and one in the second."""
+    WebResourceCheck.bulk_record(
+        [
+            CheckResult(resource_id, 200, 0.1, DAY, True),
+            CheckResult(
+                resource_id, 200, 0.3, DAY + timedelta(minutes=15), True
+            ),
+            CheckResult(
+                resource_id, 503, 0.2, DAY + timedelta(minutes=30), False
+            ),
+            CheckResult(
+                resource_id, None, None, DAY + timedelta(minutes=45), False
+            ),
+            CheckResult(resource_id, 200, 0.5, DAY + timedelta(hours=1), True),
+        ]
+    )
+
+
+def test_rollup_aggregates_complete_buckets(_app):
+    """Test hourly and daily aggregates of the check history."""
+    record_checks(1)
+    now = DAY + timedelta(hours=1, minutes=30)
+    assert (
+        WebResourceRollup.rollup("hour", now=now) == 1
+    ), "Only complete hours must be rolled up"
+    assert (
+        WebResourceRollup.rollup("hour", now=now) == 0
+    ), "Rolled up hours must not be aggregated again"
+    hour = WebResourceRollup.query.one()
+    assert (hour.checks, hour.available_checks) == (4, 2)
+    assert hour.latency_p50 == 0.2
+    assert round(hour.latency_p95, 2) == 0.29
+    assert hour.status_codes == {"200": 2, "503": 1, "error": 1}
+    assert (
+        WebResourceRollup.rollup("day", now=DAY + timedelta(days=1, hours=1))
+        == 1
+    )
+    day = WebResourceRollup.query.filter_by(period="day").one()
+    assert (day.checks, day.available_checks) == (5, 3)
+
+
+def test_rollup_waits_for_late_checks(_app):
+    """Test that checks committed late are still aggregated."""
+    record_checks(1)
+    assert (
+        WebResourceRollup.rollup("hour", now=DAY + timedelta(hours=1)) == 0
+    ), "Buckets within the rollup delay must not be aggregated"
+    WebResourceCheck.bulk_record(
+        [CheckResult(1, 200, 0.1, DAY + timedelta(minutes=55), True)]
+    )
+    assert (
+        WebResourceRollup.rollup(
+            "hour", now=DAY + timedelta(hours=1, minutes=30)
+        )
+        == 1
+    )
+    assert (
+        WebResourceRollup.query.one().checks == 5
+    ), "Check, that the late check is aggregated"
+
+
+def test_compact_removes_old_raw_history(_app):
+    """Test that raw history before the cutoff is deleted."""
+    record_checks(1)
+    assert WebResourceCheck.compact(DAY + timedelta(minutes=40)) == 3
+    assert WebResourceCheck.query.count() == 2
+
+
+def test_get_resource_uptime(client):
+    """Test that uptime is answered from rollups."""
+    resource = WebResource.create({"full_url": "https://www.python.org"})
+    now = datetime.now(timezone.utc)
+    WebResourceCheck.bulk_record(
+        [
+            CheckResult(resource.id, 200, 0.1, now - timedelta(hours=3), True),
+            CheckResult(
+                resource.id, 500, 0.1, now - timedelta(hours=2), False
+            ),
+        ]
+    )
+    WebResourceRollup.rollup("hour")
+    got = client.get(f"/api/v1/resources/{resource.id}/uptime/?hours=6")
+    assert got.status_code == HTTPStatus.OK
+    assert got.json == {
+        "resource_id": resource.id,
+        "period": "hour",
+        "checks": 2,
+        "available_checks": 1,
+        "uptime": 50.0,
+    }
+    missing = client.get("/api/v1/resources/100/uptime/")
+    assert missing.status_code == HTTPStatus.NOT_FOUND
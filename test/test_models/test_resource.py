@@ -0,0 +1,257 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import event, update
+
+from web_resource_watchdog import db
+from web_resource_watchdog.models import (
+    BulkInsertResult,
+    EvictionReport,
+    Screenshot,
+    WebResource,
+    WebResourceCheck,
+    WebResourceStatus,
+)
+from web_resource_watchdog.settings import Config
+from web_resource_watchdog.tasks.checks import check_resources
+from web_resource_watchdog.utils.scheduling import next_check_interval
+
+
+def test_bulk_insert_skips_duplicates(_app):
+    """Test that bulk insert counts duplicates instead of failing."""
+    WebResource.create({"full_url": "https://www.python.org"})
+    batches = []
+    got = WebResource.bulk_insert(
+        [
+            "https://www.python.org",
+            "https://docs.python.org",
+            "https://docs.python.org",
+            "https://localhost",
+            "https://pypi.org/project",
+        ],
+        batch_size=2,
+        on_batch=lambda batch, outcome: batches.append(batch),
+    )
+    assert got == BulkInsertResult(inserted=2, duplicates=2, invalid=1)
+    assert batches == [(1, 1, 0), (0, 1, 1), (1, 0, 0)]
+    assert sorted(
+        resource.full_url for resource in WebResource.query.all()
+    ) == [
+        "https://docs.python.org",
+        "https://pypi.org/project",
+        "https://www.python.org",
+    ]
+    assert (
+        WebResourceStatus.query.count() == 3
+    ), "Every inserted web resource must get a status row"
+    assert (
+        WebResource.query.filter_by(full_url="https://pypi.org/project")
+        .one()
+        .status_codes.is_watched
+    )
+
+
+def test_bulk_create_skips_invalid_urls(_app):
+    """Test that one url without a domain does not fail the batch."""
+    got = WebResource.bulk_create(
+        ["https://www.python.org", "http://localhost", "https://pypi.org"]
+    )
+    assert [resource.full_url for resource in got] == [
+        "https://www.python.org",
+        "https://pypi.org",
+    ]
+    assert WebResource.query.count() == 2
+
+
+def test_bulk_insert_stores_canonical_urls(_app):
+    """Test that equivalent forms of an url are stored once."""
+    outcome = {}
+    got = WebResource.bulk_insert(
+        [
+            "http://Example.com:80/",
+            "http://example.com",
+            "http://EXAMPLE.com#a",
+        ],
+        on_batch=lambda batch, batch_outcome: outcome.update(batch_outcome),
+    )
+    assert got == BulkInsertResult(inserted=1, duplicates=2, invalid=0)
+    resource = WebResource.query.one()
+    assert resource.full_url == "http://example.com"
+    assert outcome == {
+        "http://Example.com:80/": resource.id,
+        "http://example.com": None,
+        "http://EXAMPLE.com#a": None,
+    }, "Repeats of a canonical url must be reported as duplicates"
+
+
+def test_check_resources_saves_results(_app, stand_in_server):
+    """Test that check results update statuses and fail counters."""
+    WebResource.bulk_insert(
+        [stand_in_server.url("/?status=200"), stand_in_server.url("/?drop=1")]
+    )
+    available, dropped = WebResource.query.order_by(WebResource.id).all()
+    dropped.fail_count = 2
+    db.session.commit()
+    check_resources([available.id, dropped.id])
+    db.session.expire_all()
+    assert available.status_codes.is_available
+    assert available.status_codes.status_code == 200
+    assert available.fail_count == 0
+    assert not dropped.status_codes.is_available
+    assert dropped.fail_count == 3
+    assert dropped.status_codes.check_interval == (
+        4 * Config.CHECK_MIN_INTERVAL
+    ), "Failing resources must be checked less often as fail_count grows"
+
+
+def test_record_results_in_batches(_app):
+    """Test that batched results update statuses, counters and history."""
+    WebResource.bulk_insert(
+        ["https://up.python.org", "https://down.python.org"]
+    )
+    up, down = WebResource.query.order_by(WebResource.id).all()
+    db.session.delete(down.status_codes)
+    db.session.commit()
+    now = datetime.now(timezone.utc)
+    got = WebResourceStatus.record_results(
+        [
+            (up.id, 200, 0.1, now, True),
+            (down.id, None, None, now, False),
+            (down.id, 503, 0.2, now + timedelta(seconds=1), False),
+        ],
+        batch_size=2,
+    )
+    db.session.expire_all()
+    assert got == 3
+    assert up.fail_count == 0
+    assert up.status_codes.status_code == 200
+    assert up.status_codes.check_interval == Config.CHECK_MIN_INTERVAL
+    assert (
+        down.status_codes is not None
+    ), "A missing status row must be created"
+    assert down.status_codes.status_code == 503
+    assert not down.status_codes.is_available
+    assert down.fail_count == 2, "Results of every batch must be counted"
+    assert WebResourceCheck.query.count() == 3
+
+
+def test_evict_deletes_long_unavailable_resources(_app):
+    """Test that eviction removes only resources failing for long."""
+    WebResource.bulk_insert(
+        [
+            "https://dead.python.org",
+            "https://flaky.python.org",
+            "https://recovered.python.org",
+            "https://healthy.python.org",
+        ]
+    )
+    dead, flaky, recovered, healthy = WebResource.query.order_by(
+        WebResource.id
+    ).all()
+    now = datetime.now(timezone.utc)
+    dead.fail_count = 5
+    dead.last_success_at = now - timedelta(days=10)
+    flaky.fail_count = 5
+    recovered.fail_count = 5
+    recovered.last_success_at = now
+    db.session.commit()
+    WebResourceStatus.record_results(
+        [(flaky.id, None, None, now, False), (healthy.id, 200, 0.1, now, True)]
+    )
+    WebResource.set_screenshot(dead.id, b"dead", "image/png")
+    WebResource.set_screenshot(flaky.id, b"shared", "image/png")
+    WebResource.set_screenshot(healthy.id, b"shared", "image/png")
+    arguments = (5, timedelta(days=1), 1)
+    dry_run = WebResource.evict(*arguments, dry_run=True)
+    assert dry_run._replace(seconds=0) == EvictionReport(2, 0, 2)
+    assert WebResource.query.count() == 4, "Dry run must not delete rows"
+    report = WebResource.evict(*arguments)
+    assert report._replace(seconds=0) == EvictionReport(2, 2, 2)
+    assert sorted(
+        resource.full_url for resource in WebResource.query.all()
+    ) == ["https://healthy.python.org", "https://recovered.python.org"]
+    assert WebResourceStatus.query.count() == 2
+    assert (
+        WebResourceCheck.query.count() == 1
+    ), "History of evicted resources must be removed"
+    assert (
+        Screenshot.query.count() == 1
+    ), "Screenshots of evicted resources only must be removed"
+
+
+def test_evict_keeps_resources_recovered_meanwhile(_app):
+    """Test that a resource recovering after the candidate select stays."""
+    WebResource.bulk_insert(["https://flaky.python.org"])
+    resource = WebResource.query.one()
+    resource.fail_count = 5
+    db.session.commit()
+
+    def recover(state):
+        """Record a success just before the candidates are locked."""
+        if state.is_select and state.statement._for_update_arg is not None:
+            state.session.execute(
+                update(WebResource).values(
+                    fail_count=0, last_success_at=datetime.now(timezone.utc)
+                )
+            )
+
+    event.listen(db.session, "do_orm_execute", recover)
+    try:
+        report = WebResource.evict(5, timedelta(days=1), 10)
+    finally:
+        event.remove(db.session, "do_orm_execute", recover)
+    assert report._replace(seconds=0) == EvictionReport(1, 0, 1)
+    assert WebResource.query.count() == 1, "Recovered resource must stay"
+    assert (
+        WebResourceStatus.query.count() == 1
+    ), "Status of the recovered resource must stay"
+
+
+def test_screenshots_are_stored_once(_app):
+    """Test that identical screenshots share one content-addressed row."""
+    WebResource.bulk_insert(["https://a.python.org", "https://b.python.org"])
+    first, second = (
+        resource.id for resource in WebResource.query.order_by(WebResource.id)
+    )
+    image = b"\x89PNG\r\n\x1a\n" + bytes(range(256)) * 10
+    digest = WebResource.set_screenshot(first, image, "image/png")
+    assert WebResource.set_screenshot(second, image, "image/png") == digest
+    assert Screenshot.query.count() == 1, "Identical images must be deduped"
+    assert b"".join(Screenshot.iter_content(digest, 1000)) == image
+    WebResource.set_screenshot(first, b"other", "image/png")
+    assert Screenshot.query.count() == 2, "Shared image must be kept"
+    WebResource.set_screenshot(second, b"other", "image/png")
+    assert (
+        db.session.get(Screenshot, digest) is None
+    ), "Unreferenced image must be deleted"
+    assert WebResource.set_screenshot(0, image, "image/png") is None
+
+
+def test_claim_due_skips_claimed_and_unwatched(_app):
+    """Test that due resources are claimed only once."""
+    WebResource.bulk_insert(
+        [
+            "https://due.python.org",
+            "https://unwatched.python.org",
+            "https://later.python.org",
+        ]
+    )
+    due, unwatched, later = WebResource.query.order_by(WebResource.id).all()
+    now = datetime.now(timezone.utc)
+    due.status_codes.next_check_at = now - timedelta(seconds=1)
+    unwatched.status_codes.next_check_at = now - timedelta(seconds=1)
+    unwatched.status_codes.is_watched = False
+    later.status_codes.next_check_at = now + timedelta(hours=1)
+    db.session.commit()
+    lease = timedelta(minutes=5)
+    assert WebResourceStatus.claim_due(10, lease) == [due.id]
+    assert (
+        WebResourceStatus.claim_due(10, lease) == []
+    ), "Claimed resources must not be claimed again during the lease"
+
+
+def test_next_check_interval():
+    """Test that stable resources are checked less often."""
+    assert next_check_interval(60, True, True, 0, 60, 3600) == 120
+    assert next_check_interval(2400, True, True, 0, 60, 3600) == 3600
+    assert next_check_interval(3600, False, True, 1, 60, 3600) == 60
+    assert next_check_interval(60, False, False, 3, 60, 3600) == 240
@@ -0,0 +1,234 @@
+import bz2
+import gzip
+import io
+import lzma
+import re
+import tarfile
+import zipfile
+
+import pytest
+from conftest import FakeRedis
+
+import web_resource_watchdog.utils.zipfile as zip_parsing
+from web_resource_watchdog.utils.archives import (
+    ArchiveError,
+    detect_archive_format,
+    validate_zip_directory,
+)
+from web_resource_watchdog.utils.upload_dedupe import MemberCache
+from web_resource_watchdog.utils.zipfile import parse_archive
+
+
+def make_tar(members: dict[str, bytes], compression: str = "") -> bytes:
+    """Build an in-memory tar archive from a name to content mapping."""
+    buffer = io.BytesIO()
+    mode = f"w:{compression}" if compression else "w"
+    with tarfile.open(fileobj=buffer, mode=mode) as tar:
+        directory = tarfile.TarInfo("docs")
+        directory.type = tarfile.DIRTYPE
+        tar.addfile(directory)
+        for name, content in members.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            tar.addfile(info, io.BytesIO(content))
+    return buffer.getvalue()
+
+
+MEMBERS = {
+    "a.jsonl": b'{"url": "https://a.example.com/x"}\n',
+    "b.txt": b"see http://b.example.org and nothing else",
+}
+
+
+@pytest.mark.parametrize(
+    "data, expected",
+    [
+        (make_tar(MEMBERS), "tar"),
+        (make_tar(MEMBERS, "gz"), "tar.gz"),
+        (make_tar(MEMBERS, "bz2"), "tar.bz2"),
+        (make_tar(MEMBERS, "xz"), "tar.xz"),
+        (gzip.compress(MEMBERS["a.jsonl"]), "gz"),
+        (bz2.compress(MEMBERS["a.jsonl"]), "bz2"),
+        (lzma.compress(MEMBERS["a.jsonl"]), "xz"),
+    ],
+)
+def test_detect_archive_format(data, expected):
+    """Test that formats are sniffed and the position is restored."""
+    stream = io.BytesIO(b"prefix" + data)
+    stream.seek(6)
+    assert detect_archive_format(stream) == expected
+    assert stream.tell() == 6, "Sniffing must not move the stream"
+
+
+@pytest.mark.parametrize("data", [b"", b"plain text", b"\x1f\x8bcorrupt"])
+def test_detect_archive_format_rejects_other_data(data):
+    """Test that unsupported or corrupt data raises ArchiveError."""
+    with pytest.raises(ArchiveError):
+        detect_archive_format(io.BytesIO(data))
+
+
+@pytest.mark.parametrize("compression", ["", "gz", "bz2", "xz"])
+def test_parse_archive_streams_tar_members(compression):
+    """Test that urls are found in every regular file of a tar archive."""
+    scanned = []
+    got = parse_archive(
+        make_tar(MEMBERS, compression),
+        chunk_size=8,
+        on_member=lambda member, urls: scanned.append((*member, urls)),
+    )
+    assert sorted(got["data"]) == [
+        "http://b.example.org",
+        "https://a.example.com/x",
+    ]
+    assert scanned == [("a.jsonl", 35, 1), ("b.txt", 41, 1)]
+
+
+def test_parse_archive_reads_single_compressed_file():
+    """Test that a gzip compressed file is parsed as one member."""
+    got = parse_archive(gzip.compress(b"https://a.example.com\n" * 1000))
+    assert got == {"data": ["https://a.example.com"], "errors": []}
+
+
+def make_zip(members: dict[str, bytes], compression=zipfile.ZIP_DEFLATED):
+    """Build an in-memory zip archive from a name to content mapping."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression) as zipf:
+        for name, content in members.items():
+            zipf.writestr(name, content)
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize(
+    "limits, message",
+    [
+        ((1, 10**6, 100, 0), "Archive has more than 1 files."),
+        ((10, 1000, 100, 0), "Archive is larger than 1000 bytes"),
+        ((10, 10**6, 10, 1024), "File zeros.txt is compressed more than"),
+    ],
+)
+def test_validate_zip_directory_rejects_bombs(limits, message):
+    """Test that limits are checked without decompressing members."""
+    archive = make_zip({"zeros.txt": b"0" * 100_000, "a.txt": b"a"})
+    with pytest.raises(ArchiveError, match=message):
+        validate_zip_directory(io.BytesIO(archive), *limits)
+    assert (
+        len(validate_zip_directory(io.BytesIO(archive), 2, 10**6, 1000)) == 2
+    )
+
+
+def test_parse_archive_reports_corrupt_zip_members():
+    """Test that CRC errors are found by the single read of the worker."""
+    archive = make_zip(
+        {"a.txt": b"https://a.example.com", "b.txt": b"https://b.example.com"},
+        zipfile.ZIP_STORED,
+    )
+    archive = archive.replace(
+        b"https://b.example.com", b"https://c.example.com"
+    )
+    validate_zip_directory(io.BytesIO(archive), 10, 10**6, 100)
+    got = parse_archive(archive, chunk_size=8)
+    assert got == {
+        "data": ["https://a.example.com"],
+        "errors": ["File b.txt is corrupt."],
+    }
+
+
+def test_parse_archive_limits_uncompressed_size():
+    """Test that archives without an index are stopped at the size limit."""
+    data = gzip.compress(b"https://a.example.com " * 10_000)
+    with pytest.raises(ArchiveError):
+        parse_archive(data, chunk_size=1024, max_size=100_000)
+    assert parse_archive(data, max_size=220_000)["data"]
+
+
+def test_parse_archive_limits_size_across_members():
+    """Test that the size limit is shared by all files of an archive."""
+    data = make_tar(
+        {f"{name}.txt": b"https://a.example.com " * 2000 for name in "abc"}
+    )
+    with pytest.raises(ArchiveError):
+        parse_archive(data, chunk_size=1024, max_size=100_000)
+    assert parse_archive(data, chunk_size=1024, max_size=140_000)["data"]
+
+
+def test_parse_archive_skips_cached_members(monkeypatch):
+    """Test that members with cached content are not scanned again."""
+    cache = MemberCache(FakeRedis())
+    members = {"a.txt": b"https://a.example.com", "b.txt": b"no urls"}
+    first = parse_archive(make_zip(members), member_cache=cache)
+    assert len(cache.client.values) == 2
+    scanned = []
+    scan_member = zip_parsing._scan_member
+
+    def record_scan(reader, *args):
+        scanned.append(reader.read())
+        return scan_member(io.BytesIO(scanned[-1]), *args)
+
+    monkeypatch.setattr(zip_parsing, "_scan_member", record_scan)
+    members["c.txt"] = b"https://c.example.com"
+    second = parse_archive(make_zip(members), member_cache=cache)
+    assert sorted(second["data"]) == sorted(
+        first["data"] + ["https://c.example.com"]
+    )
+    assert second["errors"] == first["errors"] == ["File b.txt has no urls."]
+    assert scanned == [members["c.txt"]], "Only the new member is scanned"
+    parse_archive(
+        make_zip(members), pattern=re.compile(r"\S+"), member_cache=cache
+    )
+    assert len(scanned) == 4, "Other patterns must not share entries"
+
+
+def test_parse_archive_does_not_cache_corrupt_members():
+    """Test that tampered members do not poison the genuine entries."""
+    cache = MemberCache(FakeRedis())
+    genuine = make_zip({"a.txt": b"https://a.example.com"}, zipfile.ZIP_STORED)
+    tampered = genuine.replace(
+        b"https://a.example.com", b"https://e.example.com"
+    )
+    got = parse_archive(tampered, member_cache=cache)
+    assert got == {"data": [], "errors": ["File a.txt is corrupt."]}
+    assert cache.client.values == {}, "Corrupt members must not be cached"
+    got = parse_archive(genuine, member_cache=cache)
+    assert got == {"data": ["https://a.example.com"], "errors": []}
+    assert len(cache.client.values) == 1
+
+
+LONG_TEXT = b"https://b.example.com " + bytes(range(32, 127)) * 2000
+GZIP_DATA = gzip.compress(LONG_TEXT)
+TAR_GZ_DATA = make_tar(
+    {"a.txt": b"https://a.example.com", "b.txt": LONG_TEXT}, "gz"
+)
+
+
+@pytest.mark.parametrize(
+    "data, expected",
+    [
+        (
+            GZIP_DATA[: len(GZIP_DATA) // 2],
+            {"data": [], "errors": ["File upload is corrupt."]},
+        ),
+        (
+            GZIP_DATA[:-8] + b"\0\0\0\0" + GZIP_DATA[-4:],
+            {"data": [], "errors": ["File upload is corrupt."]},
+        ),
+        (
+            lzma.compress(LONG_TEXT)[:-100],
+            {"data": [], "errors": ["File upload is corrupt."]},
+        ),
+        (
+            TAR_GZ_DATA[: len(TAR_GZ_DATA) // 2],
+            {
+                "data": ["https://a.example.com"],
+                "errors": [
+                    "File b.txt is corrupt.",
+                    "Archive is corrupt, files after b.txt are lost.",
+                ],
+            },
+        ),
+    ],
+    ids=["truncated gz", "gz crc", "truncated xz", "truncated tar.gz"],
+)
+@pytest.mark.parametrize("chunk_size", [None, 1024])
+def test_parse_archive_reports_corrupt_streams(data, expected, chunk_size):
+    """Test that truncated and corrupt data keeps the urls found before."""
+    assert parse_archive(data, chunk_size=chunk_size) == expected
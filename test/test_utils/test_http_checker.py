@@ -0,0 +1,76 @@
+import asyncio
+
+from web_resource_watchdog.utils.http_checker import Target, check_urls
+
+
+def test_check_urls_statuses(stand_in_server):
+    """Test availability of answering, failing and silent servers."""
+    results = asyncio.run(
+        check_urls(
+            [
+                (1, stand_in_server.url("/?status=200")),
+                (2, stand_in_server.url("/?status=503")),
+                (3, stand_in_server.url("/?head_status=405&status=204")),
+                (4, stand_in_server.url("/?drop=1")),
+                (5, stand_in_server.url("/?delay=0.5")),
+                (6, "ftp://example.com/file"),
+            ],
+            read_timeout=0.2,
+        )
+    )
+    assert [
+        (result.resource_id, result.status_code, result.ok)
+        for result in results
+    ] == [
+        (1, 200, True),
+        (2, 503, False),
+        (3, 204, True),
+        (4, None, False),
+        (5, None, False),
+        (6, None, False),
+    ]
+    assert results[0].latency is not None
+    assert ("GET", "/?head_status=405&status=204") in (
+        stand_in_server.requests
+    ), "Rejected HEAD request must be retried with GET"
+
+
+def test_check_urls_reuses_connections_per_host(stand_in_server):
+    """Test that keep-alive connections are pooled and limited per host."""
+    results = asyncio.run(
+        check_urls(
+            [
+                (index, stand_in_server.url(f"/{index}?delay=0.01"))
+                for index in range(20)
+            ],
+            limit_per_host=2,
+        )
+    )
+    assert all(result.ok for result in results)
+    assert stand_in_server.connections == 2, (
+        "Checks of a single host must share at most "
+        "`limit_per_host` connections"
+    )
+
+
+def test_target_encodes_internationalized_urls():
+    """Test that IDN hosts and non-ASCII paths are sent as ASCII."""
+    target = Target.from_url("http://пример.рф:8080/привет?q=слово&a=1")
+    assert target.host == "xn--e1afmkfd.xn--p1ai"
+    assert target.host_header == "xn--e1afmkfd.xn--p1ai:8080"
+    assert target.path == (
+        "/%D0%BF%D1%80%D0%B8%D0%B2%D0%B5%D1%82"
+        "?q=%D1%81%D0%BB%D0%BE%D0%B2%D0%BE&a=1"
+    )
+    assert Target.from_url("https://a.example.com/a%20b").path == "/a%20b"
+
+
+def test_check_urls_non_ascii_path(stand_in_server):
+    """Test that urls with non-ASCII paths are checked, not failed."""
+    (result,) = asyncio.run(
+        check_urls([(1, stand_in_server.url("/привет?status=204"))])
+    )
+    assert (result.status_code, result.ok) == (204, True)
+    assert stand_in_server.requests == [
+        ("HEAD", "/%D0%BF%D1%80%D0%B8%D0%B2%D0%B5%D1%82?status=204")
+    ]
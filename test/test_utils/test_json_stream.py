@@ -0,0 +1,23 @@
+import io
+import json
+
+import pytest
+
+from web_resource_watchdog.utils.json_stream import iter_json_array
+
+
+def test_iter_json_array_across_chunk_boundaries():
+    """Test that items split between chunks are decoded intact."""
+    items = [{"full_url": f"https://example{i}.com/ü"} for i in range(20)]
+    items += [1234567890, "text", [1, 2]]
+    body = json.dumps(items, ensure_ascii=False).encode()
+    for chunk_size in (1, 2, 7, 1024):
+        got = list(iter_json_array(io.BytesIO(body), chunk_size, 1024))
+        assert got == items, f"Chunk size {chunk_size} must not change items"
+
+
+@pytest.mark.parametrize("body", [b"", b"{}", b"[1,", b"[1 2]", b"[1,]"])
+def test_iter_json_array_rejects_malformed_body(body):
+    """Test that bodies which are not JSON arrays raise ValueError."""
+    with pytest.raises(ValueError):
+        list(iter_json_array(io.BytesIO(body), 2, 1024))
@@ -0,0 +1,59 @@
+import io
+import zipfile
+from http import HTTPStatus
+
+from prometheus_client import REGISTRY
+
+from web_resource_watchdog.tasks import evict_unavailable_resources
+from web_resource_watchdog.utils.zipfile import parse_archive
+
+
+def sample(name: str, **labels) -> float:
+    """Return the current value of a sample, 0 if it is not exported."""
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_metrics_endpoint_exposes_request_latency(client):
+    """Test that requests are timed per endpoint and exposed."""
+    labels = {
+        "method": "GET",
+        "endpoint": "api_v1.list_resources",
+        "status": "200",
+    }
+    before = sample("wrw_http_request_duration_seconds_count", **labels)
+    client.get("/api/v1/resources/")
+    assert (
+        sample("wrw_http_request_duration_seconds_count", **labels)
+        == before + 1
+    ), "Every request must be observed once"
+    got = client.get("/metrics")
+    assert got.status_code == HTTPStatus.OK
+    assert b"wrw_http_request_duration_seconds_bucket" in got.data
+
+
+def test_parse_archive_records_stages():
+    """Test that decoded and scanned bytes are counted per stage."""
+    content = b"see https://www.python.org " * 100
+    before = {
+        stage: sample("wrw_stage_bytes_total", stage=stage)
+        for stage in ("zip_decode", "url_scan")
+    }
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zipf:
+        zipf.writestr("a.txt", content)
+    parse_archive(buffer.getvalue(), chunk_size=64)
+    for stage, value in before.items():
+        assert sample("wrw_stage_bytes_total", stage=stage) == value + len(
+            content
+        ), f"Stage {stage} must count the member bytes"
+
+
+def test_task_signals_record_runtime(_app, eager_celery):
+    """Test that Celery task runs are timed by state."""
+    labels = {
+        "task": evict_unavailable_resources.name,
+        "state": "SUCCESS",
+    }
+    before = sample("wrw_task_runtime_seconds_count", **labels)
+    evict_unavailable_resources.delay(dry_run=True)
+    assert sample("wrw_task_runtime_seconds_count", **labels) == before + 1
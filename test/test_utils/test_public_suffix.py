@@ -0,0 +1,55 @@
+import pytest
+
+from web_resource_watchdog.models import WebResource
+from web_resource_watchdog.utils.public_suffix import (
+    compile_suffix_trie,
+    split_host,
+    suffix_length,
+)
+
+
+@pytest.mark.parametrize(
+    "host, expected",
+    [
+        ("www.example.co.uk", ("www.example", "co.uk")),
+        ("example.com.", ("example", "com")),
+        ("foo.bar.unknown-tld", ("foo.bar", "unknown-tld")),
+        ("x.y.kawasaki.jp", ("x", "y.kawasaki.jp")),
+        ("www.city.kawasaki.jp", ("www.city", "kawasaki.jp")),
+        ("пример.рф", ("пример", "рф")),
+        ("xn--e1afmkfd.xn--p1ai", ("xn--e1afmkfd", "xn--p1ai")),
+        ("127.0.0.1", ("127.0.0.1", "")),
+        ("::1", ("::1", "")),
+    ],
+)
+def test_split_host(host, expected):
+    """Test that hosts are split at their public suffix."""
+    assert split_host(host) == expected
+
+
+@pytest.mark.parametrize("host", ["", "localhost", "co.uk", "a..com"])
+def test_split_host_rejects_hosts_without_domain(host):
+    """Test that hosts without a domain under the suffix raise ValueError."""
+    with pytest.raises(ValueError):
+        split_host(host)
+
+
+def test_suffix_length_prefers_exceptions_and_longest_rules():
+    """Test the precedence of Public Suffix List rules."""
+    trie = compile_suffix_trie(
+        ["// comment", "", "uk", "co.uk", "*.ck", "!www.ck"]
+    )
+    assert suffix_length(["a", "b", "co", "uk"], trie) == 2
+    assert suffix_length(["a", "b", "ck"], trie) == 2
+    assert suffix_length(["a", "www", "ck"], trie) == 1
+    assert (
+        suffix_length(["a", "org"], trie) == 1
+    ), "Unknown suffix is one label"
+
+
+def test_split_url_excludes_credentials_and_port():
+    """Test that the domain of a url holds neither credentials nor port."""
+    got = WebResource.split_url("https://user:pw@WWW.Example.co.uk:8443/a?b=1")
+    assert got["domain"] == "www.example"
+    assert got["domain_zone"] == "co.uk"
+    assert got["full_url"] == "https://user:pw@www.example.co.uk:8443/a?b=1"
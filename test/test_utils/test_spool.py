@@ -0,0 +1,26 @@
+import hashlib
+import io
+import os
+
+import pytest
+
+from web_resource_watchdog.utils.spool import BlobTooLarge, FileSystemBlobStore
+
+
+def test_put_hashes_content_while_copying(tmp_path):
+    """Test that a stored blob reports its size and SHA-256 digest."""
+    store = FileSystemBlobStore(str(tmp_path), chunk_size=7)
+    content = os.urandom(100)
+    blob = store.put(io.BytesIO(content), max_size=100)
+    assert blob.size == 100
+    assert blob.sha256 == hashlib.sha256(content).hexdigest()
+    with store.open(blob.ref) as file:
+        assert file.read() == content
+
+
+def test_put_stops_at_max_size(tmp_path):
+    """Test that a long stream is rejected and its partial file removed."""
+    store = FileSystemBlobStore(str(tmp_path), chunk_size=7)
+    with pytest.raises(BlobTooLarge):
+        store.put(io.BytesIO(b"x" * 101), max_size=100)
+    assert os.listdir(tmp_path) == [], "Partial upload must be removed"
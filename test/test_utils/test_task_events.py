@@ -0,0 +1,134 @@
+import json
+import time
+
+from conftest import FakeRedis
+
+from web_resource_watchdog.utils.task_events import (
+    TaskProgress,
+    get_final_task_state,
+    get_task_progress,
+    is_task_alive,
+    publish_task_event,
+    stream_task_events,
+)
+
+
+def parse_sse(message: str) -> dict:
+    """Return the data of a Server-Sent Events message."""
+    event, data = message.rstrip("\n").split("\n")
+    assert event.startswith("event: ") and data.startswith("data: ")
+    return json.loads(data.removeprefix("data: "))
+
+
+def test_events_are_streamed_in_order():
+    """Test that events reach a subscriber in order until the final one."""
+    client = FakeRedis()
+    stream = stream_task_events(
+        "task", timeout=5, heartbeat=0.01, client=client
+    )
+    assert next(stream) == ": keep-alive\n\n", "Idle streams must heartbeat"
+    for done in (1, 2):
+        publish_task_event(
+            "task", "progress", {"progress": {"done": done}}, client
+        )
+    publish_task_event("task", "completed", {"status": "completed"}, client)
+    publish_task_event("task", "progress", {"progress": {"done": 3}}, client)
+    events = [parse_sse(message) for message in stream]
+    assert [event["event"] for event in events] == [
+        "progress",
+        "progress",
+        "completed",
+    ], "The stream must end with the final event"
+    assert [event.get("progress") for event in events[:2]] == [
+        {"done": 1},
+        {"done": 2},
+    ]
+    assert (
+        client.subscribers["task_events:task"] == []
+    ), "The subscription must be closed"
+
+
+def test_finished_task_is_answered_from_cached_state():
+    """Test that the final event is served after the task finished."""
+    client = FakeRedis()
+    publish_task_event("task", "failed", {"status": "error"}, client)
+    assert get_final_task_state("task", client) == {
+        "event": "failed",
+        "status": "error",
+    }
+    assert get_final_task_state("other", client) is None
+    messages = list(
+        stream_task_events("task", timeout=5, heartbeat=5, client=client)
+    )
+    assert messages == [
+        'event: failed\ndata: {"event": "failed", "status": "error"}\n\n'
+    ]
+
+
+def test_task_is_alive_until_final_event():
+    """Test that progress events keep a task alive until it finishes."""
+    client = FakeRedis()
+    assert not is_task_alive("task", client), "Unknown tasks are not alive"
+    publish_task_event("task", "progress", {"progress": {"done": 1}}, client)
+    assert is_task_alive("task", client)
+    publish_task_event("task", "completed", {"status": "completed"}, client)
+    assert not is_task_alive("task", client), "Finished tasks are not alive"
+
+
+def test_stream_times_out_with_heartbeats():
+    """Test that a stream without events sends comments and ends."""
+    messages = list(
+        stream_task_events(
+            "task", timeout=0.05, heartbeat=0.01, client=FakeRedis()
+        )
+    )
+    assert len(messages) >= 2, "Heartbeats must be sent while waiting"
+    assert set(messages) == {": keep-alive\n\n"}
+
+
+def test_task_progress_flushes_in_batches():
+    """Test that counters reach Redis every few updates and on exit."""
+    client = FakeRedis()
+    subscription = client.pubsub()
+    subscription.subscribe("task_events:job")
+    with TaskProgress(
+        "job", client, flush_every=2, flush_interval=60
+    ) as progress:
+        progress.add(members=1, urls=3)
+        assert (
+            get_task_progress("job", client) == {}
+        ), "A single update must not be flushed"
+        progress.add(members=1)
+        assert get_task_progress("job", client) == {"members": 2, "urls": 3}
+        progress.add(urls=2)
+    assert get_task_progress("job", client) == {
+        "members": 2,
+        "urls": 5,
+    }, "Pending counters must be flushed on exit"
+    events = [json.loads(subscription.get_message()["data"]) for _ in range(2)]
+    assert [event["progress"] for event in events] == [
+        {"members": 2, "urls": 3},
+        {"urls": 5},
+    ], "Every flush must publish the totals of the flushed counters"
+    assert subscription.get_message() is None
+
+
+def test_task_progress_flushes_on_interval():
+    """Test that slow updates are flushed after the interval."""
+    client = FakeRedis()
+    progress = TaskProgress(
+        "job", client, flush_every=100, flush_interval=0.01
+    )
+    progress.add(members=1)
+    time.sleep(0.02)
+    progress.add(members=1)
+    assert get_task_progress("job", client) == {"members": 2}
+
+
+def test_task_progress_without_job_is_not_saved():
+    """Test that progress of jobs clients do not know is dropped."""
+    client = FakeRedis()
+    with TaskProgress(None, client, flush_every=1) as progress:
+        progress.add(members=1)
+    assert client.values == {}
+    assert get_task_progress("job", client) == {}
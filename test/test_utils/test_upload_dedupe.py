@@ -0,0 +1,46 @@
+from conftest import FakeRedis
+from redis import RedisError
+
+from web_resource_watchdog.settings import Config
+from web_resource_watchdog.utils.upload_dedupe import (
+    MemberCache,
+    claim_upload,
+    reclaim_upload,
+    release_upload,
+)
+
+
+def test_claim_upload_returns_first_task():
+    """Test that a digest is claimed once until it is released."""
+    client = FakeRedis()
+    assert claim_upload("abc", "task-1", client) is None
+    assert claim_upload("abc", "task-2", client) == "task-1"
+    reclaim_upload("abc", "task-3", client)
+    assert claim_upload("abc", "task-4", client) == "task-3"
+    release_upload("abc", "task-3", client)
+    assert claim_upload("abc", "task-5", client) is None
+
+
+def test_dedupe_fails_open_without_redis():
+    """Test that every upload is processed if Redis fails."""
+
+    class BrokenRedis(FakeRedis):
+        def pipeline(self):
+            raise RedisError("Connection refused.")
+
+    client = BrokenRedis()
+    assert claim_upload("abc", "task-1", client) is None
+    assert claim_upload("abc", "task-2", client) is None
+
+
+def test_member_cache_skips_corrupt_and_large_members(monkeypatch):
+    """Test that only clean members with few urls are cached."""
+    monkeypatch.setattr(Config, "MEMBER_CACHE_MAX_URLS", 1)
+    cache = MemberCache(FakeRedis())
+    cache.set("abc", "key", [], "corrupt")
+    cache.set("def", "key", ["https://a.example.com", "https://b.com"], None)
+    cache.set("ghi", "key", ["https://a.example.com"], None)
+    assert cache.get("abc", "key") is None
+    assert cache.get("def", "key") is None
+    assert cache.get("ghi", "key") == (["https://a.example.com"], None)
+    assert cache.get("ghi", "other") is None
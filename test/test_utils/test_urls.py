@@ -0,0 +1,31 @@
+import pytest
+
+from web_resource_watchdog.utils.urls import canonicalize_url
+
+
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        ("HTTP://Example.COM:80/", "http://example.com"),
+        ("https://example.com:443/path#top", "https://example.com/path"),
+        ("https://example.com:8443/Path/", "https://example.com:8443/Path/"),
+        ("http://example.com/?b=2&a=1&&a=0", "http://example.com?a=0&a=1&b=2"),
+        ("http://example.com/?q=a%26b", "http://example.com?q=a%26b"),
+        ("ftp://user:pw@Files.org:21/x", "ftp://user:pw@files.org/x"),
+        ("http://[::1]:8080/", "http://[::1]:8080"),
+        (" https://example.com \n", "https://example.com"),
+    ],
+)
+def test_canonicalize_url(url, expected):
+    """Test that equivalent urls get one canonical form."""
+    assert canonicalize_url(url) == expected
+    assert (
+        canonicalize_url(expected) == expected
+    ), "Canonical form must be stable"
+
+
+@pytest.mark.parametrize("url", ["example.com", "http://", "http://a.com:x"])
+def test_canonicalize_url_rejects_invalid_urls(url):
+    """Test that urls without a host or with a bad port raise ValueError."""
+    with pytest.raises(ValueError):
+        canonicalize_url(url)
@@ -0,0 +1,174 @@
+import io
+import re
+import warnings
+import zipfile
+
+from web_resource_watchdog.utils.url_extractor import UrlExtractor
+from web_resource_watchdog.utils.zipfile import (
+    URL_PATTERN,
+    find_urls_in_stream,
+    merge_parse_results,
+    parse_zip_file,
+    split_zip_members,
+)
+
+
+def make_zip(members: dict[str, bytes]) -> bytes:
+    """Build an in-memory zip archive from a name to content mapping."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zipf:
+        for name, content in members.items():
+            zipf.writestr(name, content)
+    return buffer.getvalue()
+
+
+def test_stream_finds_urls_across_chunk_boundaries():
+    """Test that urls split between chunks are found intact."""
+    urls = {f"https://example{i}.com/path?page={i}" for i in range(50)}
+    text = " filler ".join(sorted(urls)).encode()
+    for chunk_size in (7, 16, 33, 1024):
+        got = find_urls_in_stream(
+            io.BytesIO(text), URL_PATTERN, chunk_size, overlap=64
+        )
+        assert got == urls, (
+            f"Streaming with chunk size {chunk_size} must find the same "
+            "urls as reading the whole text."
+        )
+
+
+def test_stream_decodes_multibyte_characters_split_between_chunks():
+    """Test that utf-8 characters split between chunks are decoded."""
+    text = "Привет https://python.org/docs мир".encode()
+    got = find_urls_in_stream(io.BytesIO(text), URL_PATTERN, 3, overlap=32)
+    assert got == {"https://python.org/docs"}
+
+
+def test_parse_zip_file_streaming_matches_full_read():
+    """Test that streaming and full read modes give the same result."""
+    archive = make_zip(
+        {
+            "links.txt": b"see https://www.python.org and http://a.b.com/x",
+            "empty.txt": b"nothing here",
+            "binary.bin": b"\xff\xfe\x00https://skip.me",
+        }
+    )
+    full = parse_zip_file(archive)
+    streamed = parse_zip_file(archive, chunk_size=8, overlap=32)
+    assert (
+        sorted(streamed["data"])
+        == sorted(full["data"])
+        == [
+            "http://a.b.com/x",
+            "https://www.python.org",
+        ]
+    )
+    assert (
+        streamed["errors"]
+        == full["errors"]
+        == [
+            "File empty.txt has no urls.",
+            "Cannot decode file binary.bin.",
+        ]
+    )
+
+
+def test_split_zip_members_balances_sizes():
+    """Test that members are split into groups of similar size."""
+    archive = make_zip(
+        {
+            "big.txt": b"a" * 1000,
+            "medium.txt": b"b" * 600,
+            "small_1.txt": b"c" * 300,
+            "small_2.txt": b"d" * 300,
+        }
+    )
+    assert split_zip_members(archive, 2) == [[0], [1, 2, 3]]
+    assert split_zip_members(archive, 2, threshold=10_000) == [
+        [0, 1, 2, 3]
+    ], "Archives below the threshold must not be split"
+
+
+def test_merge_parse_results_of_member_groups():
+    """Test that scanning groups and merging equals a single scan."""
+    archive = make_zip(
+        {
+            "a.txt": b"https://a.example.com https://shared.example.com",
+            "b.txt": b"https://b.example.com https://shared.example.com",
+            "c.txt": b"no links",
+        }
+    )
+    merged = merge_parse_results(
+        [
+            parse_zip_file(archive, members=members)
+            for members in split_zip_members(archive, 3)
+        ]
+    )
+    single = parse_zip_file(archive)
+    assert sorted(merged["data"]) == sorted(single["data"])
+    assert sorted(merged["errors"]) == sorted(single["errors"])
+
+
+def test_split_zip_members_keeps_duplicate_names():
+    """Test that members sharing a name are all scanned by the groups."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zipf:
+        zipf.writestr("links.txt", b"https://one.example.com " * 100)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", UserWarning)
+            zipf.writestr("links.txt", b"https://two.example.com " * 100)
+    archive = buffer.getvalue()
+    groups = split_zip_members(archive, 2)
+    assert groups == [[0], [1]]
+    merged = merge_parse_results(
+        [parse_zip_file(archive, members=members) for members in groups]
+    )
+    assert sorted(merged["data"]) == [
+        "https://one.example.com",
+        "https://two.example.com",
+    ], "Every member with a repeated name must be scanned"
+
+
+def test_parse_zip_file_reports_scanned_members():
+    """Test that every scanned member is reported with its url count."""
+    archive = make_zip(
+        {
+            "links.txt": b"https://a.example.com https://a.example.com",
+            "binary.bin": b"\xff\xfe",
+        }
+    )
+    scanned = []
+    parse_zip_file(
+        archive,
+        chunk_size=8,
+        on_member=lambda member, urls: scanned.append(
+            (member.filename, member.file_size, urls)
+        ),
+    )
+    assert scanned == [("links.txt", 43, 1), ("binary.bin", 2, 0)]
+
+
+def test_extractor_matches_regex_over_decoded_text():
+    """Test that prefiltered extraction finds what the plain regex finds."""
+    text = (
+        'x<a href="https://a.example.com/p?q=1">http://b.org/x,</a> '
+        'xhttps://c.com ftp://d.e.net/f_(1) {"u":"http://пример.рф/ю"} '
+        "https://g.h.io/" + "x" * 50 + "...http://i.j.com://k.l.org"
+    )
+    expected = set(URL_PATTERN.findall(text))
+    extractor = UrlExtractor()
+    assert set(extractor.findall(text.encode())) == expected
+    for chunk_size in (1, 5, 16, 1024):
+        got = extractor.find_in_stream(
+            io.BytesIO(text.encode()), chunk_size, overlap=128
+        )
+        assert got == expected, f"Chunk size {chunk_size} changed urls"
+
+
+def test_extractor_with_custom_pattern_and_anchor():
+    """Test that custom patterns are matched with or without an anchor."""
+    pattern = re.compile(r"\b[\w.]+@([\w.]+)")
+    data = b"mail bob@example.com or amy@python.org"
+    assert UrlExtractor(pattern).findall(data) == ["example.com", "python.org"]
+    assert UrlExtractor(pattern, anchor=b"@").find_in_stream(
+        io.BytesIO(data), 4
+    ) == {"example.com", "python.org"}
@@ -1,23 +1,30 @@
-from flask import Blueprint
+from typing import Any
 
-from .factories import create_database, create_flask_app
-from .factories.celery_factory import create_celery_app
-from .settings import Config
+from .factories import create_app, create_worker  # noqa
+from .factories.orm_factory import db  # noqa
+from .settings import Config  # noqa
 
-flask_app = create_flask_app(Config)
-celery_app = create_celery_app(flask_app)
-flask_app.extensions["celery"] = celery_app
-db, migrate = create_database(flask_app)
 
-api_v1 = Blueprint(
-    name="api_v1",
-    url_prefix="/api/v1",
-    import_name=__name__,
-)
+def __getattr__(name: str) -> Any:
+    """Build the apps once their former module attributes are used.
 
-from web_resource_watchdog.api_views import v1  # noqa
-
-from . import error_handlers  # noqa
-from . import tasks  # noqa
-
-flask_app.register_blueprint(api_v1)
+    `flask_app` is the API app and `celery_app` its Celery app, or a
+    worker without views if it is used first, as by `celery -A
+    web_resource_watchdog.celery_app`. Either way both share one Celery
+    app, so tasks sent by views run where `celery_app` is configured.
+    """
+    if name == "flask_app":
+        value = create_app(celery_app=globals().get("celery_app"))
+    elif name == "celery_app":
+        if "flask_app" in globals():
+            value = globals()["flask_app"].extensions["celery"]
+        else:
+            value = create_worker()
+    elif name == "migrate":
+        value = __getattr__("flask_app").extensions["migrate"]
+    elif name == "api_v1":
+        from .api_views import api_v1 as value
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
@@ -0,0 +1,7 @@
+from flask import Blueprint
+
+api_v1 = Blueprint(
+    name="api_v1",
+    url_prefix="/api/v1",
+    import_name=__name__,
+)
@@ -1,3 +1,7 @@
 from .resource import add_resource  # noqa
 from .resource import add_resource_from_zip  # noqa
+from .resource import add_resources  # noqa
+from .resource import get_parse_events  # noqa
 from .resource import get_parse_status  # noqa
+from .resource import get_resource_uptime  # noqa
+from .resource import list_resources  # noqa
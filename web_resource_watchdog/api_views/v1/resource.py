@@ -1,20 +1,47 @@
+import json
+from datetime import datetime, timedelta, timezone
 from http import HTTPStatus
+from typing import Any, Iterable, Iterator
 
-from celery import current_app
-from flask import jsonify, request
+from celery import current_app, uuid
+from flask import Response, jsonify, request, stream_with_context
+from pydantic import ValidationError
+from redis import RedisError
+from sqlalchemy import select
 
-from web_resource_watchdog import Config, api_v1
+from web_resource_watchdog import Config, db
+from web_resource_watchdog.api_views import api_v1
 from web_resource_watchdog.errors import InvalidAPIUsage
+from web_resource_watchdog.models.history import WebResourceRollup
 from web_resource_watchdog.models.resource import WebResource
+from web_resource_watchdog.models.screenshot import Screenshot
 from web_resource_watchdog.schemas.resource import (
+    CREATE_WEB_RESOURCE_ADAPTER,
     CreateWebResource,
-    ZipFileValidator,
-    allowed_file,
+    ResourceListQuery,
+    validate_archive,
 )
 from web_resource_watchdog.tasks.resource import (
     find_resources,
     save_resources_to_db,
 )
+from web_resource_watchdog.utils.archives import ArchiveError
+from web_resource_watchdog.utils.json_stream import (
+    iter_json_array,
+    iter_ndjson,
+)
+from web_resource_watchdog.utils.spool import BlobTooLarge, get_blob_store
+from web_resource_watchdog.utils.task_events import (
+    get_final_task_state,
+    get_task_progress,
+    is_task_alive,
+    stream_task_events,
+)
+from web_resource_watchdog.utils.upload_dedupe import (
+    claim_upload,
+    reclaim_upload,
+    release_upload,
+)
 
 
 @api_v1.route("/add_resource/", methods=["POST"])
@@ -38,18 +65,159 @@ def add_resource():
             "Request body is empty",
             status_code=HTTPStatus.BAD_REQUEST,
         )
-    CreateWebResource.model_validate_json(request.data)
-    web_resource = WebResource.create(request.get_json())
+    data = request.get_json(silent=True)
+    if data is None:
+        raise InvalidAPIUsage(
+            "Request body is not valid JSON.",
+            status_code=HTTPStatus.BAD_REQUEST,
+        )
+    CreateWebResource.model_validate(data)
+    try:
+        web_resource = WebResource.create(data)
+    except ValueError as error:
+        raise InvalidAPIUsage(str(error), status_code=HTTPStatus.BAD_REQUEST)
     return jsonify(web_resource.to_dict()), HTTPStatus.CREATED
 
 
+def _add_resources(items: Iterable[Any]) -> Iterator[dict[str, Any]]:
+    """Validate and insert items in batches, yielding per-item results.
+
+    Results are yielded in the order of items once their batch is
+    committed. The first occurrence of a url inserted by the batch is
+    `created`, stored and repeated urls are `duplicate`. Only the current
+    batch is kept in memory, urls of earlier batches are stored already.
+    """
+    window = []
+    urls = []
+    created = set()
+
+    def flush() -> Iterator[dict[str, Any]]:
+        outcome = WebResource.insert_batch(urls) if urls else {}
+        for result in window:
+            full_url = result.pop("full_url", None)
+            if "status" in result:
+                pass
+            elif full_url not in outcome:
+                result.update(status="invalid", errors=["Invalid domain."])
+            elif outcome[full_url] is None or full_url in created:
+                result.update(full_url=full_url, status="duplicate")
+            else:
+                created.add(full_url)
+                result.update(
+                    full_url=full_url, status="created", id=outcome[full_url]
+                )
+            yield result
+        window.clear()
+        urls.clear()
+        created.clear()
+
+    try:
+        for index, item in enumerate(items):
+            if isinstance(item, ValueError):
+                errors = [str(item)]
+            else:
+                try:
+                    CREATE_WEB_RESOURCE_ADAPTER.validate_python(item)
+                except ValidationError as error:
+                    errors = [detail["msg"] for detail in error.errors()]
+                else:
+                    errors = None
+            if errors:
+                window.append(
+                    {"index": index, "status": "invalid", "errors": errors}
+                )
+                continue
+            window.append({"index": index, "full_url": item["full_url"]})
+            urls.append(item["full_url"])
+            if len(urls) >= Config.BULK_INSERT_BATCH_SIZE:
+                yield from flush()
+    except ValueError as error:
+        yield from flush()
+        yield {"status": "invalid", "errors": [str(error)]}
+        return
+    yield from flush()
+
+
+@api_v1.route("/add_resources/", methods=["POST"])
+def add_resources():
+    """
+    Create web resources from a JSON array or an NDJSON stream.
+
+    The body is read and validated item by item and items are inserted in
+    batches of `Config.BULK_INSERT_BATCH_SIZE`, one transaction each, so
+    the body is never buffered whole. Every item is a `CreateWebResource`
+    object.
+
+    Returns:
+        Response: A streamed JSON array, or NDJSON for NDJSON requests, of
+        results with the item `index` and `status`: "created" with the
+        new `id`, "duplicate" or "invalid" with `errors`. A body which
+        stops being valid JSON ends with a result without `index`.
+    Raises:
+        InvalidAPIUsage: If the content type is not supported.
+    """
+    if request.mimetype == "application/x-ndjson":
+        items = iter_ndjson(request.stream, Config.RESOURCES_BATCH_MAX_ITEM)
+    elif request.mimetype == "application/json":
+        items = iter_json_array(
+            request.stream,
+            Config.RESOURCES_BATCH_CHUNK_SIZE,
+            Config.RESOURCES_BATCH_MAX_ITEM,
+        )
+    else:
+        raise InvalidAPIUsage(
+            "Content type must be application/json or application/x-ndjson.",
+            status_code=HTTPStatus.UNSUPPORTED_MEDIA_TYPE,
+        )
+    results = (json.dumps(result) for result in _add_resources(items))
+    if request.mimetype == "application/x-ndjson":
+        body = (f"{result}\n" for result in results)
+    else:
+        body = _json_array(results)
+    return Response(stream_with_context(body), mimetype=request.mimetype)
+
+
+def _json_array(items: Iterable[str]) -> Iterator[str]:
+    """Join serialized items into a streamed JSON array."""
+    yield "["
+    for index, item in enumerate(items):
+        yield f",{item}" if index else item
+    yield "]"
+
+
+def _is_lost(task_id: str) -> bool:
+    """Check whether a parsing job failed or stopped without a result.
+
+    A job without a final state which is not alive was killed, e.g. by
+    the OOM killer, or waits in the queue for unusually long.
+    """
+    try:
+        state = get_final_task_state(task_id)
+        if state is None:
+            return not is_task_alive(task_id)
+    except RedisError:
+        return False
+    return state["event"] == "failed"
+
+
 @api_v1.route("/add_resource_from_zip/", methods=["POST"])
 def add_resource_from_zip():
     """
     Create a new web resources from zip file.
 
     This endpoint allows you to create a new web resources by providing
-    zip file in the request body.
+    zip file in the request body. Tar archives of any compression and
+    single gzip, bz2 or xz compressed files are accepted too, the format
+    is sniffed from the content.
+
+    The archive is sent as the `file` part of a multipart form or as the
+    raw request body. Either way it is copied to the upload spool in
+    chunks, so memory use does not depend on its size, and uploads over
+    `Config.UPLOAD_MAX_SIZE` are rejected as soon as the limit is hit.
+    Request bodies longer than `Config.UPLOAD_MAX_CONTENT_LENGTH` are
+    rejected while they are read, chunked ones included.
+    Repeated uploads of the same content are answered with the task of
+    the first one, unless it failed or was lost, see `claim_upload`.
 
     Returns:
         dict: A dictionary containing the details of the newly created web
@@ -59,23 +227,57 @@ def add_resource_from_zip():
         InvalidAPIUsage: If the request body is empty or JSON data
         validation fails.
     """
-    if "file" not in request.files:
-        raise InvalidAPIUsage(
-            "No file part.", status_code=HTTPStatus.BAD_REQUEST
-        )
-    file = request.files["file"]
-    if file.filename == "":
-        raise InvalidAPIUsage(
-            "File is empy.", status_code=HTTPStatus.BAD_REQUEST
-        )
-    if not allowed_file(file.filename):
+    request.max_content_length = Config.UPLOAD_MAX_CONTENT_LENGTH
+    if request.mimetype == "multipart/form-data":
+        if "file" not in request.files:
+            raise InvalidAPIUsage(
+                "No file part.", status_code=HTTPStatus.BAD_REQUEST
+            )
+        file = request.files["file"]
+        if file.filename == "":
+            raise InvalidAPIUsage(
+                "File is empy.", status_code=HTTPStatus.BAD_REQUEST
+            )
+        stream = file.stream
+    else:
+        stream = request.stream
+    store = get_blob_store()
+    try:
+        file_ref, _, sha256 = store.put(stream, Config.UPLOAD_MAX_SIZE)
+    except BlobTooLarge as error:
         raise InvalidAPIUsage(
-            "File extension is not allowed.",
-            status_code=HTTPStatus.BAD_REQUEST,
+            str(error), status_code=HTTPStatus.REQUEST_ENTITY_TOO_LARGE
         )
-    file_data = file.read()
-    ZipFileValidator.validate_zip_file(file_data)
-    task = (find_resources.s(file_data) | save_resources_to_db.s())()
+    try:
+        with store.open(file_ref) as file:
+            validate_archive(file)
+    except ArchiveError as error:
+        store.delete(file_ref)
+        raise InvalidAPIUsage(str(error), status_code=HTTPStatus.BAD_REQUEST)
+    task_id = uuid()
+    duplicate_of = claim_upload(sha256, task_id)
+    if duplicate_of is not None:
+        if not _is_lost(duplicate_of):
+            store.delete(file_ref)
+            return (
+                jsonify(
+                    {
+                        "message": "Archive was already uploaded.",
+                        "task_id": duplicate_of,
+                    }
+                ),
+                HTTPStatus.OK,
+            )
+        reclaim_upload(sha256, task_id)
+    try:
+        task = (
+            find_resources.s(file_ref, job_id=task_id)
+            | save_resources_to_db.s().set(task_id=task_id)
+        )()
+    except Exception:
+        store.delete(file_ref)
+        release_upload(sha256, task_id)
+        raise
     return (
         jsonify(
             {"message": "Zip file processing started.", "task_id": task.id}
@@ -99,8 +301,16 @@ def get_parse_status(task_id: str):
             or "error".
             - "message" (str): A message describing the task status
             or error.
+            - "progress" (dict): Counters of scanned members and their
+            total, processed bytes, found, inserted, duplicate and
+            invalid urls.
     """
     try:
+        progress = get_task_progress(task_id)
+        state = get_final_task_state(task_id)
+        if state is not None:
+            state.pop("event")
+            return jsonify({**state, "progress": progress}), HTTPStatus.OK
         broker = current_app.backend.client
         error_key = Config.ERROR_KEY.format(task_id=task_id)
         parse_errors = list(
@@ -133,7 +343,11 @@ def get_parse_status(task_id: str):
         else:
             return (
                 jsonify(
-                    {"status": "pending", "message": "Task is still pending"}
+                    {
+                        "status": "pending",
+                        "message": "Task is still pending",
+                        "progress": progress,
+                    }
                 ),
                 HTTPStatus.OK,
             )
@@ -148,3 +362,182 @@ def get_parse_status(task_id: str):
             ),
             HTTPStatus.OK,
         )
+
+
+@api_v1.route("/get_parse_events/<string:task_id>/", methods=["GET"])
+def get_parse_events(task_id: str):
+    """
+    Stream status events of a zip file parsing task.
+
+    The response is a Server-Sent Events stream of `progress` events
+    followed by a final `completed` or `failed` event carrying the same
+    data as `get_parse_status`. Finished tasks are answered at once from
+    their cached final state.
+
+    Args:
+        task_id (str): The unique identifier of the asynchronous task.
+
+    Returns:
+        Response: A `text/event-stream` response.
+    """
+    return Response(
+        stream_with_context(
+            stream_task_events(
+                task_id,
+                Config.TASK_EVENTS_TIMEOUT,
+                Config.TASK_EVENTS_HEARTBEAT,
+            )
+        ),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@api_v1.route("/resources/<int:resource_id>/uptime/", methods=["GET"])
+def get_resource_uptime(resource_id: int):
+    """
+    Retrieve the uptime of a web resource.
+
+    The uptime is computed from hourly or daily rollups of the check
+    history, raw history is never scanned.
+
+    Args:
+        resource_id (int): The id of the web resource.
+
+    Query parameters:
+        hours (int): The length of the period up to now, 24 by default.
+
+    Returns:
+        dict: The number of checks, successful checks and uptime percent;
+        int: HTTP response status code.
+    Raises:
+        InvalidAPIUsage: If the period is not positive or the web resource
+        does not exist.
+    """
+    hours = request.args.get("hours", 24, type=int)
+    if hours <= 0:
+        raise InvalidAPIUsage(
+            "Period must be positive.", status_code=HTTPStatus.BAD_REQUEST
+        )
+    if (
+        db.session.scalar(
+            select(WebResource.id).where(WebResource.id == resource_id)
+        )
+        is None
+    ):
+        raise InvalidAPIUsage("Web resource not found.")
+    until = datetime.now(timezone.utc)
+    uptime = WebResourceRollup.uptime(
+        resource_id, until - timedelta(hours=hours), until
+    )
+    return jsonify({"resource_id": resource_id, **uptime}), HTTPStatus.OK
+
+
+@api_v1.route("/resources/", methods=["GET"])
+def list_resources():
+    """
+    List stored web resources page by page.
+
+    Pages are ordered by id and addressed by a cursor, the id of the last
+    resource of the previous page, so deep pages are as fast as the first.
+
+    Query parameters:
+        cursor (int): The `next_cursor` of the previous page, 0 by default.
+        limit (int): The page size.
+        domain, domain_zone, protocol (str): Exact match filters.
+        is_available, is_watched (bool): Status filters.
+
+    Returns:
+        dict: The resources of the page and the cursor of the next page,
+        null on the last page;
+        int: HTTP response status code.
+    Raises:
+        ValidationError: If a query parameter is invalid.
+    """
+    query = ResourceListQuery.model_validate(request.args.to_dict())
+    filters = query.model_dump(exclude={"cursor", "limit"}, exclude_none=True)
+    resources, next_cursor = WebResource.list_page(
+        query.cursor, query.limit, filters
+    )
+    return (
+        jsonify({"resources": resources, "next_cursor": next_cursor}),
+        HTTPStatus.OK,
+    )
+
+
+@api_v1.route("/resources/<int:resource_id>/screenshot/", methods=["PUT"])
+def put_resource_screenshot(resource_id: int):
+    """
+    Store a screenshot of a web resource.
+
+    The image is the raw request body with an `image/*` content type.
+    Screenshots are stored once per content, keyed by their SHA-256.
+
+    Args:
+        resource_id (int): The id of the web resource.
+
+    Returns:
+        dict: The digest of the stored screenshot;
+        int: HTTP response status code.
+    Raises:
+        InvalidAPIUsage: If the body is not an image, is empty or larger
+        than `Config.SCREENSHOT_MAX_SIZE`, or the web resource does not
+        exist.
+    """
+    if not request.mimetype.startswith("image/"):
+        raise InvalidAPIUsage(
+            "Content type must be an image type.",
+            status_code=HTTPStatus.UNSUPPORTED_MEDIA_TYPE,
+        )
+    content = request.stream.read(Config.SCREENSHOT_MAX_SIZE + 1)
+    if not content:
+        raise InvalidAPIUsage(
+            "Request body is empty", status_code=HTTPStatus.BAD_REQUEST
+        )
+    if len(content) > Config.SCREENSHOT_MAX_SIZE:
+        raise InvalidAPIUsage(
+            f"Screenshot is larger than {Config.SCREENSHOT_MAX_SIZE} bytes.",
+            status_code=HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+        )
+    sha256 = WebResource.set_screenshot(resource_id, content, request.mimetype)
+    if sha256 is None:
+        raise InvalidAPIUsage("Web resource not found.")
+    return (
+        jsonify({"resource_id": resource_id, "screenshot_sha256": sha256}),
+        HTTPStatus.OK,
+    )
+
+
+@api_v1.route("/resources/<int:resource_id>/screenshot/", methods=["GET"])
+def get_resource_screenshot(resource_id: int):
+    """
+    Download the screenshot of a web resource.
+
+    The image is streamed in chunks of `Config.SCREENSHOT_CHUNK_SIZE`
+    bytes. Its digest is the ETag, requests with a matching
+    `If-None-Match` header are answered with 304 Not Modified.
+
+    Args:
+        resource_id (int): The id of the web resource.
+
+    Returns:
+        Response: The image.
+    Raises:
+        InvalidAPIUsage: If the web resource or its screenshot does not
+        exist.
+    """
+    screenshot = WebResource.get_screenshot(resource_id)
+    if screenshot is None:
+        raise InvalidAPIUsage("Screenshot not found.")
+    headers = {"ETag": f'"{screenshot.sha256}"', "Cache-Control": "no-cache"}
+    if screenshot.sha256 in request.if_none_match:
+        return Response(status=HTTPStatus.NOT_MODIFIED, headers=headers)
+    return Response(
+        stream_with_context(
+            Screenshot.iter_content(
+                screenshot.sha256, Config.SCREENSHOT_CHUNK_SIZE
+            )
+        ),
+        mimetype=screenshot.content_type,
+        headers={**headers, "Content-Length": str(screenshot.size)},
+    )
@@ -2,8 +2,9 @@ from http import HTTPStatus
 
 from flask import jsonify
 from pydantic import ValidationError
+from werkzeug.exceptions import RequestEntityTooLarge
 
-from web_resource_watchdog import api_v1
+from web_resource_watchdog.api_views import api_v1
 from web_resource_watchdog.errors import InvalidAPIUsage
 
 
@@ -25,3 +26,16 @@ def data_validation_failed_handler(error: ValidationError):
     Returns a dictionary with information about the error details.
     """
     return error.json(), HTTPStatus.BAD_REQUEST
+
+
+@api_v1.errorhandler(RequestEntityTooLarge)
+def request_entity_too_large_handler(error: RequestEntityTooLarge):
+    """
+    Handle requests longer than allowed for their endpoint.
+
+    Returns a dictionary with the error message.
+    """
+    return (
+        jsonify(error="Request body is too large."),
+        HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+    )
@@ -1,2 +1,3 @@
+from .app_factory import create_app, create_worker  # noqa
 from .flask_app_factory import create_flask_app  # noqa
 from .orm_factory import create_database  # noqa
@@ -0,0 +1,67 @@
+from typing import Type
+
+from celery import Celery
+from flask import Flask
+
+from web_resource_watchdog.settings import Config
+
+from .celery_factory import create_celery_app
+from .flask_app_factory import create_flask_app
+from .orm_factory import create_database
+
+
+def create_worker(
+    config: Type[Config] = Config, flask_app: Flask | None = None
+) -> Celery:
+    """Create a Celery app with all tasks registered.
+
+    Tasks run in the context of `flask_app`, by default a bare app with
+    the ORM only: views, error handlers and migrations are never imported
+    on the worker path. Its sessions use the primary only, as tasks read
+    rows just written by other tasks.
+    """
+    if flask_app is None:
+        flask_app = create_flask_app(config)
+        create_database(flask_app, migrations=False, replicas=False)
+    celery_app = create_celery_app(flask_app)
+    flask_app.extensions["celery"] = celery_app
+
+    from web_resource_watchdog import tasks  # noqa
+    from web_resource_watchdog.utils.metrics import connect_celery_metrics
+
+    connect_celery_metrics()
+    return celery_app
+
+
+def create_app(
+    config: Type[Config] = Config,
+    api: bool = True,
+    celery_app: Celery | None = None,
+) -> Flask:
+    """Create the Flask app with the ORM, migrations and Celery.
+
+    The API blueprint, error handlers, metrics and database replicas are
+    registered only if `api` is set, CLI tools like `flask db` do without
+    them. Tasks are
+    sent through `celery_app` bound to the new app, or a new one.
+    """
+    flask_app = create_flask_app(config)
+    create_database(flask_app, replicas=api)
+    if celery_app is None:
+        create_worker(config, flask_app)
+    else:
+        celery_app.flask_app = flask_app
+        flask_app.extensions["celery"] = celery_app
+    if not api:
+        from web_resource_watchdog import models  # noqa
+
+        return flask_app
+
+    from web_resource_watchdog import error_handlers  # noqa
+    from web_resource_watchdog.api_views import v1  # noqa
+    from web_resource_watchdog.api_views import api_v1
+    from web_resource_watchdog.utils.metrics import init_metrics
+
+    flask_app.register_blueprint(api_v1)
+    init_metrics(flask_app)
+    return flask_app
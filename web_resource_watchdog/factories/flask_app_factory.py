@@ -1,12 +1,36 @@
 from typing import Type  # noqa D104
 
 from flask import Flask
+from flask import Request as FlaskRequest
 
 from web_resource_watchdog.settings import Config
 
 
+class Request(FlaskRequest):
+    """Request whose body size limit can be set by its view.
+
+    `max_content_length` is `MAX_CONTENT_LENGTH` of the app unless it is
+    set before the body is read. The limit is enforced on the stream, so
+    it also holds for chunked requests without a Content-Length.
+    """
+
+    _max_content_length: int | None = None
+
+    @property
+    def max_content_length(self) -> int | None:
+        """The maximum number of bytes of the request body."""
+        if self._max_content_length is not None:
+            return self._max_content_length
+        return super().max_content_length
+
+    @max_content_length.setter
+    def max_content_length(self, value: int | None) -> None:
+        self._max_content_length = value
+
+
 def create_flask_app(config: Type[Config]) -> Flask:
     """Create Flask application from Config class."""
     flask_app = Flask(__name__)
+    flask_app.request_class = Request
     flask_app.config.from_object(config)
     return flask_app
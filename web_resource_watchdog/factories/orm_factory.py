@@ -1,12 +1,136 @@
-from typing import Tuple
+import os
+import random
+import weakref
+from typing import TYPE_CHECKING, Any, Tuple
 
-from flask import Flask
-from flask_migrate import Migrate
+from flask import Flask, current_app
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session
+from sqlalchemy import Engine, Select, create_engine, make_url
+from sqlalchemy.orm import scoped_session
 
+if TYPE_CHECKING:
+    from flask_migrate import Migrate
 
-def create_database(flask_app: Flask) -> Tuple[SQLAlchemy, Migrate]:
-    """Create SQLAlchemy ORM and migrations."""
-    database = SQLAlchemy(flask_app)
-    migrate = Migrate(flask_app, database)
-    return database, migrate
+# Extension of Flask apps listing their replica engines.
+REPLICAS_EXTENSION = "sqlalchemy_replicas"
+
+# Engines of all apps, disposed in children after a fork.
+_engines: "weakref.WeakSet[Engine]" = weakref.WeakSet()
+
+
+class RoutingSession(Session):
+    """Session reading from a replica until it writes.
+
+    Plain selects of the default bind go to a replica of the app, picked
+    at random on the first read and kept for the session, so its reads
+    never go back in time. Flushes, other statements, locking selects and bare
+    connections go to the primary, and pin the session to it until the
+    session is discarded, so it reads its own writes. Helpers which read
+    rows to decide what to write pin the session first, see
+    `use_primary`. Without replicas everything goes to the primary.
+
+    Attributes:
+        pinned (bool): Whether all statements go to the primary.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.pinned = False
+        self._replica = None
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        """Return the engine for a statement, see the class docstring."""
+        engine = super().get_bind(
+            mapper=mapper, clause=clause, bind=bind, **kwargs
+        )
+        if bind is not None or engine is not self._db.engines.get(None):
+            return engine
+        is_read = isinstance(clause, Select) and clause._for_update_arg is None
+        if self._flushing or (
+            not is_read and (clause is not None or mapper is None)
+        ):
+            self.pinned = True
+        if self.pinned or not is_read:
+            return engine
+        replicas = current_app.extensions.get(REPLICAS_EXTENSION)
+        if not replicas:
+            return engine
+        if self._replica not in replicas:
+            self._replica = random.choice(replicas)
+        return self._replica
+
+
+def use_primary(session: Session | scoped_session) -> None:
+    """Send all further statements of a session to the primary.
+
+    Sessions of other classes have no replicas and are left alone.
+    """
+    if isinstance(session, scoped_session):
+        session = session()
+    if isinstance(session, RoutingSession):
+        session.pinned = True
+
+
+db = SQLAlchemy(session_options={"class_": RoutingSession})
+
+
+def _pool_options(config: dict, role: str, uri: str) -> dict:
+    """Return the pool settings of a role, none for SQLite."""
+    if make_url(uri).get_backend_name() == "sqlite":
+        return {}
+    return {
+        "pool_size": config[f"SQLALCHEMY_{role}_POOL_SIZE"],
+        "max_overflow": config[f"SQLALCHEMY_{role}_MAX_OVERFLOW"],
+        "pool_timeout": config[f"SQLALCHEMY_{role}_POOL_TIMEOUT"],
+        "pool_recycle": config["SQLALCHEMY_POOL_RECYCLE"],
+        "pool_pre_ping": config["SQLALCHEMY_POOL_PRE_PING"],
+    }
+
+
+def _dispose_engines() -> None:
+    """Drop pooled connections inherited from the parent process.
+
+    The connections are left open for the parent, which still uses them.
+    """
+    for engine in list(_engines):
+        engine.dispose(close=False)
+
+
+os.register_at_fork(after_in_child=_dispose_engines)
+
+
+def create_database(
+    flask_app: Flask, migrations: bool = True, replicas: bool = True
+) -> Tuple[SQLAlchemy, "Migrate | None"]:
+    """Bind the ORM to a Flask app, with migrations if asked for.
+
+    The primary and every replica of `SQLALCHEMY_REPLICA_URIS` get the
+    pool settings of their role, explicit `SQLALCHEMY_ENGINE_OPTIONS`
+    of the primary taking precedence. Replicas are read by
+    `RoutingSession` and only created if `replicas` is set. Engines are
+    disposed after a fork, as done by gunicorn and prefork Celery workers.
+
+    Flask-Migrate pulls in Alembic, so it is imported only by apps which
+    run migrations.
+    """
+    config = flask_app.config
+    config["SQLALCHEMY_ENGINE_OPTIONS"] = {
+        **_pool_options(config, "PRIMARY", config["SQLALCHEMY_DATABASE_URI"]),
+        **config.get("SQLALCHEMY_ENGINE_OPTIONS", {}),
+    }
+    db.init_app(flask_app)
+    with flask_app.app_context():
+        _engines.update(db.engines.values())
+    if replicas:
+        # Not bind keys, Flask-SQLAlchemy would create tables on them.
+        flask_app.extensions[REPLICAS_EXTENSION] = [
+            create_engine(uri, **_pool_options(config, "REPLICA", uri))
+            for uri in config["SQLALCHEMY_REPLICA_URIS"]
+        ]
+        _engines.update(flask_app.extensions[REPLICAS_EXTENSION])
+    if not migrations:
+        return db, None
+    from flask_migrate import Migrate
+
+    return db, Migrate(flask_app, db)
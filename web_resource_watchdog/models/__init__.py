@@ -1 +1,13 @@
-from .resource import BaseModel, WebResource, WebResourceStatus  # noqa
+from .history import (  # noqa
+    RollupWatermark,
+    WebResourceCheck,
+    WebResourceRollup,
+)
+from .resource import (  # noqa
+    BaseModel,
+    BulkInsertResult,
+    EvictionReport,
+    WebResource,
+    WebResourceStatus,
+)
+from .screenshot import Screenshot  # noqa
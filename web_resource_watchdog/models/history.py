@@ -0,0 +1,440 @@
+from datetime import datetime, timedelta, timezone
+from itertools import groupby
+from typing import Iterable
+
+from flask_sqlalchemy.session import Session
+from sqlalchemy import case, delete, func, insert, select, text
+
+from web_resource_watchdog import db
+from web_resource_watchdog.factories.orm_factory import use_primary
+from web_resource_watchdog.settings import Config
+from web_resource_watchdog.utils.http_checker import CheckResult
+
+ROLLUP_PERIODS = {
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1),
+}
+PARTITION_PREFIX = "web_resource_check_p"
+DEFAULT_PARTITION = "web_resource_check_default"
+PARTITION_DATE_FORMAT = "%Y%m%d"
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Return an aware UTC datetime, SQLite returns naive ones."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _floor(value: datetime, step: timedelta) -> datetime:
+    """Round a datetime down to the start of its bucket."""
+    seconds = step.total_seconds()
+    return datetime.fromtimestamp(
+        _as_utc(value).timestamp() // seconds * seconds, timezone.utc
+    )
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+    """Return a linearly interpolated percentile of sorted values."""
+    position = (len(values) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+class WebResourceCheck(db.Model):
+    """Append-only history of availability checks.
+
+    The table has no foreign key to `web_resource`, so bulk inserts and
+    evictions do not pay for it, and it is partitioned by day on
+    PostgreSQL. Raw rows are removed once they are rolled up and older
+    than the retention period.
+
+    Attributes:
+        resource_id (int): The id of the checked web resource.
+        checked_at (datetime): The time of the check.
+        status_code (int, optional): The received HTTP status code.
+        latency (float, optional): The response latency in seconds.
+        is_available (bool): Indicates whether the resource was available.
+    """
+
+    __tablename__ = "web_resource_check"
+    __table_args__ = (
+        db.Index("ix_web_resource_check_checked_at", "checked_at"),
+        {"postgresql_partition_by": "RANGE (checked_at)"},
+    )
+
+    resource_id = db.Column(db.Integer, primary_key=True)
+    checked_at = db.Column(db.DateTime(timezone=True), primary_key=True)
+    status_code = db.Column(db.Integer, nullable=True)
+    latency = db.Column(db.Float, nullable=True)
+    is_available = db.Column(db.Boolean, nullable=False)
+
+    @classmethod
+    def bulk_record(
+        cls,
+        results: Iterable[CheckResult],
+        session: Session | None = None,
+    ) -> None:
+        """Append check results to the history without committing."""
+        if session is None:
+            session = db.session
+        rows = [
+            {
+                "resource_id": result.resource_id,
+                "checked_at": result.checked_at,
+                "status_code": result.status_code,
+                "latency": result.latency,
+                "is_available": result.ok,
+            }
+            for result in results
+        ]
+        if rows:
+            session.execute(insert(cls.__table__), rows)
+
+    @classmethod
+    def create_partitions(
+        cls,
+        start: datetime,
+        days: int,
+        session: Session | None = None,
+    ) -> int:
+        """Create daily partitions on PostgreSQL, a no-op elsewhere.
+
+        Rows of a new day already in the default partition would make
+        `CREATE TABLE ... PARTITION OF` fail, so the default partition is
+        detached, its rows of the day are moved to the new partition and
+        it is attached again, all in one transaction.
+
+        Returns:
+            int: The number of partitions ensured.
+        """
+        if session is None:
+            session = db.session
+        if session.get_bind(cls.__mapper__).dialect.name != "postgresql":
+            return 0
+        first_day = _floor(start, ROLLUP_PERIODS["day"])
+        for offset in range(days):
+            day = first_day + timedelta(days=offset)
+            name = PARTITION_PREFIX + day.strftime(PARTITION_DATE_FORMAT)
+            if session.scalar(text(f"SELECT to_regclass('{name}')")):
+                continue
+            has_default = session.scalar(
+                text(f"SELECT to_regclass('{DEFAULT_PARTITION}')")
+            )
+            if has_default:
+                session.execute(
+                    text(
+                        f"ALTER TABLE {cls.__tablename__} "
+                        f"DETACH PARTITION {DEFAULT_PARTITION}"
+                    )
+                )
+            session.execute(
+                text(
+                    f"CREATE TABLE {name} "
+                    f"PARTITION OF {cls.__tablename__} "
+                    f"FOR VALUES FROM ('{day.isoformat()}') "
+                    f"TO ('{(day + timedelta(days=1)).isoformat()}')"
+                )
+            )
+            if has_default:
+                session.execute(
+                    text(
+                        f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+                        "WHERE checked_at >= :start AND checked_at < :end "
+                        f"RETURNING *) INSERT INTO {name} SELECT * FROM moved"
+                    ),
+                    {"start": day, "end": day + timedelta(days=1)},
+                )
+                session.execute(
+                    text(
+                        f"ALTER TABLE {cls.__tablename__} ATTACH PARTITION "
+                        f"{DEFAULT_PARTITION} DEFAULT"
+                    )
+                )
+            session.commit()
+        return days
+
+    @classmethod
+    def compact(
+        cls,
+        cutoff: datetime,
+        step: timedelta = timedelta(hours=1),
+        session: Session | None = None,
+    ) -> int:
+        """Remove raw history older than `cutoff`.
+
+        Whole daily partitions are dropped on PostgreSQL, the remaining
+        rows are deleted in time slices of `step` so every statement stays
+        short.
+
+        Returns:
+            int: The number of deleted rows, dropped partitions excluded.
+        """
+        if session is None:
+            session = db.session
+        use_primary(session)
+        cutoff = _as_utc(cutoff)
+        if session.get_bind(cls.__mapper__).dialect.name == "postgresql":
+            cls._drop_partitions(cutoff, session)
+        oldest = session.scalar(select(func.min(cls.checked_at)))
+        deleted = 0
+        if oldest is None:
+            return deleted
+        start = _floor(oldest, step)
+        while start < cutoff:
+            end = min(start + step, cutoff)
+            deleted += session.execute(
+                delete(cls).where(cls.checked_at < end)
+            ).rowcount
+            session.commit()
+            start = end
+        return deleted
+
+    @classmethod
+    def _drop_partitions(cls, cutoff: datetime, session: Session) -> None:
+        """Drop daily partitions ending before `cutoff`."""
+        partitions = session.scalars(
+            text(
+                "SELECT child.relname FROM pg_inherits "
+                "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+                "WHERE pg_inherits.inhparent = CAST(:parent AS regclass)"
+            ),
+            {"parent": cls.__tablename__},
+        ).all()
+        for name in partitions:
+            try:
+                day = datetime.strptime(
+                    name.removeprefix(PARTITION_PREFIX), PARTITION_DATE_FORMAT
+                ).replace(tzinfo=timezone.utc)
+            except ValueError:
+                continue
+            if day + timedelta(days=1) <= cutoff:
+                session.execute(text(f"DROP TABLE IF EXISTS {name}"))
+        session.commit()
+
+
+class RollupWatermark(db.Model):
+    """The end of the history already aggregated for a rollup period.
+
+    Attributes:
+        period (str): The rollup period, `hour` or `day`.
+        rolled_up_to (datetime): History before this time is aggregated.
+    """
+
+    __tablename__ = "rollup_watermark"
+
+    period = db.Column(db.String(8), primary_key=True)
+    rolled_up_to = db.Column(db.DateTime(timezone=True), nullable=False)
+
+    @classmethod
+    def get_rolled_up_to(
+        cls, period: str, session: Session | None = None
+    ) -> datetime | None:
+        """Return the aware end of aggregated history of a period."""
+        if session is None:
+            session = db.session
+        watermark = session.get(cls, period)
+        return None if watermark is None else _as_utc(watermark.rolled_up_to)
+
+
+class WebResourceRollup(db.Model):
+    """Hourly and daily aggregates of the check history of a resource.
+
+    Attributes:
+        resource_id (int): The id of the checked web resource.
+        period (str): The rollup period, `hour` or `day`.
+        bucket_start (datetime): The start of the aggregated period.
+        checks (int): The number of checks in the period.
+        available_checks (int): The number of successful checks.
+        latency_p50 (float, optional): The median latency in seconds.
+        latency_p95 (float, optional): The 95th percentile of latency.
+        status_codes (dict): Check counts by status code, `error` for
+            checks without a response.
+    """
+
+    __tablename__ = "web_resource_rollup"
+    __table_args__ = (
+        db.Index("ix_web_resource_rollup_bucket", "period", "bucket_start"),
+    )
+
+    resource_id = db.Column(db.Integer, primary_key=True)
+    period = db.Column(db.String(8), primary_key=True)
+    bucket_start = db.Column(db.DateTime(timezone=True), primary_key=True)
+    checks = db.Column(db.Integer, nullable=False)
+    available_checks = db.Column(db.Integer, nullable=False)
+    latency_p50 = db.Column(db.Float, nullable=True)
+    latency_p95 = db.Column(db.Float, nullable=True)
+    status_codes = db.Column(db.JSON, nullable=False)
+
+    @classmethod
+    def rollup(
+        cls,
+        period: str,
+        now: datetime | None = None,
+        session: Session | None = None,
+    ) -> int:
+        """Aggregate complete buckets of history since the last run.
+
+        Buckets are aggregated only once they ended at least
+        `Config.CHECK_HISTORY_ROLLUP_DELAY` seconds ago, so checks
+        committed late with an earlier `checked_at`, as by batched result
+        recording, are not left behind the watermark. Every bucket is
+        committed together with the watermark, so an interrupted run
+        continues from the first missing bucket.
+
+        Returns:
+            int: The number of aggregated buckets.
+        """
+        if session is None:
+            session = db.session
+        use_primary(session)
+        step = ROLLUP_PERIODS[period]
+        end = _floor(
+            (now or datetime.now(timezone.utc))
+            - timedelta(seconds=Config.CHECK_HISTORY_ROLLUP_DELAY),
+            step,
+        )
+        watermark = session.get(RollupWatermark, period)
+        since = None if watermark is None else watermark.rolled_up_to
+        buckets = 0
+        while True:
+            query = select(func.min(WebResourceCheck.checked_at))
+            if since is not None:
+                query = query.where(WebResourceCheck.checked_at >= since)
+            next_check = session.scalar(query)
+            if next_check is None or _floor(next_check, step) >= end:
+                break
+            start = _floor(next_check, step)
+            cls._rollup_bucket(period, start, start + step, session)
+            since = start + step
+            if watermark is None:
+                watermark = RollupWatermark(period=period)
+                session.add(watermark)
+            watermark.rolled_up_to = since
+            session.commit()
+            buckets += 1
+        return buckets
+
+    @classmethod
+    def _rollup_bucket(
+        cls,
+        period: str,
+        start: datetime,
+        end: datetime,
+        session: Session,
+    ) -> None:
+        """Replace the aggregates of one bucket without committing."""
+        window = (
+            WebResourceCheck.checked_at >= start,
+            WebResourceCheck.checked_at < end,
+        )
+        rows = {}
+        for resource_id, status_code, checks, available in session.execute(
+            select(
+                WebResourceCheck.resource_id,
+                WebResourceCheck.status_code,
+                func.count(),
+                func.sum(case((WebResourceCheck.is_available, 1), else_=0)),
+            )
+            .where(*window)
+            .group_by(
+                WebResourceCheck.resource_id, WebResourceCheck.status_code
+            )
+        ):
+            row = rows.setdefault(
+                resource_id,
+                {
+                    "resource_id": resource_id,
+                    "period": period,
+                    "bucket_start": start,
+                    "checks": 0,
+                    "available_checks": 0,
+                    "latency_p50": None,
+                    "latency_p95": None,
+                    "status_codes": {},
+                },
+            )
+            row["checks"] += checks
+            row["available_checks"] += available
+            key = "error" if status_code is None else str(status_code)
+            row["status_codes"][key] = checks
+        for resource_id, p50, p95 in cls._latency_percentiles(window, session):
+            rows[resource_id]["latency_p50"] = p50
+            rows[resource_id]["latency_p95"] = p95
+        session.execute(
+            delete(cls).where(cls.period == period, cls.bucket_start == start)
+        )
+        if rows:
+            session.execute(insert(cls.__table__), list(rows.values()))
+
+    @staticmethod
+    def _latency_percentiles(
+        window: tuple, session: Session
+    ) -> Iterable[tuple[int, float, float]]:
+        """Yield median and 95th percentile latency per resource.
+
+        PostgreSQL computes them with `percentile_cont`, other databases
+        stream latencies sorted per resource, one resource at a time.
+        """
+        latency = WebResourceCheck.latency
+        resource_id = WebResourceCheck.resource_id
+        where = (*window, latency.is_not(None))
+        if session.get_bind(WebResourceCheck.__mapper__).dialect.name == (
+            "postgresql"
+        ):
+            yield from session.execute(
+                select(
+                    resource_id,
+                    func.percentile_cont(0.5).within_group(latency),
+                    func.percentile_cont(0.95).within_group(latency),
+                )
+                .where(*where)
+                .group_by(resource_id)
+            )
+            return
+        rows = session.execute(
+            select(resource_id, latency)
+            .where(*where)
+            .order_by(resource_id, latency)
+            .execution_options(yield_per=10000)
+        )
+        for pk, group in groupby(rows, key=lambda row: row[0]):
+            values = [row[1] for row in group]
+            yield pk, _percentile(values, 0.5), _percentile(values, 0.95)
+
+    @classmethod
+    def uptime(
+        cls,
+        resource_id: int,
+        since: datetime,
+        until: datetime,
+        session: Session | None = None,
+    ) -> dict[str, object]:
+        """Return the uptime of a resource from rollups only.
+
+        Daily rollups are used for ranges of two days and longer, hourly
+        ones otherwise.
+        """
+        if session is None:
+            session = db.session
+        period = "day" if until - since >= timedelta(days=2) else "hour"
+        checks, available_checks = session.execute(
+            select(
+                func.coalesce(func.sum(cls.checks), 0),
+                func.coalesce(func.sum(cls.available_checks), 0),
+            ).where(
+                cls.resource_id == resource_id,
+                cls.period == period,
+                cls.bucket_start >= _floor(since, ROLLUP_PERIODS[period]),
+                cls.bucket_start < until,
+            )
+        ).one()
+        return {
+            "period": period,
+            "checks": checks,
+            "available_checks": available_checks,
+            "uptime": (
+                round(available_checks / checks * 100, 3) if checks else None
+            ),
+        }
@@ -1,14 +1,61 @@
+import time
+from datetime import datetime, timedelta, timezone
 from http import HTTPStatus
-from typing import Any
-from urllib.parse import urlparse
+from itertools import islice
+from typing import Any, Callable, Iterable, NamedTuple
+from urllib.parse import urlsplit
 
 from flask_sqlalchemy.session import Session
-from sqlalchemy import func
+from sqlalchemy import (
+    Boolean,
+    DateTime,
+    Insert,
+    Integer,
+    bindparam,
+    cast,
+    column,
+    delete,
+    func,
+    insert,
+    or_,
+    select,
+    true,
+    update,
+    values,
+)
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import relationship
 
 from web_resource_watchdog import db
 from web_resource_watchdog.errors import InvalidAPIUsage
+from web_resource_watchdog.factories.orm_factory import use_primary
+from web_resource_watchdog.models.history import (
+    WebResourceCheck,
+    WebResourceRollup,
+)
+from web_resource_watchdog.models.screenshot import Screenshot
+from web_resource_watchdog.settings import Config
+from web_resource_watchdog.utils.http_checker import CheckResult
+from web_resource_watchdog.utils.metrics import URLS_STORED, timed
+from web_resource_watchdog.utils.public_suffix import split_host
+from web_resource_watchdog.utils.scheduling import next_check_interval
+from web_resource_watchdog.utils.urls import canonicalize_url
+
+
+class BulkInsertResult(NamedTuple):
+    """Counters of a bulk insert of urls.
+
+    Attributes:
+        inserted (int): The number of inserted web resources.
+        duplicates (int): The number of urls which were already stored
+            or repeated in the input.
+        invalid (int): The number of urls which cannot be parsed.
+    """
+
+    inserted: int = 0
+    duplicates: int = 0
+    invalid: int = 0
 
 
 class BaseModel(db.Model):
@@ -60,6 +107,42 @@ class BaseModel(db.Model):
         }
 
 
+RESOURCE_LIST_COLUMNS = (
+    "id",
+    "full_url",
+    "protocol",
+    "domain",
+    "domain_zone",
+    "url_path",
+    "query_params",
+    "fail_count",
+    "last_success_at",
+)
+RESOURCE_STATUS_LIST_COLUMNS = (
+    "status_code",
+    "request_time",
+    "is_available",
+    "is_watched",
+)
+RESOURCE_STATUS_FILTERS = ("is_available", "is_watched")
+
+
+class EvictionReport(NamedTuple):
+    """Result of an eviction of long-unavailable web resources.
+
+    Attributes:
+        candidates (int): The number of resources matching the criteria.
+        evicted (int): The number of deleted resources, 0 in dry-run mode.
+        batches (int): The number of processed batches.
+        seconds (float): The duration of the eviction.
+    """
+
+    candidates: int = 0
+    evicted: int = 0
+    batches: int = 0
+    seconds: float = 0.0
+
+
 class WebResource(BaseModel):
     """Model for representing web resources.
 
@@ -70,21 +153,42 @@ class WebResource(BaseModel):
         domain_zone (str): The domain zone (e.g., .com, .org).
         url_path (str): The path part of the URL.
         query_params (str): The query parameters of the URL.
-        screenshot (bytes, optional): Binary data for a screenshot,
-            if available.
+        screenshot_sha256 (str, optional): The digest of the screenshot
+            in the `Screenshot` store, if available.
         fail_count (int): The count of failures for this resource.
+        last_success_at (datetime, optional): The time of the last
+            successful check.
         status_codes (relationship): Relationship to the associated web
             resource status entries.
     """
 
+    __table_args__ = (
+        db.Index(
+            "ix_web_resource_eviction",
+            "fail_count",
+            "last_success_at",
+        ),
+        db.Index("ix_web_resource_domain_id", "domain", "id"),
+        db.Index("ix_web_resource_domain_zone_id", "domain_zone", "id"),
+        db.Index("ix_web_resource_protocol_id", "protocol", "id"),
+    )
+
     full_url = db.Column(db.String, nullable=False, unique=True)
     protocol = db.Column(db.String, nullable=False)
     domain = db.Column(db.String, nullable=False)
     domain_zone = db.Column(db.String, nullable=False)
     url_path = db.Column(db.String)
     query_params = db.Column(db.String)
-    screenshot = db.Column(db.LargeBinary, nullable=True)
+    screenshot_sha256 = db.Column(
+        db.String(64),
+        db.ForeignKey(
+            "screenshot.sha256", name="fk_web_resource_screenshot_sha256"
+        ),
+        nullable=True,
+        index=True,
+    )
     fail_count = db.Column(db.Integer, default=0, nullable=False)
+    last_success_at = db.Column(db.DateTime(timezone=True), nullable=True)
     status_codes = relationship(
         "WebResourceStatus", back_populates="resource", uselist=False
     )
@@ -112,22 +216,383 @@ class WebResource(BaseModel):
         commit: bool = True,
         session: Session | None = None,
     ) -> list["WebResource"]:
-        """Web Resource bulk create."""
-        web_resources = [
-            cls.create({"full_url": full_url}, commit=False)
-            for full_url in urls
-        ]
+        """Web Resource bulk create.
+
+        Urls which cannot be split, e.g. with a public suffix as the host,
+        are skipped instead of failing the whole batch.
+        """
+        web_resources = []
+        for full_url in urls:
+            try:
+                web_resources.append(
+                    cls.create({"full_url": full_url}, commit=False)
+                )
+            except ValueError:
+                continue
         if commit:
             cls.bulk_save(web_resources, session)
         return web_resources
 
+    @classmethod
+    def bulk_insert(
+        cls,
+        urls: Iterable[str],
+        batch_size: int | None = None,
+        session: Session | None = None,
+        on_batch: (
+            Callable[[BulkInsertResult, dict[str, int | None]], None] | None
+        ) = None,
+    ) -> BulkInsertResult:
+        """Insert urls with set-based statements skipping stored ones.
+
+        Urls are inserted in batches with `INSERT ... ON CONFLICT DO
+        NOTHING` on PostgreSQL and `INSERT OR IGNORE` on SQLite, and status
+        rows for the inserted resources are created in the same
+        transaction. Duplicates and unparsable urls are counted instead of
+        failing the whole batch. `on_batch` is called with the counts and
+        the per-url outcome of every committed batch, see `insert_batch`.
+        """
+        if session is None:
+            session = db.session
+        if batch_size is None:
+            batch_size = Config.BULK_INSERT_BATCH_SIZE
+        dialect_name = session.get_bind(cls.__mapper__).dialect.name
+        urls = iter(urls)
+        total = BulkInsertResult()
+        while batch := list(islice(urls, batch_size)):
+            result, outcome = cls._insert_batch(batch, dialect_name, session)
+            total = BulkInsertResult(*map(sum, zip(total, result)))
+            if on_batch is not None:
+                on_batch(result, outcome)
+        return total
+
+    @classmethod
+    def insert_batch(
+        cls, urls: list[str], session: Session | None = None
+    ) -> dict[str, int | None]:
+        """Insert one batch of urls in a single transaction.
+
+        Returns:
+            dict[str, int | None]: The new id of every parsable url, None
+            for stored ones and repeats of an url of the batch, canonical
+            forms included. Unparsable urls are left out.
+        """
+        if session is None:
+            session = db.session
+        dialect_name = session.get_bind(cls.__mapper__).dialect.name
+        _, outcome = cls._insert_batch(urls, dialect_name, session)
+        return outcome
+
+    @classmethod
+    def _insert_batch(
+        cls, batch: list[str], dialect_name: str, session: Session
+    ) -> tuple[BulkInsertResult, dict[str, int | None]]:
+        """Insert a batch of urls with their status rows and commit.
+
+        Returns:
+            tuple: The counts of the batch and the outcome of every url as
+            returned by `insert_batch`.
+        """
+        duplicates = invalid = 0
+        rows = {}
+        canonical_urls = {}
+        for full_url in batch:
+            if full_url in canonical_urls:
+                duplicates += 1
+                continue
+            try:
+                row = cls.split_url(full_url)
+            except ValueError:
+                invalid += 1
+                continue
+            if row["full_url"] in rows:
+                duplicates += 1
+                canonical_urls[full_url] = None
+                continue
+            rows[row["full_url"]] = row
+            canonical_urls[full_url] = row["full_url"]
+        if rows and dialect_name not in ("postgresql", "sqlite"):
+            use_primary(session)
+            stored = session.scalars(
+                select(cls.full_url).where(cls.full_url.in_(rows))
+            )
+            for full_url in stored:
+                del rows[full_url]
+                duplicates += 1
+        outcome = dict.fromkeys(canonical_urls)
+        if not rows:
+            result = BulkInsertResult(0, duplicates, invalid)
+            cls._count_stored(result)
+            return result, outcome
+        inserted = dict(
+            session.execute(
+                cls._insert_ignoring_duplicates(dialect_name),
+                list(rows.values()),
+            ).all()
+        )
+        if inserted:
+            session.execute(
+                insert(WebResourceStatus.__table__),
+                [{"resource_id": pk} for pk in inserted.values()],
+            )
+        with timed("db_commit"):
+            session.commit()
+        for full_url, canonical_url in canonical_urls.items():
+            outcome[full_url] = inserted.get(canonical_url)
+        result = BulkInsertResult(
+            len(inserted), duplicates + len(rows) - len(inserted), invalid
+        )
+        cls._count_stored(result)
+        return result, outcome
+
+    @staticmethod
+    def _count_stored(result: BulkInsertResult) -> None:
+        """Add the counts of an inserted batch to the metrics."""
+        for outcome, count in result._asdict().items():
+            if count:
+                URLS_STORED.labels(outcome).inc(count)
+
+    @classmethod
+    def list_page(
+        cls,
+        cursor: int = 0,
+        limit: int = 100,
+        filters: dict[str, Any] | None = None,
+        session: Session | None = None,
+    ) -> tuple[list[dict[str, Any]], int | None]:
+        """Return a page of resources with ids greater than `cursor`.
+
+        Pages are read with `WHERE id > cursor ORDER BY id LIMIT n`, so
+        every page costs the same however deep it is. Equality `filters`
+        on resource and status columns are backed by `(column, id)`
+        indexes.
+
+        Returns:
+            tuple: The page rows and the cursor of the next page, None on
+            the last page.
+        """
+        if session is None:
+            session = db.session
+        conditions = [cls.id > cursor]
+        order_by = cls.id
+        for name, value in (filters or {}).items():
+            if name in RESOURCE_STATUS_FILTERS:
+                # Walk the status index in order from the cursor.
+                conditions.append(WebResourceStatus.resource_id > cursor)
+                order_by = WebResourceStatus.resource_id
+                model = WebResourceStatus
+            else:
+                model = cls
+            conditions.append(getattr(model, name) == value)
+        rows = session.execute(
+            select(
+                *(getattr(cls, name) for name in RESOURCE_LIST_COLUMNS),
+                *(
+                    getattr(WebResourceStatus, name)
+                    for name in RESOURCE_STATUS_LIST_COLUMNS
+                ),
+            )
+            .outerjoin(
+                WebResourceStatus, WebResourceStatus.resource_id == cls.id
+            )
+            .where(*conditions)
+            .order_by(order_by)
+            .limit(limit + 1)
+        ).all()
+        next_cursor = rows[limit - 1].id if len(rows) > limit else None
+        return [row._asdict() for row in rows[:limit]], next_cursor
+
+    @classmethod
+    def evict(
+        cls,
+        min_fail_count: int,
+        unavailable_for: timedelta,
+        batch_size: int,
+        pause: float = 0.0,
+        dry_run: bool = False,
+        session: Session | None = None,
+        on_batch: Callable[[list[str]], None] | None = None,
+    ) -> EvictionReport:
+        """Delete resources failing for long, in small keyset batches.
+
+        Candidates have at least `min_fail_count` failed checks in a row
+        and no successful check within `unavailable_for`, which is checked
+        again under a row lock before deleting. Every batch of
+        ids greater than the last processed one is deleted together with
+        its statuses, check history and screenshots no other resource
+        refers to and committed, then the eviction
+        sleeps for `pause` seconds, so locks are held briefly and the
+        write-ahead log is not flooded. In dry-run mode nothing is deleted.
+        `on_batch` is called with the urls of every deleted batch.
+        """
+        if session is None:
+            session = db.session
+        started = time.perf_counter()
+        since = datetime.now(timezone.utc) - unavailable_for
+        evictable = (
+            cls.fail_count >= min_fail_count,
+            or_(cls.last_success_at.is_(None), cls.last_success_at < since),
+        )
+        candidates = evicted = batches = last_id = 0
+        while True:
+            rows = session.execute(
+                select(cls.id, cls.full_url, cls.screenshot_sha256)
+                .where(cls.id > last_id, *evictable)
+                .order_by(cls.id)
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                break
+            batches += 1
+            candidates += len(rows)
+            last_id = rows[-1].id
+            if dry_run:
+                continue
+            # Resources recovered since the select above are kept.
+            resource_ids = set(
+                session.scalars(
+                    select(cls.id)
+                    .where(cls.id.in_([row.id for row in rows]), *evictable)
+                    .with_for_update()
+                )
+            )
+            rows = [row for row in rows if row.id in resource_ids]
+            for model in (WebResourceCheck, WebResourceRollup):
+                session.execute(
+                    delete(model).where(model.resource_id.in_(resource_ids))
+                )
+            session.execute(
+                delete(WebResourceStatus).where(
+                    WebResourceStatus.resource_id.in_(resource_ids)
+                )
+            )
+            evicted += session.execute(
+                delete(cls).where(cls.id.in_(resource_ids), *evictable)
+            ).rowcount
+            cls._delete_unreferenced_screenshots(
+                {row.screenshot_sha256 for row in rows}, session
+            )
+            session.commit()
+            if on_batch is not None:
+                on_batch([row.full_url for row in rows])
+            if pause:
+                time.sleep(pause)
+        session.commit()
+        return EvictionReport(
+            candidates, evicted, batches, time.perf_counter() - started
+        )
+
+    @classmethod
+    def set_screenshot(
+        cls,
+        resource_id: int,
+        content: bytes,
+        content_type: str,
+        session: Session | None = None,
+    ) -> str | None:
+        """Store a screenshot of a resource, replacing the previous one.
+
+        The image is stored in the content-addressed `Screenshot` store
+        and the resource keeps its digest only. The previous image is
+        deleted unless another resource refers to it.
+
+        Returns:
+            str | None: The digest of the screenshot, None if the resource
+            does not exist.
+        """
+        if session is None:
+            session = db.session
+        previous = session.execute(
+            select(cls.screenshot_sha256)
+            .where(cls.id == resource_id)
+            .with_for_update()
+        ).first()
+        if previous is None:
+            return None
+        sha256 = Screenshot.store(content, content_type, session)
+        session.execute(
+            update(cls)
+            .where(cls.id == resource_id)
+            .values(screenshot_sha256=sha256)
+        )
+        if previous.screenshot_sha256 != sha256:
+            cls._delete_unreferenced_screenshots(
+                {previous.screenshot_sha256}, session
+            )
+        session.commit()
+        return sha256
+
+    @classmethod
+    def get_screenshot(
+        cls, resource_id: int, session: Session | None = None
+    ) -> Screenshot | None:
+        """Return the screenshot of a resource with its content deferred."""
+        if session is None:
+            session = db.session
+        return session.scalar(
+            select(Screenshot)
+            .join(cls, cls.screenshot_sha256 == Screenshot.sha256)
+            .where(cls.id == resource_id)
+        )
+
+    @classmethod
+    def _delete_unreferenced_screenshots(
+        cls, digests: set[str | None], session: Session
+    ) -> None:
+        """Delete screenshots of `digests` no resource refers to."""
+        digests.discard(None)
+        if not digests:
+            return
+        session.execute(
+            delete(Screenshot).where(
+                Screenshot.sha256.in_(digests),
+                ~select(cls.id)
+                .where(cls.screenshot_sha256 == Screenshot.sha256)
+                .exists(),
+            )
+        )
+
+    @classmethod
+    def _insert_ignoring_duplicates(cls, dialect_name: str) -> Insert:
+        """Build an insert statement skipping already stored urls."""
+        table = cls.__table__
+        if dialect_name == "postgresql":
+            statement = postgresql.insert(table).on_conflict_do_nothing(
+                index_elements=[table.c.full_url]
+            )
+        elif dialect_name == "sqlite":
+            statement = insert(table).prefix_with("OR IGNORE")
+        else:
+            statement = insert(table)
+        return statement.returning(table.c.full_url, table.c.id)
+
+    @staticmethod
+    def split_url(full_url: str) -> dict[str, str]:
+        """Split a full url into values of URL-related attributes.
+
+        The url is canonicalized first, so equivalent urls are stored once.
+        The domain zone is the public suffix of the host, credentials and
+        the port are not part of the domain.
+
+        Raises:
+            ValueError: If the domain zone cannot be found in the url.
+        """
+        full_url = canonicalize_url(full_url)
+        parsed_url = urlsplit(full_url)
+        domain, domain_zone = split_host(parsed_url.hostname)
+        return {
+            "full_url": full_url,
+            "protocol": parsed_url.scheme,
+            "url_path": parsed_url.path,
+            "query_params": parsed_url.query,
+            "domain": domain,
+            "domain_zone": domain_zone,
+        }
+
     def parse_url(self) -> None:
         """Parse the full_url to populate other URL-related attributes."""
-        parsed_url = urlparse(self.full_url)
-        self.protocol = parsed_url.scheme
-        self.url_path = parsed_url.path
-        self.query_params = parsed_url.query
-        self.domain, self.domain_zone = parsed_url.netloc.rsplit(".", 1)
+        for key, value in self.split_url(self.full_url).items():
+            setattr(self, key, value)
 
 
 class WebResourceStatus(BaseModel):
@@ -144,11 +609,37 @@ class WebResourceStatus(BaseModel):
             available.
         is_watched (bool): Indicates whether the resource is being actively
             monitored.
+        next_check_at (datetime): The time the next check is due.
+        check_interval (int): The current interval between checks in
+            seconds.
 
     Relationships:
         resource: A reference to the associated web resource.
     """
 
+    __table_args__ = (
+        db.Index(
+            "ix_web_resource_status_due",
+            "is_watched",
+            "next_check_at",
+        ),
+        db.Index(
+            "ix_web_resource_status_resource_id",
+            "resource_id",
+            unique=True,
+        ),
+        db.Index(
+            "ix_web_resource_status_available_resource_id",
+            "is_available",
+            "resource_id",
+        ),
+        db.Index(
+            "ix_web_resource_status_watched_resource_id",
+            "is_watched",
+            "resource_id",
+        ),
+    )
+
     resource_id = db.Column(db.Integer, db.ForeignKey(WebResource.id))
     status_code = db.Column(db.Integer, nullable=True)
     request_time = db.Column(
@@ -156,4 +647,260 @@ class WebResourceStatus(BaseModel):
     )
     is_available = db.Column(db.Boolean, default=False)
     is_watched = db.Column(db.Boolean, default=True)
+    next_check_at = db.Column(
+        db.DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    check_interval = db.Column(
+        db.Integer, default=Config.CHECK_MIN_INTERVAL, nullable=False
+    )
     resource = relationship("WebResource", back_populates="status_codes")
+
+    @classmethod
+    def claim_due(
+        cls,
+        limit: int,
+        lease: timedelta,
+        session: Session | None = None,
+    ) -> list[int]:
+        """Claim watched web resources due for a check.
+
+        Claimed rows are locked with `FOR UPDATE SKIP LOCKED` on PostgreSQL
+        and their next check is postponed by `lease`, so concurrent
+        schedulers never claim the same rows.
+
+        Returns:
+            list[int]: The ids of the claimed web resources.
+        """
+        if session is None:
+            session = db.session
+        now = datetime.now(timezone.utc)
+        due = session.execute(
+            select(cls.id, cls.resource_id)
+            .where(cls.is_watched == true(), cls.next_check_at <= now)
+            .order_by(cls.next_check_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        ).all()
+        if due:
+            session.execute(
+                update(cls)
+                .where(cls.id.in_([row.id for row in due]))
+                .values(next_check_at=now + lease)
+            )
+        session.commit()
+        return [row.resource_id for row in due]
+
+    @classmethod
+    def record_results(
+        cls,
+        results: Iterable[tuple],
+        batch_size: int | None = None,
+        session: Session | None = None,
+    ) -> int:
+        """Record check results with a few set-based statements per batch.
+
+        Every result is a `(resource_id, status_code, latency, timestamp,
+        ok)` tuple. A batch reads the current state of its resources in one
+        query, then updates statuses, next check times and fail counters
+        with `UPDATE ... FROM (VALUES ...)` on PostgreSQL and `executemany`
+        elsewhere, appends the history rows and commits.
+
+        Returns:
+            int: The number of recorded results.
+        """
+        if session is None:
+            session = db.session
+        if batch_size is None:
+            batch_size = Config.BULK_INSERT_BATCH_SIZE
+        dialect_name = session.get_bind(cls.__mapper__).dialect.name
+        recorded = 0
+        results = iter(results)
+        while batch := [
+            CheckResult(*result) for result in islice(results, batch_size)
+        ]:
+            statuses, resources = cls._apply_results(batch, session)
+            if dialect_name == "postgresql":
+                cls._update_from_values(statuses, resources, session)
+            else:
+                cls._update_many(statuses, resources, session)
+            WebResourceCheck.bulk_record(batch, session)
+            session.commit()
+            recorded += len(batch)
+        return recorded
+
+    @classmethod
+    def _apply_results(
+        cls, batch: list[CheckResult], session: Session
+    ) -> tuple[list[dict], list[dict]]:
+        """Compute new status and fail counter values of a batch.
+
+        Returns:
+            tuple: Rows of new status values and rows of new fail counters
+            and last success times.
+        """
+        resource_ids = {result.resource_id for result in batch}
+        state = {
+            row.id: row
+            for row in session.execute(
+                select(
+                    WebResource.id,
+                    WebResource.fail_count,
+                    WebResource.last_success_at,
+                    cls.id.label("status_id"),
+                    cls.is_available,
+                    cls.check_interval,
+                )
+                .outerjoin(cls, cls.resource_id == WebResource.id)
+                .where(WebResource.id.in_(resource_ids))
+                .with_for_update(of=WebResource)
+            )
+        }
+        missing = [pk for pk, row in state.items() if row.status_id is None]
+        if missing:
+            session.execute(
+                insert(cls.__table__),
+                [{"resource_id": pk, "is_available": False} for pk in missing],
+            )
+        fail_counts = {}
+        last_successes = {}
+        availability = {}
+        intervals = {}
+        statuses = {}
+        for result in sorted(batch, key=lambda item: item.checked_at):
+            row = state.get(result.resource_id)
+            if row is None:
+                continue
+            pk = result.resource_id
+            fail_count = fail_counts.get(pk, row.fail_count)
+            fail_counts[pk] = 0 if result.ok else fail_count + 1
+            if result.ok:
+                last_successes[pk] = result.checked_at
+            interval = next_check_interval(
+                intervals.get(
+                    pk, row.check_interval or Config.CHECK_MIN_INTERVAL
+                ),
+                result.ok,
+                availability.get(pk, bool(row.is_available)),
+                fail_counts[pk],
+                Config.CHECK_MIN_INTERVAL,
+                Config.CHECK_MAX_INTERVAL,
+                Config.CHECK_INTERVAL_GROWTH,
+            )
+            intervals[pk] = interval
+            availability[pk] = result.ok
+            statuses[pk] = {
+                "resource_id": pk,
+                "status_code": result.status_code,
+                "request_time": result.checked_at,
+                "is_available": result.ok,
+                "check_interval": interval,
+                "next_check_at": result.checked_at
+                + timedelta(seconds=interval),
+            }
+        resources = [
+            {
+                "resource_id": pk,
+                "fail_count": fail_count,
+                "last_success_at": last_successes.get(
+                    pk, state[pk].last_success_at
+                ),
+            }
+            for pk, fail_count in fail_counts.items()
+        ]
+        return list(statuses.values()), resources
+
+    @classmethod
+    def _update_from_values(
+        cls, statuses: list[dict], resources: list[dict], session: Session
+    ) -> None:
+        """Update a batch with two `UPDATE ... FROM (VALUES ...)`."""
+        if not statuses:
+            return
+        status_values = values(
+            column("resource_id", Integer),
+            column("status_code", Integer),
+            column("request_time", DateTime(timezone=True)),
+            column("is_available", Boolean),
+            column("check_interval", Integer),
+            column("next_check_at", DateTime(timezone=True)),
+            name="status_values",
+        ).data([tuple(row.values()) for row in statuses])
+        # VALUES columns holding only NULLs are typed as text by PostgreSQL.
+        session.execute(
+            update(cls)
+            .where(cls.resource_id == status_values.c.resource_id)
+            .values(
+                {
+                    name: cast(
+                        status_values.c[name], status_values.c[name].type
+                    )
+                    for name in (
+                        "status_code",
+                        "request_time",
+                        "is_available",
+                        "check_interval",
+                        "next_check_at",
+                    )
+                }
+            )
+        )
+        resource_values = values(
+            column("resource_id", Integer),
+            column("fail_count", Integer),
+            column("last_success_at", DateTime(timezone=True)),
+            name="resource_values",
+        ).data([tuple(row.values()) for row in resources])
+        session.execute(
+            update(WebResource)
+            .where(WebResource.id == resource_values.c.resource_id)
+            .values(
+                fail_count=resource_values.c.fail_count,
+                last_success_at=cast(
+                    resource_values.c.last_success_at,
+                    DateTime(timezone=True),
+                ),
+            )
+        )
+
+    @classmethod
+    def _update_many(
+        cls, statuses: list[dict], resources: list[dict], session: Session
+    ) -> None:
+        """Update a batch with two `executemany` statements."""
+        if not statuses:
+            return
+        connection = session.connection()
+        table = cls.__table__
+        connection.execute(
+            update(table)
+            .where(table.c.resource_id == bindparam("_resource_id"))
+            .values(
+                status_code=bindparam("status_code"),
+                request_time=bindparam("request_time"),
+                is_available=bindparam("is_available"),
+                check_interval=bindparam("check_interval"),
+                next_check_at=bindparam("next_check_at"),
+            ),
+            cls._keyed_by_resource(statuses),
+        )
+        resource_table = WebResource.__table__
+        connection.execute(
+            update(resource_table)
+            .where(resource_table.c.id == bindparam("_resource_id"))
+            .values(
+                fail_count=bindparam("fail_count"),
+                last_success_at=bindparam("last_success_at"),
+            ),
+            cls._keyed_by_resource(resources),
+        )
+
+    @staticmethod
+    def _keyed_by_resource(rows: list[dict]) -> list[dict]:
+        """Rename `resource_id`, so it is not added to the SET clause."""
+        return [
+            {
+                "_resource_id" if key == "resource_id" else key: value
+                for key, value in row.items()
+            }
+            for row in rows
+        ]
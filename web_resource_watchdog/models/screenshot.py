@@ -0,0 +1,104 @@
+import hashlib
+from typing import Iterator
+
+from flask_sqlalchemy.session import Session
+from sqlalchemy import func, insert, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import deferred
+
+from web_resource_watchdog import db
+from web_resource_watchdog.factories.orm_factory import use_primary
+
+
+class Screenshot(db.Model):
+    """Content-addressed store of screenshot images.
+
+    Images are keyed by the SHA-256 of their content, so identical
+    screenshots are stored once however many resources refer to them.
+    The content is deferred: loading a screenshot loads its metadata
+    only, and the content is streamed in chunks by `iter_content`.
+
+    Attributes:
+        sha256 (str): The hex SHA-256 digest of the content.
+        content_type (str): The media type of the image.
+        size (int): The size of the content in bytes.
+        content (bytes): The image itself.
+        created_at (datetime): The time the content was first stored.
+    """
+
+    __tablename__ = "screenshot"
+
+    sha256 = db.Column(db.String(64), primary_key=True)
+    content_type = db.Column(db.String, nullable=False)
+    size = db.Column(db.Integer, nullable=False)
+    content = deferred(db.Column(db.LargeBinary, nullable=False))
+    created_at = db.Column(
+        db.DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    @classmethod
+    def store(
+        cls,
+        content: bytes,
+        content_type: str,
+        session: Session | None = None,
+    ) -> str:
+        """Store an image unless stored already, without committing.
+
+        Returns:
+            str: The SHA-256 digest the image is stored under.
+        """
+        if session is None:
+            session = db.session
+        sha256 = hashlib.sha256(content).hexdigest()
+        row = {
+            "sha256": sha256,
+            "content_type": content_type,
+            "size": len(content),
+            "content": content,
+        }
+        dialect_name = session.get_bind(cls.__mapper__).dialect.name
+        table = cls.__table__
+        if dialect_name == "postgresql":
+            statement = postgresql.insert(table).on_conflict_do_nothing(
+                index_elements=[table.c.sha256]
+            )
+        elif dialect_name == "sqlite":
+            statement = insert(table).prefix_with("OR IGNORE")
+        else:
+            use_primary(session)
+            if session.get(cls, sha256) is not None:
+                return sha256
+            statement = insert(table)
+        session.execute(statement, [row])
+        return sha256
+
+    @classmethod
+    def iter_content(
+        cls,
+        sha256: str,
+        chunk_size: int,
+        session: Session | None = None,
+    ) -> Iterator[bytes]:
+        """Yield the content of an image in chunks of `chunk_size` bytes.
+
+        Every chunk is read with its own `substr` query, so the image is
+        never loaded whole, neither by the database driver nor here.
+        """
+        if session is None:
+            session = db.session
+        offset = 1
+        while True:
+            chunk = session.scalar(
+                select(
+                    func.substr(
+                        cls.content, offset, chunk_size, type_=db.LargeBinary
+                    )
+                ).where(cls.sha256 == sha256)
+            )
+            if not chunk:
+                return
+            yield chunk
+            if len(chunk) < chunk_size:
+                return
+            offset += chunk_size
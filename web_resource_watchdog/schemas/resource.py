@@ -1,9 +1,21 @@
 import io
-import zipfile
+from typing import BinaryIO
 
-from pydantic import BaseModel, HttpUrl, ValidationError, field_validator
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    HttpUrl,
+    TypeAdapter,
+    field_validator,
+)
 
 from web_resource_watchdog import Config
+from web_resource_watchdog.utils.archives import (
+    ArchiveError,
+    detect_archive_format,
+    validate_zip_directory,
+)
 
 
 class CreateWebResource(BaseModel):
@@ -12,6 +24,27 @@ class CreateWebResource(BaseModel):
     full_url: HttpUrl
 
 
+CREATE_WEB_RESOURCE_ADAPTER = TypeAdapter(CreateWebResource)
+
+
+class ResourceListQuery(BaseModel):
+    """Pydantic schema for query parameters of the resource listing."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    cursor: int = Field(default=0, ge=0)
+    limit: int = Field(
+        default=Config.RESOURCES_PAGE_SIZE,
+        ge=1,
+        le=Config.RESOURCES_MAX_PAGE_SIZE,
+    )
+    domain: str | None = None
+    domain_zone: str | None = None
+    protocol: str | None = None
+    is_available: bool | None = None
+    is_watched: bool | None = None
+
+
 class ZipFileValidator(BaseModel):
     """Pydantic schema for zip-file validation."""
 
@@ -19,33 +52,48 @@ class ZipFileValidator(BaseModel):
 
     @field_validator("zip_file")
     def validate_zip_file(cls, value):
-        """Validate the uploaded zip file.
+        """Validate the uploaded zip file reading its central directory.
+
+        Members are not decompressed here, their CRCs are checked by the
+        worker while it reads them. Limits are taken from `Config`, see
+        `validate_zip_directory`.
 
         Parameters:
-            value (bytes): The uploaded zip file as bytes.
+            value (bytes | BinaryIO): The uploaded zip file as bytes or
+            as a seekable binary stream.
 
         Returns:
-            io.BytesIO: A BytesIO object representing
-            the validated zip buffer.
+            BinaryIO: A binary stream with the validated zip archive.
 
         Raises:
-            ValidationError: If the uploaded file is not a valid
-            zip archive.
+            ArchiveError: If the uploaded file is not a valid zip archive
+            or exceeds a limit.
         """
-        zip_buffer = io.BytesIO(value)
-        try:
-            with zipfile.ZipFile(zip_buffer, "r") as zip_ref:
-                zip_ref.testzip()
-            return zip_buffer
-        except zipfile.BadZipFile:
-            raise ValidationError(
-                "Invalid zip file",
-            )
-
-
-def allowed_file(filename):
-    """Check file extension in allowed extensions."""
-    return ("." in filename) and (
-        filename.rsplit(".", 1)[1].lower()
-        in Config.ALLOWED_ARCHIVES_EXTENSIONS
-    )
+        zip_buffer = io.BytesIO(value) if isinstance(value, bytes) else value
+        validate_zip_directory(
+            zip_buffer,
+            Config.ARCHIVE_MAX_MEMBERS,
+            Config.ARCHIVE_MAX_SIZE,
+            Config.ARCHIVE_MAX_COMPRESSION_RATIO,
+            Config.ARCHIVE_RATIO_MIN_SIZE,
+        )
+        return zip_buffer
+
+
+def validate_archive(stream: BinaryIO) -> str:
+    """Check that an upload is an archive of an allowed format.
+
+    The format is sniffed from the content, the file name is ignored.
+
+    Returns:
+        str: The format of the archive.
+
+    Raises:
+        ArchiveError: If the format is not supported or not allowed.
+    """
+    archive_format = detect_archive_format(stream)
+    if archive_format not in Config.ALLOWED_ARCHIVE_FORMATS:
+        raise ArchiveError(f"Archive format {archive_format} is not allowed.")
+    if archive_format == "zip":
+        ZipFileValidator.validate_zip_file(stream)
+    return archive_format
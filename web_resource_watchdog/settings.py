@@ -1,4 +1,6 @@
 import os  # noqa D104
+import tempfile
+from datetime import timedelta
 
 from dotenv import load_dotenv
 
@@ -17,13 +19,197 @@ class Config:
             "sqlite:///db.sqlite3",
         )
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Comma-separated replicas of the database, read by the API.
+    SQLALCHEMY_REPLICA_URIS = [
+        uri
+        for uri in os.getenv("SQLALCHEMY_REPLICA_URIS", "").split(",")
+        if uri
+    ]
+    SQLALCHEMY_PRIMARY_POOL_SIZE = int(
+        os.getenv("SQLALCHEMY_PRIMARY_POOL_SIZE", 5)
+    )
+    SQLALCHEMY_PRIMARY_MAX_OVERFLOW = int(
+        os.getenv("SQLALCHEMY_PRIMARY_MAX_OVERFLOW", 10)
+    )
+    SQLALCHEMY_PRIMARY_POOL_TIMEOUT = float(
+        os.getenv("SQLALCHEMY_PRIMARY_POOL_TIMEOUT", 30)
+    )
+    SQLALCHEMY_REPLICA_POOL_SIZE = int(
+        os.getenv("SQLALCHEMY_REPLICA_POOL_SIZE", 5)
+    )
+    SQLALCHEMY_REPLICA_MAX_OVERFLOW = int(
+        os.getenv("SQLALCHEMY_REPLICA_MAX_OVERFLOW", 10)
+    )
+    SQLALCHEMY_REPLICA_POOL_TIMEOUT = float(
+        os.getenv("SQLALCHEMY_REPLICA_POOL_TIMEOUT", 10)
+    )
+    SQLALCHEMY_POOL_RECYCLE = int(os.getenv("SQLALCHEMY_POOL_RECYCLE", 1800))
+    SQLALCHEMY_POOL_PRE_PING = os.getenv(
+        "SQLALCHEMY_POOL_PRE_PING", "true"
+    ).lower() in ("1", "true", "yes")
     SECRET_KEY = os.getenv("SECRET_KEY")
     FLASK_APP = os.getenv("FLASK_APP", "web_resource_watchdog")
     CELERY = dict(
         broker_url=os.getenv("BROKER_URL_HOST", "redis://localhost"),
         result_backend=os.getenv("BACKEND_RESULT_HOST", "redis://localhost"),
+        beat_schedule={
+            "schedule-checks": {
+                "task": "web_resource_watchdog.tasks.checks.schedule_checks",
+                "schedule": timedelta(
+                    seconds=float(os.getenv("CHECK_SCHEDULE_PERIOD", 30))
+                ),
+            },
+            "rollup-check-history": {
+                "task": (
+                    "web_resource_watchdog.tasks.history.rollup_check_history"
+                ),
+                "schedule": timedelta(minutes=5),
+            },
+            "compact-check-history": {
+                "task": (
+                    "web_resource_watchdog.tasks.history.compact_check_history"
+                ),
+                "schedule": timedelta(hours=1),
+            },
+            "create-check-history-partitions": {
+                "task": (
+                    "web_resource_watchdog.tasks.history."
+                    "create_check_history_partitions"
+                ),
+                "schedule": timedelta(hours=6),
+            },
+            "evict-unavailable-resources": {
+                "task": (
+                    "web_resource_watchdog.tasks.eviction."
+                    "evict_unavailable_resources"
+                ),
+                "schedule": timedelta(hours=1),
+            },
+        },
     )
-    ALLOWED_ARCHIVES_EXTENSIONS = {
+    UPLOAD_MAX_SIZE = int(os.getenv("UPLOAD_MAX_SIZE", 512 * 1024 * 1024))
+    # Room for multipart headers around the uploaded file. Set as the
+    # limit of upload requests only, MAX_CONTENT_LENGTH caps every endpoint.
+    UPLOAD_MAX_CONTENT_LENGTH = UPLOAD_MAX_SIZE + 1024 * 1024
+    ALLOWED_ARCHIVE_FORMATS = {
         "zip",
+        "tar",
+        "tar.gz",
+        "tar.bz2",
+        "tar.xz",
+        "gz",
+        "bz2",
+        "xz",
     }
+    ARCHIVE_MAX_MEMBERS = int(os.getenv("ARCHIVE_MAX_MEMBERS", 10000))
+    ARCHIVE_MAX_SIZE = int(os.getenv("ARCHIVE_MAX_SIZE", 2 * 1024**3))
+    ARCHIVE_MAX_COMPRESSION_RATIO = float(
+        os.getenv("ARCHIVE_MAX_COMPRESSION_RATIO", 100)
+    )
+    ARCHIVE_RATIO_MIN_SIZE = int(
+        os.getenv("ARCHIVE_RATIO_MIN_SIZE", 1024 * 1024)
+    )
     ERROR_KEY = "task_errors:{task_id}"
+    TASK_EVENTS_CHANNEL = "task_events:{task_id}"
+    TASK_STATE_KEY = "task_state:{task_id}"
+    KNOWN_URLS_KEY = "known_urls"
+    KNOWN_URLS_BATCH_SIZE = int(os.getenv("KNOWN_URLS_BATCH_SIZE", 10000))
+    TASK_PROGRESS_KEY = "task_progress:{task_id}"
+    TASK_PROGRESS_FLUSH_EVERY = int(
+        os.getenv("TASK_PROGRESS_FLUSH_EVERY", 100)
+    )
+    TASK_PROGRESS_FLUSH_INTERVAL = float(
+        os.getenv("TASK_PROGRESS_FLUSH_INTERVAL", 1)
+    )
+    TASK_STATE_TTL = int(os.getenv("TASK_STATE_TTL", 24 * 60 * 60))
+    TASK_ALIVE_KEY = "task_alive:{task_id}"
+    # Tasks without events for this long are taken for dead, e.g. killed.
+    TASK_ALIVE_TTL = int(os.getenv("TASK_ALIVE_TTL", 10 * 60))
+    UPLOAD_DIGEST_KEY = "upload_digest:{sha256}"
+    UPLOAD_DEDUPE_TTL = int(os.getenv("UPLOAD_DEDUPE_TTL", TASK_STATE_TTL))
+    MEMBER_CACHE_ENABLED = os.getenv(
+        "MEMBER_CACHE_ENABLED", "false"
+    ).lower() in ("1", "true", "yes")
+    MEMBER_CACHE_KEY = "member_urls:{extractor}:{sha256}"
+    MEMBER_CACHE_TTL = int(os.getenv("MEMBER_CACHE_TTL", 7 * 24 * 60 * 60))
+    MEMBER_CACHE_MAX_URLS = int(os.getenv("MEMBER_CACHE_MAX_URLS", 10000))
+    TASK_EVENTS_TIMEOUT = float(os.getenv("TASK_EVENTS_TIMEOUT", 5 * 60))
+    TASK_EVENTS_HEARTBEAT = float(os.getenv("TASK_EVENTS_HEARTBEAT", 15))
+    ZIP_READ_CHUNK_SIZE = int(os.getenv("ZIP_READ_CHUNK_SIZE", 1024 * 1024))
+    URL_MAX_LENGTH = int(os.getenv("URL_MAX_LENGTH", 4096))
+    ZIP_FAN_OUT_THRESHOLD = int(
+        os.getenv("ZIP_FAN_OUT_THRESHOLD", 256 * 1024 * 1024)
+    )
+    ZIP_FAN_OUT_PARALLELISM = int(
+        os.getenv("ZIP_FAN_OUT_PARALLELISM", os.cpu_count() or 1)
+    )
+    BULK_INSERT_BATCH_SIZE = int(os.getenv("BULK_INSERT_BATCH_SIZE", 1000))
+    CHECK_CONCURRENCY = int(os.getenv("CHECK_CONCURRENCY", 500))
+    CHECK_PER_HOST_CONCURRENCY = int(
+        os.getenv("CHECK_PER_HOST_CONCURRENCY", 4)
+    )
+    CHECK_CONNECT_TIMEOUT = float(os.getenv("CHECK_CONNECT_TIMEOUT", 5))
+    CHECK_READ_TIMEOUT = float(os.getenv("CHECK_READ_TIMEOUT", 10))
+    CHECK_KEEPALIVE_TIMEOUT = float(os.getenv("CHECK_KEEPALIVE_TIMEOUT", 15))
+    CHECK_USER_AGENT = os.getenv("CHECK_USER_AGENT", "web-resource-watchdog")
+    CHECK_MIN_INTERVAL = int(os.getenv("CHECK_MIN_INTERVAL", 60))
+    CHECK_MAX_INTERVAL = int(os.getenv("CHECK_MAX_INTERVAL", 24 * 60 * 60))
+    CHECK_INTERVAL_GROWTH = float(os.getenv("CHECK_INTERVAL_GROWTH", 2))
+    CHECK_CLAIM_LEASE = int(os.getenv("CHECK_CLAIM_LEASE", 10 * 60))
+    CHECK_BATCH_SIZE = int(os.getenv("CHECK_BATCH_SIZE", 1000))
+    CHECK_MAX_BATCHES = int(os.getenv("CHECK_MAX_BATCHES", 100))
+    CHECK_HISTORY_RETENTION_DAYS = int(
+        os.getenv("CHECK_HISTORY_RETENTION_DAYS", 7)
+    )
+    CHECK_HISTORY_ROLLUP_DELAY = int(
+        os.getenv("CHECK_HISTORY_ROLLUP_DELAY", 15 * 60)
+    )
+    CHECK_HISTORY_PARTITIONS_AHEAD = int(
+        os.getenv("CHECK_HISTORY_PARTITIONS_AHEAD", 7)
+    )
+    RESOURCES_BATCH_CHUNK_SIZE = int(
+        os.getenv("RESOURCES_BATCH_CHUNK_SIZE", 64 * 1024)
+    )
+    RESOURCES_BATCH_MAX_ITEM = int(
+        os.getenv("RESOURCES_BATCH_MAX_ITEM", 16 * 1024)
+    )
+    RESOURCES_PAGE_SIZE = int(os.getenv("RESOURCES_PAGE_SIZE", 100))
+    RESOURCES_MAX_PAGE_SIZE = int(os.getenv("RESOURCES_MAX_PAGE_SIZE", 1000))
+    SCREENSHOT_MAX_SIZE = int(
+        os.getenv("SCREENSHOT_MAX_SIZE", 10 * 1024 * 1024)
+    )
+    SCREENSHOT_CHUNK_SIZE = int(os.getenv("SCREENSHOT_CHUNK_SIZE", 256 * 1024))
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() in (
+        "1",
+        "true",
+        "yes",
+    )
+    METRICS_WORKER_PORT = int(os.getenv("METRICS_WORKER_PORT", 0))
+    EVICTION_FAIL_COUNT = int(os.getenv("EVICTION_FAIL_COUNT", 30))
+    EVICTION_UNAVAILABLE_DAYS = float(
+        os.getenv("EVICTION_UNAVAILABLE_DAYS", 30)
+    )
+    EVICTION_BATCH_SIZE = int(os.getenv("EVICTION_BATCH_SIZE", 500))
+    EVICTION_BATCH_PAUSE = float(os.getenv("EVICTION_BATCH_PAUSE", 0.5))
+    EVICTION_DRY_RUN = os.getenv("EVICTION_DRY_RUN", "false").lower() in (
+        "1",
+        "true",
+        "yes",
+    )
+    UPLOAD_SPOOL_DIR = os.getenv(
+        "UPLOAD_SPOOL_DIR",
+        os.path.join(tempfile.gettempdir(), "web_resource_watchdog_spool"),
+    )
+    UPLOAD_SPOOL_STORE = os.getenv(
+        "UPLOAD_SPOOL_STORE",
+        "web_resource_watchdog.utils.spool.FileSystemBlobStore",
+    )
+    PUBLIC_SUFFIX_LIST_PATH = os.getenv(
+        "PUBLIC_SUFFIX_LIST_PATH",
+        os.path.join(
+            os.path.dirname(__file__), "data", "public_suffix_list.dat"
+        ),
+    )
+    PUBLIC_SUFFIX_CACHE_SIZE = int(
+        os.getenv("PUBLIC_SUFFIX_CACHE_SIZE", 2**16)
+    )
@@ -0,0 +1,10 @@
+from .checks import check_resources, schedule_checks  # noqa
+from .eviction import evict_unavailable_resources  # noqa
+from .history import compact_check_history  # noqa
+from .history import create_check_history_partitions  # noqa
+from .history import rollup_check_history  # noqa
+from .resource import delete_spooled_file  # noqa
+from .resource import find_resources  # noqa
+from .resource import merge_resources  # noqa
+from .resource import save_resources_to_db  # noqa
+from .resource import scan_zip_members  # noqa
@@ -0,0 +1,62 @@
+import asyncio
+from datetime import timedelta
+
+from celery import shared_task
+from sqlalchemy import select
+
+from web_resource_watchdog import db
+from web_resource_watchdog.models import WebResource, WebResourceStatus
+from web_resource_watchdog.settings import Config
+from web_resource_watchdog.utils.http_checker import check_urls
+
+
+@shared_task
+def schedule_checks() -> dict[str, int]:
+    """Claim web resources due for a check and dispatch their checks.
+
+    Due rows are claimed in batches of `Config.CHECK_BATCH_SIZE`, at most
+    `Config.CHECK_MAX_BATCHES` batches per run.
+    """
+    claimed = 0
+    for _ in range(Config.CHECK_MAX_BATCHES):
+        resource_ids = WebResourceStatus.claim_due(
+            Config.CHECK_BATCH_SIZE,
+            timedelta(seconds=Config.CHECK_CLAIM_LEASE),
+        )
+        if not resource_ids:
+            break
+        check_resources.delay(resource_ids)
+        claimed += len(resource_ids)
+    return {"claimed": claimed}
+
+
+@shared_task
+def check_resources(resource_ids: list[int]) -> dict[str, int]:
+    """Check availability of web resources and save the results.
+
+    All urls are checked concurrently on one event loop, the results are
+    recorded with `WebResourceStatus.record_results` in set-based batches.
+    """
+    targets = db.session.execute(
+        select(WebResource.id, WebResource.full_url).where(
+            WebResource.id.in_(resource_ids)
+        )
+    ).all()
+    # Do not keep a transaction open while the urls are checked.
+    db.session.rollback()
+    results = asyncio.run(
+        check_urls(
+            targets,
+            concurrency=Config.CHECK_CONCURRENCY,
+            limit_per_host=Config.CHECK_PER_HOST_CONCURRENCY,
+            connect_timeout=Config.CHECK_CONNECT_TIMEOUT,
+            read_timeout=Config.CHECK_READ_TIMEOUT,
+            keepalive_timeout=Config.CHECK_KEEPALIVE_TIMEOUT,
+            user_agent=Config.CHECK_USER_AGENT,
+        )
+    )
+    WebResourceStatus.record_results(results)
+    return {
+        "checked": len(results),
+        "available": sum(result.ok for result in results),
+    }
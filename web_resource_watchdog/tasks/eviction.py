@@ -0,0 +1,45 @@
+from datetime import timedelta
+
+from celery import shared_task
+from celery.utils.log import get_task_logger
+
+from web_resource_watchdog.models import WebResource
+from web_resource_watchdog.settings import Config
+from web_resource_watchdog.utils.known_urls import KnownUrlFilter
+
+logger = get_task_logger(__name__)
+
+
+@shared_task
+def evict_unavailable_resources(
+    dry_run: bool | None = None,
+) -> dict[str, int | float | bool]:
+    """Delete web resources which have been unavailable for a long time.
+
+    Thresholds, batch size and the pause between batches come from the
+    `EVICTION_*` settings. With `dry_run` the candidates are only counted,
+    it defaults to `Config.EVICTION_DRY_RUN`.
+
+    Returns:
+        dict: Counts of candidates, evicted resources and batches, the
+        duration in seconds and the dry-run flag.
+    """
+    if dry_run is None:
+        dry_run = Config.EVICTION_DRY_RUN
+    report = WebResource.evict(
+        Config.EVICTION_FAIL_COUNT,
+        timedelta(days=Config.EVICTION_UNAVAILABLE_DAYS),
+        Config.EVICTION_BATCH_SIZE,
+        Config.EVICTION_BATCH_PAUSE,
+        dry_run,
+        on_batch=KnownUrlFilter().discard,
+    )
+    logger.info(
+        "Eviction%s: %d candidates, %d evicted in %d batches, %.3f s.",
+        " (dry run)" if dry_run else "",
+        report.candidates,
+        report.evicted,
+        report.batches,
+        report.seconds,
+    )
+    return {**report._asdict(), "dry_run": dry_run}
@@ -0,0 +1,42 @@
+from datetime import datetime, timedelta, timezone
+
+from celery import shared_task
+
+from web_resource_watchdog.models import (
+    RollupWatermark,
+    WebResourceCheck,
+    WebResourceRollup,
+)
+from web_resource_watchdog.settings import Config
+
+
+@shared_task
+def rollup_check_history() -> dict[str, int]:
+    """Aggregate complete hours and days of the check history."""
+    return {
+        period: WebResourceRollup.rollup(period) for period in ("hour", "day")
+    }
+
+
+@shared_task
+def compact_check_history() -> dict[str, int]:
+    """Remove raw check history which is rolled up and out of retention."""
+    cutoff = datetime.now(timezone.utc) - timedelta(
+        days=Config.CHECK_HISTORY_RETENTION_DAYS
+    )
+    rolled_up_to = RollupWatermark.get_rolled_up_to("day")
+    if rolled_up_to is None:
+        return {"deleted": 0}
+    cutoff = min(cutoff, rolled_up_to)
+    return {"deleted": WebResourceCheck.compact(cutoff)}
+
+
+@shared_task
+def create_check_history_partitions() -> dict[str, int]:
+    """Create daily partitions of the check history ahead of time."""
+    return {
+        "partitions": WebResourceCheck.create_partitions(
+            datetime.now(timezone.utc),
+            Config.CHECK_HISTORY_PARTITIONS_AHEAD,
+        )
+    }
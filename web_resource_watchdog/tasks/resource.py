@@ -1,29 +1,250 @@
 import re
+from concurrent.futures import ProcessPoolExecutor
 
-from celery import current_app, shared_task
+from celery import chord, current_app, group, shared_task
+from celery.exceptions import Ignore
 
-from web_resource_watchdog.models import WebResource
+from web_resource_watchdog.models import BulkInsertResult, WebResource
 from web_resource_watchdog.settings import Config
-from web_resource_watchdog.utils.zipfile import parse_zip_file
+from web_resource_watchdog.utils.archives import detect_archive_format
+from web_resource_watchdog.utils.known_urls import KnownUrlFilter
+from web_resource_watchdog.utils.spool import get_blob_store
+from web_resource_watchdog.utils.task_events import (
+    TaskProgress,
+    publish_task_event,
+)
+from web_resource_watchdog.utils.upload_dedupe import MemberCache
+from web_resource_watchdog.utils.urls import canonicalize_url
+from web_resource_watchdog.utils.zipfile import (
+    merge_parse_results,
+    parse_archive,
+    split_zip_members,
+)
 
 
-@shared_task
+def _parse_spooled_archive(
+    file_ref: str,
+    pattern: re.Pattern = None,
+    members: list[int] | None = None,
+    job_id: str | None = None,
+) -> dict[str, list[str]]:
+    """Find urls in files of a spooled archive.
+
+    Scanned files, their uncompressed bytes and found urls are counted in
+    the progress of `job_id`. Urls of files are cached if
+    `Config.MEMBER_CACHE_ENABLED`.
+    """
+    member_cache = None
+    if Config.MEMBER_CACHE_ENABLED:
+        member_cache = MemberCache()
+    with get_blob_store().open(file_ref) as file, TaskProgress(
+        job_id
+    ) as progress:
+        return parse_archive(
+            file,
+            pattern,
+            chunk_size=Config.ZIP_READ_CHUNK_SIZE,
+            overlap=Config.URL_MAX_LENGTH,
+            members=members,
+            max_members=Config.ARCHIVE_MAX_MEMBERS,
+            max_size=Config.ARCHIVE_MAX_SIZE,
+            member_cache=member_cache,
+            on_member=lambda member, urls: progress.add(
+                members_scanned=1,
+                bytes_processed=member.file_size,
+                urls_found=urls,
+            ),
+        )
+
+
+def _publish_failure(job_id: str, error: BaseException | str) -> None:
+    """Publish the final event of a failed zip processing job."""
+    publish_task_event(
+        job_id,
+        "failed",
+        {
+            "status": "error",
+            "message": "Task encountered an error",
+            "error": str(error),
+        },
+    )
+
+
+@shared_task(bind=True)
 def find_resources(
-    file: bytes, pattern: re.Pattern = None
+    self,
+    file_ref: str,
+    pattern: re.Pattern = None,
+    job_id: str | None = None,
 ) -> dict[str, list[str]]:
-    """Find all urls in file."""
-    return parse_zip_file(file, pattern)
+    """Find all urls in a spooled file and remove it afterwards.
+
+    The archive format is sniffed from the content. Zip archives bigger
+    than `Config.ZIP_FAN_OUT_THRESHOLD` are split into groups of members
+    scanned in parallel: by a chord of subtasks, or by a
+    local process pool when the task runs eagerly. Events are published
+    to the channel of `job_id`, the id clients know the job by.
+    """
+    job_id = job_id or self.request.id
+    store = get_blob_store()
+    fan_out = False
+    publish_task_event(
+        job_id, "progress", {"status": "pending", "stage": "scanning"}
+    )
+    try:
+        with store.open(file_ref) as file:
+            is_zip = detect_archive_format(file) == "zip"
+            if is_zip:
+                member_groups = split_zip_members(
+                    file,
+                    Config.ZIP_FAN_OUT_PARALLELISM,
+                    Config.ZIP_FAN_OUT_THRESHOLD,
+                )
+        if not is_zip:
+            # Only zip archives have an index to split members by, other
+            # formats are read in one pass.
+            return _parse_spooled_archive(file_ref, pattern, job_id=job_id)
+        with TaskProgress(job_id) as progress:
+            progress.add(members_total=sum(map(len, member_groups)))
+        if len(member_groups) == 1:
+            return _parse_spooled_archive(file_ref, pattern, job_id=job_id)
+        if self.request.is_eager:
+            with ProcessPoolExecutor(len(member_groups)) as executor:
+                results = executor.map(
+                    _parse_spooled_archive,
+                    [file_ref] * len(member_groups),
+                    [pattern] * len(member_groups),
+                    member_groups,
+                    [job_id] * len(member_groups),
+                )
+                return merge_parse_results(list(results))
+        fan_out = True
+        body = merge_resources.s(file_ref).on_error(
+            delete_spooled_file.si(file_ref, job_id)
+        )
+        raise self.replace(
+            chord(
+                group(
+                    scan_zip_members.s(file_ref, members, pattern, job_id)
+                    for members in member_groups
+                ),
+                body,
+            )
+        )
+    except Ignore:
+        raise
+    except Exception as error:
+        _publish_failure(job_id, error)
+        raise
+    finally:
+        if not fan_out:
+            store.delete(file_ref)
+
+
+@shared_task
+def scan_zip_members(
+    file_ref: str,
+    members: list[int],
+    pattern: re.Pattern = None,
+    job_id: str | None = None,
+) -> dict[str, list[str]]:
+    """Find urls in a group of members of a spooled zip file."""
+    return _parse_spooled_archive(file_ref, pattern, members, job_id)
+
+
+@shared_task
+def merge_resources(
+    results: list[dict[str, list[str]]], file_ref: str
+) -> dict[str, list[str]]:
+    """Merge urls found by parallel scans and remove the spooled file."""
+    get_blob_store().delete(file_ref)
+    return merge_parse_results(results)
+
+
+@shared_task
+def delete_spooled_file(file_ref: str, job_id: str | None = None) -> None:
+    """Remove a spooled file left by a failed parallel scan."""
+    get_blob_store().delete(file_ref)
+    if job_id is not None:
+        _publish_failure(job_id, "Parallel scan of the archive failed.")
+
+
+def _save_new_urls(urls: list[str], job_id: str) -> dict[str, int]:
+    """Insert urls unknown to the known-url filter and remember them.
+
+    Urls are canonicalized first, so equivalent forms and urls the filter
+    knows are counted as duplicates without reaching the database.
+    """
+    invalid = 0
+    canonical_urls = set()
+    for full_url in urls:
+        try:
+            canonical_urls.add(canonicalize_url(full_url))
+        except ValueError:
+            invalid += 1
+    known_urls = KnownUrlFilter()
+    new_urls = known_urls.filter_new(list(canonical_urls))
+    duplicates = len(urls) - invalid - len(new_urls)
+    with TaskProgress(job_id) as progress:
+        progress.add(duplicates=duplicates, invalid=invalid)
+
+        def on_batch(batch: BulkInsertResult, outcome: dict) -> None:
+            known_urls.add(outcome)
+            progress.add(
+                urls_inserted=batch.inserted,
+                duplicates=batch.duplicates,
+                invalid=batch.invalid,
+            )
+
+        result = WebResource.bulk_insert(new_urls, on_batch=on_batch)
+    return BulkInsertResult(
+        result.inserted,
+        result.duplicates + duplicates,
+        result.invalid + invalid,
+    )._asdict()
 
 
 @shared_task(bind=True)
-def save_resources_to_db(self, data) -> None:
-    """Save Web Resource data to database."""
+def save_resources_to_db(self, data) -> dict[str, int]:
+    """Save Web Resource data to database.
+
+    The final state of the job, parse errors included, is published to
+    the channel of the task and cached for the status endpoints.
+
+    Returns:
+        dict[str, int]: Counts of inserted, duplicate and invalid urls.
+    """
     parse_data = data.get("data", None)
     errors = data.get("errors", None)
+    publish_task_event(
+        self.request.id,
+        "progress",
+        {
+            "status": "pending",
+            "stage": "saving",
+            "unique_urls": len(parse_data or ()),
+        },
+    )
+    try:
+        if errors:
+            broker = current_app.backend.client
+            error_key = Config.ERROR_KEY.format(task_id=self.request.id)
+            for error in errors:
+                broker.lpush(error_key, error)
+        if parse_data:
+            result = _save_new_urls(parse_data, self.request.id)
+        else:
+            result = BulkInsertResult()._asdict()
+    except Exception as error:
+        _publish_failure(self.request.id, error)
+        raise
+    state = {
+        "status": "completed",
+        "message": "Task executed successfully",
+        "result": result,
+    }
     if errors:
-        broker = current_app.backend.client
-        error_key = Config.ERROR_KEY.format(task_id=self.request.id)
-        for error in errors:
-            broker.lpush(error_key, error)
-    if parse_data:
-        WebResource.bulk_create(parse_data)
+        state["message"] = "Task executed with errors"
+        state["errors"] = errors
+    publish_task_event(self.request.id, "completed", state)
+    return result
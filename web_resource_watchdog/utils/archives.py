@@ -0,0 +1,222 @@
+import bz2
+import gzip
+import lzma
+import tarfile
+import zipfile
+from abc import ABC, abstractmethod
+from typing import BinaryIO, Callable, Iterator, NamedTuple
+
+TAR_BLOCK_SIZE = 512
+TAR_MAGIC = b"ustar"
+TAR_MAGIC_OFFSET = 257
+ZIP_MAGICS = (b"PK\x03\x04", b"PK\x05\x06")
+COMPRESSIONS: dict[str, tuple[bytes, Callable[[BinaryIO], BinaryIO]]] = {
+    "gz": (b"\x1f\x8b", gzip.open),
+    "bz2": (b"BZh", bz2.open),
+    "xz": (b"\xfd7zXZ\x00", lzma.open),
+}
+ARCHIVE_FORMATS = (
+    "zip",
+    "tar",
+    *(f"tar.{compression}" for compression in COMPRESSIONS),
+    *COMPRESSIONS,
+)
+
+
+class ArchiveError(ValueError):
+    """Raised for data which is not an archive of a supported format."""
+
+
+class ArchiveMember(NamedTuple):
+    """A file read from an archive.
+
+    Attributes:
+        filename (str): The name of the file in the archive.
+        file_size (int): The number of uncompressed bytes read.
+    """
+
+    filename: str
+    file_size: int
+
+
+def validate_zip_directory(
+    file: BinaryIO,
+    max_members: int,
+    max_size: int,
+    max_ratio: float,
+    ratio_min_size: int = 0,
+) -> list[zipfile.ZipInfo]:
+    """Check a zip archive against zip bomb limits reading its index only.
+
+    Nothing is decompressed: the member count, the total uncompressed size
+    and the compression ratio of members of at least `ratio_min_size`
+    bytes are taken from the central directory. Encrypted members and
+    members overlapping in the file are rejected. CRCs are checked when
+    members are read.
+
+    Returns:
+        list[zipfile.ZipInfo]: The file members of the archive.
+
+    Raises:
+        ArchiveError: If the archive is invalid or exceeds a limit.
+    """
+    try:
+        with zipfile.ZipFile(file, "r") as zipf:
+            infolist = [info for info in zipf.infolist() if not info.is_dir()]
+    except (zipfile.BadZipFile, OSError, EOFError) as error:
+        raise ArchiveError("Invalid zip file.") from error
+    if len(infolist) > max_members:
+        raise ArchiveError(f"Archive has more than {max_members} files.")
+    if sum(info.file_size for info in infolist) > max_size:
+        raise ArchiveError(
+            f"Archive is larger than {max_size} bytes uncompressed."
+        )
+    end = 0
+    for info in sorted(infolist, key=lambda item: item.header_offset):
+        if info.flag_bits & 0x1:
+            raise ArchiveError(f"File {info.filename} is encrypted.")
+        if info.header_offset < end:
+            raise ArchiveError(f"File {info.filename} overlaps another.")
+        end = info.header_offset + info.compress_size
+        if (
+            info.file_size >= ratio_min_size
+            and info.file_size > max_ratio * max(info.compress_size, 1)
+        ):
+            raise ArchiveError(
+                f"File {info.filename} is compressed more than "
+                f"{max_ratio} times."
+            )
+    return infolist
+
+
+def detect_archive_format(file: BinaryIO) -> str:
+    """Return the format of an archive sniffed from its first bytes.
+
+    Compressed data is a tar archive if its first decompressed block has
+    the tar magic, and a single compressed file otherwise. The position of
+    the file is restored.
+
+    Returns:
+        str: One of `ARCHIVE_FORMATS`.
+
+    Raises:
+        ArchiveError: If the format is not supported or compressed data
+            cannot be decompressed.
+    """
+    position = file.tell()
+    try:
+        head = file.read(TAR_BLOCK_SIZE)
+        if head.startswith(ZIP_MAGICS):
+            return "zip"
+        if head[TAR_MAGIC_OFFSET:].startswith(TAR_MAGIC):
+            return "tar"
+        for compression, (magic, opener) in COMPRESSIONS.items():
+            if not head.startswith(magic):
+                continue
+            file.seek(position)
+            try:
+                with opener(file) as stream:
+                    block = stream.read(TAR_BLOCK_SIZE)
+            except (EOFError, OSError, lzma.LZMAError) as error:
+                raise ArchiveError(
+                    f"Corrupt {compression} compressed data."
+                ) from error
+            if block[TAR_MAGIC_OFFSET:].startswith(TAR_MAGIC):
+                return f"tar.{compression}"
+            return compression
+        raise ArchiveError("Unsupported archive format.")
+    finally:
+        file.seek(position)
+
+
+class ArchiveReader(ABC):
+    """Sequential reader of the files of an archive.
+
+    Files are streamed one after another in archive order, nothing is
+    extracted to disk.
+    """
+
+    def __init__(self, file: BinaryIO):
+        self.file = file
+
+    @abstractmethod
+    def __iter__(self) -> Iterator[tuple[str, BinaryIO]]:
+        """Yield the name and an open binary stream of every file."""
+
+
+class ZipReader(ArchiveReader):
+    """Reader of zip archives, optionally of some members only.
+
+    Members are selected by their index in the central directory, names
+    may repeat in an archive.
+    """
+
+    def __init__(self, file: BinaryIO, members: list[int] | None = None):
+        super().__init__(file)
+        self.members = members
+
+    def __iter__(self) -> Iterator[tuple[str, BinaryIO]]:
+        with zipfile.ZipFile(self.file, "r") as zipf:
+            if self.members is None:
+                infolist = zipf.infolist()
+            else:
+                infolist = [zipf.infolist()[index] for index in self.members]
+            for member in infolist:
+                if member.is_dir():
+                    continue
+                with zipf.open(member) as stream:
+                    yield member.filename, stream
+
+
+class TarReader(ArchiveReader):
+    """Reader of tar archives of any compression in stream mode.
+
+    The archive is read strictly forward, so it is never materialized and
+    the file does not need to be seekable.
+    """
+
+    def __iter__(self) -> Iterator[tuple[str, BinaryIO]]:
+        with tarfile.open(fileobj=self.file, mode="r|*") as tar:
+            for member in tar:
+                if member.isfile():
+                    yield member.name, tar.extractfile(member)
+
+
+class CompressedReader(ArchiveReader):
+    """Reader of a single gzip, bz2 or xz compressed file."""
+
+    def __init__(self, file: BinaryIO, compression: str, name: str):
+        super().__init__(file)
+        self.compression = compression
+        self.name = name
+
+    def __iter__(self) -> Iterator[tuple[str, BinaryIO]]:
+        _, opener = COMPRESSIONS[self.compression]
+        with opener(self.file) as stream:
+            yield self.name, stream
+
+
+def open_archive(
+    file: BinaryIO,
+    members: list[int] | None = None,
+    name: str = "upload",
+) -> ArchiveReader:
+    """Return a reader of the archive format sniffed from the content.
+
+    `members` selects zip members by their index in the central directory
+    and is not supported by other formats, `name` is the file name of a
+    single compressed file.
+
+    Raises:
+        ArchiveError: If the format is not supported.
+    """
+    archive_format = detect_archive_format(file)
+    if archive_format == "zip":
+        return ZipReader(file, members)
+    if members is not None:
+        raise ArchiveError(
+            f"Members cannot be selected in {archive_format} archives."
+        )
+    if archive_format.startswith("tar"):
+        return TarReader(file)
+    return CompressedReader(file, archive_format, name)
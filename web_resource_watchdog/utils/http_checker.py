@@ -0,0 +1,286 @@
+import asyncio
+import ssl
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Iterable, NamedTuple
+from urllib.parse import quote, urlsplit
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+MAX_HEADER_LINES = 100
+# Characters kept as they are when urls are percent-encoded for requests.
+URL_SAFE_CHARACTERS = "/?:@&=+$,;%!~*'()[]"
+
+
+class CheckResult(NamedTuple):
+    """Result of an availability check of a web resource.
+
+    Attributes:
+        resource_id (int): The id of the checked web resource.
+        status_code (int, optional): The received HTTP status code, None
+            if no response was received.
+        latency (float, optional): Seconds until the response headers were
+            received, None if no response was received.
+        checked_at (datetime): The time the check started.
+        ok (bool): Indicates whether the resource is available.
+    """
+
+    resource_id: int
+    status_code: int | None
+    latency: float | None
+    checked_at: datetime
+    ok: bool
+
+
+class Target(NamedTuple):
+    """Parts of a checked url needed to send a request.
+
+    The host is IDNA-encoded and the path percent-encoded, so requests to
+    internationalized urls are plain ASCII.
+    """
+
+    scheme: str
+    host: str
+    port: int
+    path: str
+    host_header: str
+
+    @classmethod
+    def from_url(cls, url: str) -> "Target":
+        """Build a target from an http or https url.
+
+        Raises:
+            ValueError: If the url scheme is not supported or the host is
+                not a valid internationalized domain name.
+        """
+        parsed_url = urlsplit(url)
+        scheme = parsed_url.scheme.lower()
+        if scheme not in DEFAULT_PORTS or not parsed_url.hostname:
+            raise ValueError(f"Cannot check url {url}.")
+        try:
+            host = parsed_url.hostname.encode("idna").decode("ascii")
+        except UnicodeError as error:
+            raise ValueError(f"Cannot check url {url}.") from error
+        port = parsed_url.port or DEFAULT_PORTS[scheme]
+        path = quote(parsed_url.path or "/", safe=URL_SAFE_CHARACTERS)
+        if parsed_url.query:
+            query = quote(parsed_url.query, safe=URL_SAFE_CHARACTERS)
+            path = f"{path}?{query}"
+        host_header = host
+        if port != DEFAULT_PORTS[scheme]:
+            host_header = f"{host_header}:{port}"
+        return cls(scheme, host, port, path, host_header)
+
+    @property
+    def origin(self) -> tuple[str, str, int]:
+        """Return the key of the connection pool for the target."""
+        return self.scheme, self.host, self.port
+
+
+class ConnectionPool:
+    """Keep-alive connections pooled per origin.
+
+    Concurrency is limited per host, so a single domain cannot take all
+    connections of the checker.
+    """
+
+    def __init__(
+        self,
+        limit_per_host: int,
+        connect_timeout: float,
+        keepalive_timeout: float,
+        ssl_context: ssl.SSLContext | None = None,
+    ):
+        self.limit_per_host = limit_per_host
+        self.connect_timeout = connect_timeout
+        self.keepalive_timeout = keepalive_timeout
+        self.ssl_context = ssl_context or ssl.create_default_context()
+        self.opened = 0
+        self._idle = defaultdict(list)
+        self._limits = {}
+
+    def limit(self, host: str) -> asyncio.Semaphore:
+        """Return the semaphore limiting concurrency for a host."""
+        if host not in self._limits:
+            self._limits[host] = asyncio.Semaphore(self.limit_per_host)
+        return self._limits[host]
+
+    async def acquire(
+        self, target: Target
+    ) -> tuple[asyncio.StreamReader, asyncio.StreamWriter, bool]:
+        """Return an idle connection to the target or open a new one.
+
+        Returns:
+            tuple: The stream reader, the stream writer and a flag telling
+            whether the connection was reused.
+        """
+        idle = self._idle[target.origin]
+        while idle:
+            reader, writer, released_at = idle.pop()
+            expired = time.monotonic() - released_at > self.keepalive_timeout
+            if expired or reader.at_eof() or writer.is_closing():
+                writer.close()
+                continue
+            return reader, writer, True
+        async with asyncio.timeout(self.connect_timeout):
+            reader, writer = await asyncio.open_connection(
+                target.host,
+                target.port,
+                ssl=self.ssl_context if target.scheme == "https" else None,
+            )
+        self.opened += 1
+        return reader, writer, False
+
+    def release(
+        self,
+        target: Target,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        reusable: bool,
+    ) -> None:
+        """Return a connection to the pool or close it."""
+        if reusable and not writer.is_closing():
+            self._idle[target.origin].append(
+                (reader, writer, time.monotonic())
+            )
+        else:
+            writer.close()
+
+    async def close(self) -> None:
+        """Close all idle connections."""
+        writers = [
+            writer
+            for connections in self._idle.values()
+            for _, writer, _ in connections
+        ]
+        self._idle.clear()
+        for writer in writers:
+            writer.close()
+        await asyncio.gather(
+            *(writer.wait_closed() for writer in writers),
+            return_exceptions=True,
+        )
+
+
+class AvailabilityChecker:
+    """Concurrent availability checker running on one event loop.
+
+    Every url is requested with HEAD first, and with GET if the server
+    rejects HEAD. A resource is available if it answers with a status
+    code below 400.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = 500,
+        limit_per_host: int = 4,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 10.0,
+        keepalive_timeout: float = 15.0,
+        user_agent: str = "web-resource-watchdog",
+        ssl_context: ssl.SSLContext | None = None,
+    ):
+        self.read_timeout = read_timeout
+        self.user_agent = user_agent
+        self.pool = ConnectionPool(
+            limit_per_host, connect_timeout, keepalive_timeout, ssl_context
+        )
+        self._limit = asyncio.Semaphore(concurrency)
+
+    async def __aenter__(self) -> "AvailabilityChecker":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.pool.close()
+
+    async def check(self, resource_id: int, url: str) -> CheckResult:
+        """Check availability of a single url."""
+        checked_at = datetime.now(timezone.utc)
+        try:
+            target = Target.from_url(url)
+            async with self._limit, self.pool.limit(target.host):
+                started = time.perf_counter()
+                status_code = await self._request("HEAD", target)
+                if status_code >= 400:
+                    status_code = await self._request("GET", target)
+                latency = time.perf_counter() - started
+        except (
+            OSError,
+            TimeoutError,
+            ValueError,
+            asyncio.IncompleteReadError,
+            asyncio.LimitOverrunError,
+        ):
+            return CheckResult(resource_id, None, None, checked_at, False)
+        return CheckResult(
+            resource_id, status_code, latency, checked_at, status_code < 400
+        )
+
+    async def check_many(
+        self, targets: Iterable[tuple[int, str]]
+    ) -> list[CheckResult]:
+        """Check availability of `(resource_id, url)` pairs concurrently."""
+        return await asyncio.gather(
+            *(self.check(resource_id, url) for resource_id, url in targets)
+        )
+
+    async def _request(self, method: str, target: Target) -> int:
+        """Send a request and return the response status code.
+
+        A reused keep-alive connection may have been closed by the server,
+        so the request is retried once on a new connection.
+        """
+        keep_alive = method == "HEAD"
+        request = (
+            f"{method} {target.path} HTTP/1.1\r\n"
+            f"Host: {target.host_header}\r\n"
+            f"User-Agent: {self.user_agent}\r\n"
+            "Accept: */*\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+            "\r\n"
+        ).encode("latin-1")
+        while True:
+            reader, writer, reused = await self.pool.acquire(target)
+            try:
+                async with asyncio.timeout(self.read_timeout):
+                    writer.write(request)
+                    await writer.drain()
+                    status_code, reusable = await self._read_head(reader)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                writer.close()
+                if reused:
+                    continue
+                raise
+            except BaseException:
+                writer.close()
+                raise
+            self.pool.release(target, reader, writer, keep_alive and reusable)
+            return status_code
+
+    @staticmethod
+    async def _read_head(reader: asyncio.StreamReader) -> tuple[int, bool]:
+        """Read the status line and headers of a response.
+
+        Returns:
+            tuple: The status code and a flag telling whether the server
+            keeps the connection open.
+        """
+        status_line = await reader.readuntil(b"\r\n")
+        version, status_code, *_ = status_line.decode("latin-1").split()
+        reusable = version == "HTTP/1.1"
+        for _ in range(MAX_HEADER_LINES):
+            line = await reader.readuntil(b"\r\n")
+            if line == b"\r\n":
+                return int(status_code), reusable
+            name, _, value = line.decode("latin-1").partition(":")
+            if name.strip().lower() == "connection":
+                reusable = value.strip().lower() != "close"
+        raise ValueError("Too many response headers.")
+
+
+async def check_urls(
+    targets: Iterable[tuple[int, str]], **options
+) -> list[CheckResult]:
+    """Check `(resource_id, url)` pairs with a new checker."""
+    async with AvailabilityChecker(**options) as checker:
+        return await checker.check_many(targets)
@@ -0,0 +1,93 @@
+import codecs
+import json
+from typing import Any, BinaryIO, Iterator
+
+JSON_DECODER = json.JSONDecoder()
+WHITESPACE = " \t\r\n"
+
+
+def iter_ndjson(stream: BinaryIO, max_line: int) -> Iterator[Any]:
+    """Yield values of a newline-delimited JSON stream one at a time.
+
+    Blank lines are skipped. Lines which are not valid JSON are yielded
+    as the `ValueError` they raise, so the caller can report them and
+    continue.
+
+    Raises:
+        ValueError: If a line is longer than `max_line` bytes.
+    """
+    while line := stream.readline(max_line + 1):
+        if len(line) > max_line and not line.endswith(b"\n"):
+            raise ValueError(f"Line is longer than {max_line} bytes.")
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as error:
+            yield error
+
+
+def iter_json_array(
+    stream: BinaryIO, chunk_size: int, max_item: int
+) -> Iterator[Any]:
+    """Yield items of a JSON array read from a stream in chunks.
+
+    Only the current item is kept in memory. An item is decoded once it is
+    followed by more data, so a number split between chunks is never
+    taken for a shorter one.
+
+    Raises:
+        ValueError: If the stream is not a JSON array or an item is longer
+            than `max_item` characters.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    position = 0
+    eof = False
+
+    def read() -> None:
+        nonlocal buffer, position, eof
+        chunk = stream.read(chunk_size)
+        eof = not chunk
+        buffer = buffer[position:] + decoder.decode(chunk, final=eof)
+        position = 0
+
+    def next_char() -> str | None:
+        nonlocal position
+        while True:
+            while position < len(buffer) and buffer[position] in WHITESPACE:
+                position += 1
+            if position < len(buffer):
+                return buffer[position]
+            if eof:
+                return None
+            read()
+
+    if next_char() != "[":
+        raise ValueError("Body must be a JSON array.")
+    position += 1
+    if next_char() == "]":
+        return
+    while True:
+        if next_char() is None:
+            raise ValueError("Unexpected end of JSON array.")
+        while True:
+            try:
+                item, end = JSON_DECODER.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                end = None
+            if end is not None and (end < len(buffer) or eof):
+                break
+            if eof:
+                raise ValueError("Malformed JSON array.")
+            if len(buffer) - position > max_item:
+                raise ValueError(f"Item is longer than {max_item} chars.")
+            read()
+        yield item
+        position = end
+        delimiter = next_char()
+        if delimiter == "]":
+            return
+        if delimiter != ",":
+            raise ValueError("Malformed JSON array.")
+        position += 1
@@ -0,0 +1,80 @@
+import hashlib
+import logging
+from itertools import islice
+from typing import Iterable
+
+from redis import Redis, RedisError
+
+from web_resource_watchdog.settings import Config
+from web_resource_watchdog.utils.task_events import get_events_client
+
+logger = logging.getLogger(__name__)
+
+
+def url_hash(url: str) -> bytes:
+    """Return the 128-bit hash the filter stores for an url."""
+    return hashlib.blake2b(url.encode(), digest_size=16).digest()
+
+
+class KnownUrlFilter:
+    """Set of hashes of stored canonical urls shared through Redis.
+
+    It lets workers drop most duplicates before any SQL runs. The filter
+    fails open: if Redis is unavailable every url is treated as new and
+    the database unique constraint still rejects duplicates.
+
+    Attributes:
+        key (str): The Redis key of the set.
+        batch_size (int): The number of hashes sent per command.
+    """
+
+    def __init__(
+        self,
+        client: Redis | None = None,
+        key: str | None = None,
+        batch_size: int | None = None,
+    ):
+        self.client = client
+        self.key = key or Config.KNOWN_URLS_KEY
+        self.batch_size = batch_size or Config.KNOWN_URLS_BATCH_SIZE
+
+    def _batches(self, urls: Iterable[str]) -> Iterable[list[str]]:
+        urls = iter(urls)
+        while batch := list(islice(urls, self.batch_size)):
+            yield batch
+
+    def _client(self) -> Redis:
+        if self.client is None:
+            self.client = get_events_client()
+        return self.client
+
+    def filter_new(self, urls: list[str]) -> list[str]:
+        """Return urls which are not known to be stored."""
+        new = []
+        try:
+            for batch in self._batches(urls):
+                known = self._client().smismember(
+                    self.key, [url_hash(url) for url in batch]
+                )
+                new.extend(
+                    url for url, is_known in zip(batch, known) if not is_known
+                )
+        except RedisError:
+            logger.warning("Known url filter is unavailable.")
+            return urls
+        return new
+
+    def add(self, urls: Iterable[str]) -> None:
+        """Remember urls which are stored."""
+        self._update(self._client().sadd, urls)
+
+    def discard(self, urls: Iterable[str]) -> None:
+        """Forget urls which are no longer stored."""
+        self._update(self._client().srem, urls)
+
+    def _update(self, command, urls: Iterable[str]) -> None:
+        try:
+            for batch in self._batches(urls):
+                command(self.key, *map(url_hash, batch))
+        except RedisError:
+            logger.warning("Known url filter is unavailable.")
@@ -0,0 +1,200 @@
+import os
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+from celery import signals
+from flask import Flask, Response, g, request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+    start_http_server,
+)
+
+from web_resource_watchdog.settings import Config
+
+# Buckets from 1 ms to 1 minute, for requests, tasks and pipeline stages.
+LATENCY_BUCKETS = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1,
+    2.5,
+    5,
+    10,
+    30,
+    60,
+)
+TASK_BUCKETS = LATENCY_BUCKETS + (300, 900, 3600)
+SENT_AT_HEADER = "wrw_sent_at"
+
+REQUEST_LATENCY = Histogram(
+    "wrw_http_request_duration_seconds",
+    "Time to build a response, streamed bodies excluded.",
+    ["method", "endpoint", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+TASK_RUNTIME = Histogram(
+    "wrw_task_runtime_seconds",
+    "Run time of Celery tasks.",
+    ["task", "state"],
+    buckets=TASK_BUCKETS,
+)
+TASK_QUEUE_WAIT = Histogram(
+    "wrw_task_queue_wait_seconds",
+    "Time between publishing a Celery task and starting it.",
+    ["task"],
+    buckets=TASK_BUCKETS,
+)
+TASK_FAILURES = Counter(
+    "wrw_task_failures",
+    "Failed Celery tasks.",
+    ["task"],
+)
+STAGE_DURATION = Histogram(
+    "wrw_stage_duration_seconds",
+    "Time spent in an ingest stage per call.",
+    ["stage"],
+    buckets=LATENCY_BUCKETS,
+)
+STAGE_BYTES = Counter(
+    "wrw_stage_bytes",
+    "Bytes processed by an ingest stage.",
+    ["stage"],
+)
+URLS_STORED = Counter(
+    "wrw_urls_stored",
+    "Urls given to bulk inserts by outcome.",
+    ["outcome"],
+)
+
+_task_started: dict[str, float] = {}
+
+
+def observe_stage(stage: str, seconds: float, size: int | None = None) -> None:
+    """Record the duration and the processed bytes of an ingest stage."""
+    STAGE_DURATION.labels(stage).observe(seconds)
+    if size is not None:
+        STAGE_BYTES.labels(stage).inc(size)
+
+
+@contextmanager
+def timed(stage: str) -> Iterator[None]:
+    """Record the duration of the block as an ingest stage."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_stage(stage, time.perf_counter() - started)
+
+
+def get_registry() -> CollectorRegistry:
+    """Return the registry to expose.
+
+    With `PROMETHEUS_MULTIPROC_DIR` set, as required under gunicorn and
+    prefork Celery workers, samples of all processes are collected from
+    the directory, otherwise the registry of this process is returned.
+    """
+    if not os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def metrics_view() -> Response:
+    """Expose all metrics in the Prometheus text format."""
+    return Response(
+        generate_latest(get_registry()), mimetype=CONTENT_TYPE_LATEST
+    )
+
+
+def _start_request_timer() -> None:
+    g.metrics_started = time.perf_counter()
+
+
+def _observe_request(response: Response) -> Response:
+    started = g.pop("metrics_started", None)
+    if started is not None:
+        REQUEST_LATENCY.labels(
+            request.method, request.endpoint or "unknown", response.status_code
+        ).observe(time.perf_counter() - started)
+    return response
+
+
+def init_metrics(flask_app: Flask) -> None:
+    """Time requests of the app and serve metrics at `/metrics`.
+
+    Requests are labelled by endpoint, so urls with ids do not multiply
+    the time series. Nothing is registered if `Config.METRICS_ENABLED` is
+    false.
+    """
+    if not flask_app.config["METRICS_ENABLED"]:
+        return
+    flask_app.before_request(_start_request_timer)
+    flask_app.after_request(_observe_request)
+    flask_app.add_url_rule("/metrics", "metrics", metrics_view)
+
+
+def _stamp_sent_at(headers: dict | None = None, **kwargs) -> None:
+    if headers is not None:
+        headers.setdefault(SENT_AT_HEADER, time.time())
+
+
+def _task_prerun(task_id: str, task, **kwargs) -> None:
+    _task_started[task_id] = time.perf_counter()
+    sent_at = task.request.get(SENT_AT_HEADER)
+    if sent_at is not None:
+        TASK_QUEUE_WAIT.labels(task.name).observe(
+            max(time.time() - sent_at, 0)
+        )
+
+
+def _task_postrun(task_id: str, task, state: str | None = None, **kwargs):
+    started = _task_started.pop(task_id, None)
+    if started is not None:
+        TASK_RUNTIME.labels(task.name, state or "UNKNOWN").observe(
+            time.perf_counter() - started
+        )
+
+
+def _task_failure(sender=None, **kwargs) -> None:
+    if sender is not None:
+        TASK_FAILURES.labels(sender.name).inc()
+
+
+def _start_worker_exporter(**kwargs) -> None:
+    start_http_server(Config.METRICS_WORKER_PORT, registry=get_registry())
+
+
+def _mark_process_dead(pid: int | None = None, **kwargs) -> None:
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        multiprocess.mark_process_dead(pid or os.getpid())
+
+
+def connect_celery_metrics() -> None:
+    """Measure Celery tasks through signals.
+
+    Published tasks are stamped with the time they were sent, so the
+    queue wait is measured when they start. Workers serve the metrics of
+    all their processes on `Config.METRICS_WORKER_PORT` unless it is 0.
+    """
+    if not Config.METRICS_ENABLED:
+        return
+    signals.before_task_publish.connect(_stamp_sent_at, weak=False)
+    signals.task_prerun.connect(_task_prerun, weak=False)
+    signals.task_postrun.connect(_task_postrun, weak=False)
+    signals.task_failure.connect(_task_failure, weak=False)
+    signals.worker_process_shutdown.connect(_mark_process_dead, weak=False)
+    if Config.METRICS_WORKER_PORT:
+        signals.worker_ready.connect(_start_worker_exporter, weak=False)
@@ -0,0 +1,102 @@
+import ipaddress
+from functools import cache, lru_cache
+
+from web_resource_watchdog.settings import Config
+
+RULE_END = ""
+
+
+def _to_ascii(label: str) -> str:
+    """Return the ASCII form of a lowercased domain label."""
+    if label.isascii():
+        return label
+    try:
+        return label.encode("idna").decode()
+    except UnicodeError as error:
+        raise ValueError(
+            f"Label {label} is not a valid IDNA label."
+        ) from error
+
+
+def compile_suffix_trie(lines) -> dict:
+    """Compile rules of the Public Suffix List format into a trie.
+
+    Every node maps a label, in ASCII form, to its child node and keys the
+    end of a rule with an empty string. Exception rules are stored as
+    `!label` keys of the node of their parent suffix.
+    """
+    trie = {}
+    for line in lines:
+        rule = line.split(None, 1)[0] if line.strip() else ""
+        if not rule or rule.startswith("//"):
+            continue
+        is_exception = rule.startswith("!")
+        labels = [_to_ascii(label) for label in rule.lstrip("!").split(".")]
+        if is_exception:
+            labels[0] = "!" + labels[0]
+        node = trie
+        for label in reversed(labels):
+            node = node.setdefault(label, {})
+        node[RULE_END] = True
+    return trie
+
+
+@cache
+def get_suffix_trie() -> dict:
+    """Return the trie of the list at `Config.PUBLIC_SUFFIX_LIST_PATH`."""
+    with open(Config.PUBLIC_SUFFIX_LIST_PATH, encoding="utf-8") as file:
+        return compile_suffix_trie(file)
+
+
+def suffix_length(labels: list[str], trie: dict) -> int:
+    """Return the number of trailing labels forming the public suffix.
+
+    Exception rules win, then the longest matching rule. A host under an
+    unknown suffix falls back to the implicit `*` rule, its last label.
+    """
+    node = trie
+    length = 1
+    for depth, label in enumerate(reversed(labels), 1):
+        if "!" + label in node:
+            return depth - 1
+        if "*" in node:
+            length = depth
+        node = node.get(label)
+        if node is None:
+            break
+        if RULE_END in node:
+            length = depth
+    return length
+
+
+@lru_cache(maxsize=Config.PUBLIC_SUFFIX_CACHE_SIZE)
+def split_host(host: str) -> tuple[str, str]:
+    """Split a host into its domain and public suffix.
+
+    The host is matched in its ASCII form, while both parts keep the
+    labels as given, e.g. `www.example.co.uk` is split into `www.example`
+    and `co.uk`. IP addresses are returned whole with an empty suffix.
+
+    Raises:
+        ValueError: If the host is empty, invalid or a public suffix
+            itself.
+    """
+    host = host.lower().rstrip(".")
+    if not host:
+        raise ValueError("Host is empty.")
+    # Top-level domains never end with a digit, only addresses do.
+    if host[-1].isdigit() or ":" in host:
+        try:
+            ipaddress.ip_address(host)
+        except ValueError:
+            pass
+        else:
+            return host, ""
+    labels = host.split(".")
+    if not all(labels):
+        raise ValueError(f"Host {host} has an empty label.")
+    ascii_labels = labels if host.isascii() else list(map(_to_ascii, labels))
+    length = suffix_length(ascii_labels, get_suffix_trie())
+    if length >= len(labels):
+        raise ValueError(f"Host {host} has no domain under its suffix.")
+    return ".".join(labels[:-length]), ".".join(labels[-length:])
@@ -0,0 +1,21 @@
+def next_check_interval(
+    interval: int,
+    ok: bool,
+    was_available: bool,
+    fail_count: int,
+    min_interval: int,
+    max_interval: int,
+    growth: float = 2,
+) -> int:
+    """Return the interval in seconds until the next check of a resource.
+
+    A resource that changed its availability is checked again after
+    `min_interval`. Stable available resources are checked `growth` times
+    less often after every check, failing ones less often as `fail_count`
+    grows. Both are capped by `max_interval`.
+    """
+    if ok != was_available:
+        return min_interval
+    if ok:
+        return min(max(int(interval * growth), min_interval), max_interval)
+    return min(min_interval * (fail_count + 1), max_interval)
@@ -0,0 +1,124 @@
+import hashlib
+import os
+import uuid
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import BinaryIO, NamedTuple
+
+from werkzeug.utils import import_string
+
+from web_resource_watchdog.settings import Config
+
+
+class BlobTooLarge(ValueError):
+    """Raised when a stream is longer than the allowed blob size."""
+
+
+class StoredBlob(NamedTuple):
+    """A blob written to a store.
+
+    Attributes:
+        ref (str): The reference to open or delete the blob with.
+        size (int): The size of the blob in bytes.
+        sha256 (str): The hex SHA-256 digest of the content.
+    """
+
+    ref: str
+    size: int
+    sha256: str
+
+
+class BlobStore(ABC):
+    """Storage for uploads handed over from the API to the workers.
+
+    Tasks receive only the reference returned by `put`, so the uploaded
+    data never goes through the Celery broker or result backend.
+    """
+
+    @abstractmethod
+    def put(self, stream: BinaryIO, max_size: int | None = None) -> StoredBlob:
+        """Store the content of a stream in one pass.
+
+        Raises:
+            BlobTooLarge: If the stream is longer than `max_size` bytes,
+                nothing is stored then.
+        """
+
+    @abstractmethod
+    def open(self, ref: str) -> BinaryIO:
+        """Open a stored blob for binary reading."""
+
+    @abstractmethod
+    def delete(self, ref: str) -> None:
+        """Delete a stored blob, ignoring already deleted ones."""
+
+
+class FileSystemBlobStore(BlobStore):
+    """Blob store keeping uploads as files in a spool directory.
+
+    The directory has to be shared between the API and the workers when
+    they run on different hosts or containers.
+    """
+
+    def __init__(self, root: str, chunk_size: int = 1024 * 1024):
+        self.root = root
+        self.chunk_size = chunk_size
+        os.makedirs(root, exist_ok=True)
+
+    def path(self, ref: str) -> str:
+        """Return the file path of a blob reference.
+
+        Raises:
+            ValueError: If the reference was not issued by this store.
+        """
+        return os.path.join(self.root, uuid.UUID(hex=ref).hex)
+
+    def put(self, stream: BinaryIO, max_size: int | None = None) -> StoredBlob:
+        """Copy the stream to the spool directory in chunks.
+
+        The content is hashed while it is copied, and the copy stops as
+        soon as it exceeds `max_size`, so memory use does not depend on
+        the size of the stream.
+        """
+        ref = uuid.uuid4().hex
+        path = self.path(ref)
+        partial_path = f"{path}.part"
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            with open(partial_path, "wb") as spool_file:
+                while chunk := stream.read(self.chunk_size):
+                    size += len(chunk)
+                    if max_size is not None and size > max_size:
+                        raise BlobTooLarge(
+                            f"Upload is larger than {max_size} bytes."
+                        )
+                    digest.update(chunk)
+                    spool_file.write(chunk)
+            os.replace(partial_path, path)
+        except BaseException:
+            self._remove(partial_path)
+            raise
+        return StoredBlob(ref, size, digest.hexdigest())
+
+    def open(self, ref: str) -> BinaryIO:
+        """Open a spooled file for binary reading."""
+        return open(self.path(ref), "rb")
+
+    def delete(self, ref: str) -> None:
+        """Remove a spooled file."""
+        self._remove(self.path(ref))
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+@lru_cache(maxsize=None)
+def get_blob_store() -> BlobStore:
+    """Return the upload spool configured in `Config`."""
+    store_class = import_string(Config.UPLOAD_SPOOL_STORE)
+    return store_class(Config.UPLOAD_SPOOL_DIR)
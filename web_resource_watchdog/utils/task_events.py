@@ -0,0 +1,207 @@
+import json
+import logging
+import time
+from collections import Counter
+from typing import Any, Iterator
+
+from celery import current_app
+from redis import Redis, RedisError
+
+from web_resource_watchdog.settings import Config
+
+FINAL_EVENTS = ("completed", "failed")
+
+logger = logging.getLogger(__name__)
+
+
+def get_events_client() -> Redis:
+    """Return the Redis client of the Celery result backend."""
+    return current_app.backend.client
+
+
+def publish_task_event(
+    task_id: str,
+    event: str,
+    data: dict[str, Any],
+    client: Redis | None = None,
+) -> None:
+    """Publish an event to the channel of a task.
+
+    Final events are also cached under `Config.TASK_STATE_KEY` for
+    `Config.TASK_STATE_TTL` seconds, so finished tasks are answered
+    without the result backend. Other events keep the task alive, see
+    `is_task_alive`. Events only inform clients, so a Redis failure is
+    logged instead of failing the task.
+    """
+    if client is None:
+        client = get_events_client()
+    message = json.dumps({"event": event, **data})
+    alive_key = Config.TASK_ALIVE_KEY.format(task_id=task_id)
+    try:
+        with client.pipeline() as pipeline:
+            if event in FINAL_EVENTS:
+                pipeline.set(
+                    Config.TASK_STATE_KEY.format(task_id=task_id),
+                    message,
+                    ex=Config.TASK_STATE_TTL,
+                )
+                pipeline.delete(alive_key)
+            else:
+                pipeline.set(alive_key, 1, ex=Config.TASK_ALIVE_TTL)
+            pipeline.publish(
+                Config.TASK_EVENTS_CHANNEL.format(task_id=task_id), message
+            )
+            pipeline.execute()
+    except RedisError:
+        logger.warning("Cannot publish %s event of task %s.", event, task_id)
+
+
+def get_final_task_state(
+    task_id: str, client: Redis | None = None
+) -> dict[str, Any] | None:
+    """Return the cached final event of a task, None if it is running."""
+    if client is None:
+        client = get_events_client()
+    state = client.get(Config.TASK_STATE_KEY.format(task_id=task_id))
+    return None if state is None else json.loads(state)
+
+
+def is_task_alive(task_id: str, client: Redis | None = None) -> bool:
+    """Check whether a task published an event lately.
+
+    A task is alive for `Config.TASK_ALIVE_TTL` seconds after it was
+    queued by `claim_upload` or published a progress event, so a worker
+    killed without a final event is noticed.
+    """
+    if client is None:
+        client = get_events_client()
+    return bool(client.exists(Config.TASK_ALIVE_KEY.format(task_id=task_id)))
+
+
+class TaskProgress:
+    """Progress counters of a job kept in a Redis hash.
+
+    Counters are accumulated locally and added to the hash with one
+    pipeline every `flush_every` updates or `flush_interval` seconds, so
+    hot loops do not wait for Redis. Every flush also publishes a
+    `progress` event with the totals. Several processes may report to the
+    same job, increments are atomic.
+
+    Attributes:
+        job_id (str, optional): The id clients know the job by, progress
+            without it is not saved.
+    """
+
+    def __init__(
+        self,
+        job_id: str | None,
+        client: Redis | None = None,
+        flush_every: int | None = None,
+        flush_interval: float | None = None,
+    ):
+        self.job_id = job_id
+        self.client = client
+        self.flush_every = flush_every or Config.TASK_PROGRESS_FLUSH_EVERY
+        self.flush_interval = (
+            flush_interval or Config.TASK_PROGRESS_FLUSH_INTERVAL
+        )
+        self._pending = Counter()
+        self._updates = 0
+        self._flushed_at = time.monotonic()
+
+    def __enter__(self) -> "TaskProgress":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.flush()
+
+    def add(self, **counters: int) -> None:
+        """Add to counters, flushing them if a batch is complete."""
+        self._pending.update(counters)
+        self._updates += 1
+        if (
+            self._updates >= self.flush_every
+            or time.monotonic() - self._flushed_at >= self.flush_interval
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        """Add pending counters to the hash and publish the totals."""
+        pending = dict(self._pending)
+        self._pending.clear()
+        self._updates = 0
+        self._flushed_at = time.monotonic()
+        if not pending or self.job_id is None:
+            return
+        if self.client is None:
+            self.client = get_events_client()
+        key = Config.TASK_PROGRESS_KEY.format(task_id=self.job_id)
+        try:
+            with self.client.pipeline() as pipeline:
+                for name, value in pending.items():
+                    pipeline.hincrby(key, name, value)
+                pipeline.expire(key, Config.TASK_STATE_TTL)
+                totals = pipeline.execute()
+        except RedisError:
+            logger.warning("Cannot save progress of task %s.", self.job_id)
+            return
+        publish_task_event(
+            self.job_id,
+            "progress",
+            {"status": "pending", "progress": dict(zip(pending, totals))},
+            self.client,
+        )
+
+
+def get_task_progress(
+    task_id: str, client: Redis | None = None
+) -> dict[str, int]:
+    """Return the progress counters of a task."""
+    if client is None:
+        client = get_events_client()
+    progress = client.hgetall(Config.TASK_PROGRESS_KEY.format(task_id=task_id))
+    return {name.decode(): int(value) for name, value in progress.items()}
+
+
+def format_sse(data: dict[str, Any]) -> str:
+    """Format an event as a Server-Sent Events message."""
+    return f"event: {data['event']}\ndata: {json.dumps(data)}\n\n"
+
+
+def stream_task_events(
+    task_id: str,
+    timeout: float,
+    heartbeat: float,
+    client: Redis | None = None,
+) -> Iterator[str]:
+    """Yield Server-Sent Events of a task until it finishes.
+
+    The cached final state is checked after subscribing, so an event
+    published in between is not lost. A comment is sent every `heartbeat`
+    seconds without events, and the stream ends after `timeout` seconds.
+    """
+    if client is None:
+        client = get_events_client()
+    state = get_final_task_state(task_id, client)
+    if state is not None:
+        yield format_sse(state)
+        return
+    pubsub = client.pubsub(ignore_subscribe_messages=True)
+    pubsub.subscribe(Config.TASK_EVENTS_CHANNEL.format(task_id=task_id))
+    try:
+        state = get_final_task_state(task_id, client)
+        if state is not None:
+            yield format_sse(state)
+            return
+        deadline = time.monotonic() + timeout
+        while (remaining := deadline - time.monotonic()) > 0:
+            message = pubsub.get_message(timeout=min(heartbeat, remaining))
+            if message is None:
+                yield ": keep-alive\n\n"
+                continue
+            data = json.loads(message["data"])
+            yield format_sse(data)
+            if data["event"] in FINAL_EVENTS:
+                return
+    finally:
+        pubsub.close()
@@ -0,0 +1,138 @@
+import json
+import logging
+
+from redis import Redis, RedisError
+
+from web_resource_watchdog.settings import Config
+from web_resource_watchdog.utils.task_events import get_events_client
+
+logger = logging.getLogger(__name__)
+
+
+def _mark_alive(client: Redis, task_id: str) -> None:
+    """Mark a queued task alive until it publishes its first event."""
+    client.set(
+        Config.TASK_ALIVE_KEY.format(task_id=task_id),
+        1,
+        ex=Config.TASK_ALIVE_TTL,
+    )
+
+
+def claim_upload(
+    sha256: str, task_id: str, client: Redis | None = None
+) -> str | None:
+    """Map an upload digest to the task processing it, unless mapped.
+
+    The mapping expires after `Config.UPLOAD_DEDUPE_TTL` seconds. The task
+    is marked alive until it publishes events itself, see
+    `is_task_alive`, so a mapping to a task which never ran or was killed
+    is noticed. Uploads are processed anyway if Redis is unavailable.
+
+    Returns:
+        str | None: The id of the task which already processes the same
+        content, None if `task_id` claimed it.
+    """
+    if client is None:
+        client = get_events_client()
+    key = Config.UPLOAD_DIGEST_KEY.format(sha256=sha256)
+    try:
+        with client.pipeline() as pipeline:
+            pipeline.set(key, task_id, nx=True, ex=Config.UPLOAD_DEDUPE_TTL)
+            pipeline.get(key)
+            _mark_alive(pipeline, task_id)
+            claimed, owner, _ = pipeline.execute()
+    except RedisError:
+        logger.warning("Cannot deduplicate upload %s.", sha256)
+        return None
+    return None if claimed or owner is None else owner.decode()
+
+
+def reclaim_upload(
+    sha256: str, task_id: str, client: Redis | None = None
+) -> None:
+    """Map an upload digest to a new task, e.g. after the old one failed."""
+    if client is None:
+        client = get_events_client()
+    try:
+        with client.pipeline() as pipeline:
+            pipeline.set(
+                Config.UPLOAD_DIGEST_KEY.format(sha256=sha256),
+                task_id,
+                ex=Config.UPLOAD_DEDUPE_TTL,
+            )
+            _mark_alive(pipeline, task_id)
+            pipeline.execute()
+    except RedisError:
+        logger.warning("Cannot deduplicate upload %s.", sha256)
+
+
+def release_upload(
+    sha256: str, task_id: str, client: Redis | None = None
+) -> None:
+    """Forget the task of an upload digest, so it is processed again."""
+    if client is None:
+        client = get_events_client()
+    try:
+        client.delete(
+            Config.UPLOAD_DIGEST_KEY.format(sha256=sha256),
+            Config.TASK_ALIVE_KEY.format(task_id=task_id),
+        )
+    except RedisError:
+        logger.warning("Cannot release upload %s.", sha256)
+
+
+class MemberCache:
+    """Urls found in archive members, keyed by the SHA-256 of their content.
+
+    Archives sharing most of their files with earlier uploads only scan
+    the new members. Entries are also keyed by the `UrlExtractor.key` of
+    the scan and expire after `Config.MEMBER_CACHE_TTL` seconds. Corrupt
+    members and members with more than `Config.MEMBER_CACHE_MAX_URLS`
+    urls are not cached. Redis failures are logged and treated as misses.
+    """
+
+    def __init__(self, client: Redis | None = None):
+        self.client = client
+
+    def _client(self) -> Redis:
+        if self.client is None:
+            self.client = get_events_client()
+        return self.client
+
+    def get(
+        self, sha256: str, extractor: str
+    ) -> tuple[list, str | None] | None:
+        """Return cached urls and error kind of a member, None if unknown.
+
+        The error kind is a key of `zipfile.MEMBER_ERRORS`.
+        """
+        try:
+            value = self._client().get(
+                Config.MEMBER_CACHE_KEY.format(
+                    extractor=extractor, sha256=sha256
+                )
+            )
+        except RedisError:
+            logger.warning("Member cache is unavailable.")
+            return None
+        if value is None:
+            return None
+        urls, error = json.loads(value)
+        return urls, error
+
+    def set(
+        self, sha256: str, extractor: str, urls: list, error: str | None
+    ) -> None:
+        """Cache the urls and error kind of a scanned member."""
+        if error == "corrupt" or len(urls) > Config.MEMBER_CACHE_MAX_URLS:
+            return
+        try:
+            self._client().set(
+                Config.MEMBER_CACHE_KEY.format(
+                    extractor=extractor, sha256=sha256
+                ),
+                json.dumps([list(urls), error]),
+                ex=Config.MEMBER_CACHE_TTL,
+            )
+        except RedisError:
+            logger.warning("Member cache is unavailable.")
@@ -0,0 +1,202 @@
+import codecs
+import hashlib
+import re
+from typing import BinaryIO
+
+URL_PATTERN = re.compile(
+    (
+        r"\b(?:http|ftp|https)://(?:[\w_-]+(?:(?:\.[\w_-]+)+))"
+        r"(?:[\w.,@?^=%&:/~+#-]*[\w@?^=%&/~+#-])\b"
+    )
+)
+URL_ANCHOR = b"://"
+# ASCII characters `URL_PATTERN` never matches, urls cannot span them.
+URL_SEPARATORS = bytes(
+    code
+    for code in range(128)
+    if not re.match(r"[\w.,@?^=%&:/~+#-]", chr(code))
+)
+WHITESPACE = b" \t\n\r\x0b\x0c"
+URL_OVERLAP = 4096
+
+
+def _match_value(match: re.Match) -> str | tuple[str, ...]:
+    """Return the value `re.Pattern.findall` would return for a match."""
+    if match.re.groups == 0:
+        return match.group()
+    if match.re.groups == 1:
+        return match.group(1)
+    return match.groups()
+
+
+def _scan_window(
+    text: str,
+    pattern: re.Pattern,
+    overlap: int,
+    final: bool = False,
+) -> tuple[list, str]:
+    """Find urls in a text window and return them with a carry-over tail.
+
+    Matches ending in the last `overlap` characters may be cut by the
+    chunk boundary, so they are kept in the tail and scanned again
+    together with the next chunk.
+    """
+    if final:
+        return pattern.findall(text), ""
+    limit = len(text) - overlap
+    if limit <= 0:
+        return [], text
+    finds = []
+    keep_from = limit
+    for match in pattern.finditer(text):
+        if match.end() > limit:
+            keep_from = max(min(match.start(), limit), limit - overlap)
+            break
+        finds.append(_match_value(match))
+    return finds, text[keep_from:]
+
+
+class UrlExtractor:
+    """Find matches of a pattern in bytes without decoding them whole.
+
+    Matches are assumed to contain `anchor` and none of `separators`,
+    which must be ASCII. Occurrences of the anchor are located with
+    `bytes.find`, and only the run of bytes between the separators around
+    each one is decoded and matched, so text without urls costs a few
+    scans in C. Text is still checked to be utf-8, which is a single
+    `bytes.isascii` call for ASCII text. `URL_PATTERN` is matched with its
+    exact separators, the result equals `findall` over the decoded text.
+    Custom patterns are cut at whitespace, and without an anchor the whole
+    text is decoded and matched as before.
+
+    Attributes:
+        pattern (re.Pattern): The pattern of values to find.
+        anchor (bytes, optional): The literal every match contains.
+        key (str): A digest of the pattern, anchor and separators,
+            extractors with equal keys find the same matches.
+    """
+
+    def __init__(
+        self,
+        pattern: re.Pattern | None = None,
+        anchor: bytes | None = None,
+        separators: bytes | None = None,
+    ):
+        if pattern is None:
+            pattern = URL_PATTERN
+        if pattern is URL_PATTERN:
+            anchor = anchor or URL_ANCHOR
+            separators = separators or URL_SEPARATORS
+        separators = separators or WHITESPACE
+        if not separators.isascii() or (
+            anchor and any(byte in separators for byte in anchor)
+        ):
+            raise ValueError("Separators must be ASCII and not in anchor.")
+        self.pattern = pattern
+        self.anchor = anchor
+        table = bytearray(range(256))
+        for byte in separators:
+            table[byte] = ord(" ")
+        self._separators_table = bytes(table)
+        self.key = hashlib.sha256(
+            repr(
+                (
+                    pattern.pattern,
+                    pattern.flags,
+                    anchor,
+                    self._separators_table,
+                )
+            ).encode()
+        ).hexdigest()
+
+    def _scan(
+        self, data: bytes, spaced: bytes, end: int, values: list
+    ) -> None:
+        """Add matches in tokens of `data[:end]` containing the anchor.
+
+        `spaced` is data with separators replaced by spaces, `data[:end]`
+        must end at a separator or at a character boundary.
+        """
+        position = data.find(self.anchor, 0, end)
+        while position != -1:
+            start = spaced.rfind(b" ", 0, position) + 1
+            stop = spaced.find(b" ", position, end)
+            if stop == -1:
+                stop = end
+            values.extend(self.pattern.findall(data[start:stop].decode()))
+            position = data.find(self.anchor, stop, end)
+
+    def findall(self, data: bytes) -> list:
+        """Return all matches in data like `re.Pattern.findall`.
+
+        Raises:
+            UnicodeDecodeError: If data is not valid utf-8.
+        """
+        if self.anchor is None:
+            return self.pattern.findall(data.decode("utf-8"))
+        if not data.isascii():
+            data.decode("utf-8")
+        values = []
+        spaced = data.translate(self._separators_table)
+        self._scan(data, spaced, len(data), values)
+        return values
+
+    def find_in_stream(
+        self,
+        stream: BinaryIO,
+        chunk_size: int,
+        overlap: int = URL_OVERLAP,
+    ) -> set:
+        """Find distinct matches in a binary stream read in chunks.
+
+        The last, unterminated token of a chunk is carried over to the
+        next one. Matches up to `overlap` bytes long are found even when
+        they straddle a chunk boundary.
+
+        Raises:
+            UnicodeDecodeError: If the stream is not valid utf-8.
+        """
+        if self.anchor is None:
+            return self._find_in_text_stream(stream, chunk_size, overlap)
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        values = []
+        tail = b""
+        while chunk := stream.read(chunk_size):
+            if not chunk.isascii() or decoder.getstate()[0]:
+                decoder.decode(chunk)
+            data = tail + chunk
+            spaced = data.translate(self._separators_table)
+            end = spaced.rfind(b" ") + 1
+            if len(data) - end > overlap:
+                end = len(data) - overlap
+                # Do not cut a multibyte character.
+                while end and data[end] & 0xC0 == 0x80:
+                    end -= 1
+            self._scan(data, spaced, end, values)
+            tail = data[end:]
+        decoder.decode(b"", final=True)
+        self._scan(
+            tail, tail.translate(self._separators_table), len(tail), values
+        )
+        return set(values)
+
+    def _find_in_text_stream(
+        self, stream: BinaryIO, chunk_size: int, overlap: int
+    ) -> set:
+        """Find matches decoding the stream incrementally as utf-8."""
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        result = set()
+        tail = ""
+        while chunk := stream.read(chunk_size):
+            finds, tail = _scan_window(
+                tail + decoder.decode(chunk), self.pattern, overlap
+            )
+            result.update(finds)
+        finds, _ = _scan_window(
+            tail + decoder.decode(b"", final=True),
+            self.pattern,
+            overlap,
+            final=True,
+        )
+        result.update(finds)
+        return result
@@ -0,0 +1,30 @@
+from urllib.parse import urlsplit, urlunsplit
+
+DEFAULT_PORTS = {"http": 80, "https": 443, "ftp": 21}
+
+
+def canonicalize_url(url: str) -> str:
+    """Return the canonical form of an url.
+
+    The scheme and host are lowercased, default ports, the fragment and a
+    bare `/` path are dropped and query parameters are sorted, keeping
+    their original encoding. Credentials and the path are kept as is.
+
+    Raises:
+        ValueError: If the url has no host or an invalid port.
+    """
+    parsed_url = urlsplit(url.strip())
+    scheme = parsed_url.scheme.lower()
+    host = parsed_url.hostname
+    if not host:
+        raise ValueError(f"Url {url} has no host.")
+    if ":" in host:
+        host = f"[{host}]"
+    port = parsed_url.port
+    if port is not None and port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{port}"
+    userinfo, _, _ = parsed_url.netloc.rpartition("@")
+    netloc = f"{userinfo}@{host}" if userinfo else host
+    path = "" if parsed_url.path == "/" else parsed_url.path
+    query = "&".join(sorted(filter(None, parsed_url.query.split("&"))))
+    return urlunsplit((scheme, netloc, path, query, ""))
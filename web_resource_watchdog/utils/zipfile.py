@@ -1,38 +1,290 @@
+import hashlib
+import heapq
 import io
+import lzma
 import re
+import tarfile
+import tempfile
+import time
 import zipfile
+import zlib
+from typing import BinaryIO, Callable, Iterable, Iterator
 
-URL_PATTERN = re.compile(
-    (
-        r"\b(?:http|ftp|https)://(?:[\w_-]+(?:(?:\.[\w_-]+)+))"
-        r"(?:[\w.,@?^=%&:/~+#-]*[\w@?^=%&/~+#-])\b"
+from web_resource_watchdog.utils.archives import (
+    ArchiveError,
+    ArchiveMember,
+    open_archive,
+)
+from web_resource_watchdog.utils.metrics import observe_stage
+from web_resource_watchdog.utils.upload_dedupe import MemberCache
+from web_resource_watchdog.utils.url_extractor import URL_PATTERN  # noqa
+from web_resource_watchdog.utils.url_extractor import URL_OVERLAP, UrlExtractor
+
+
+def find_urls_in_stream(
+    stream: BinaryIO,
+    pattern: re.Pattern,
+    chunk_size: int,
+    overlap: int = URL_OVERLAP,
+    anchor: bytes | None = None,
+) -> set:
+    """Find urls in a binary stream reading it in fixed-size chunks.
+
+    See `UrlExtractor` for how `anchor` narrows down the text matched.
+
+    Raises:
+        UnicodeDecodeError: If the stream is not valid utf-8.
+    """
+    return UrlExtractor(pattern, anchor).find_in_stream(
+        stream, chunk_size, overlap
     )
+
+
+# Members are copied in memory up to this size when cached, see
+# `_scan_cached_member`.
+MEMBER_SPOOL_SIZE = 8 * 1024 * 1024
+MEMBER_COPY_CHUNK_SIZE = 1024 * 1024
+
+# Errors of reading corrupt or truncated zip, tar and compressed data.
+CORRUPT_DATA_ERRORS = (
+    zipfile.BadZipFile,
+    tarfile.TarError,
+    lzma.LZMAError,
+    zlib.error,
+    EOFError,
+    OSError,
 )
+ARCHIVE_CORRUPT_ERROR = "Archive is corrupt, files after {filename} are lost."
+
+MEMBER_ERRORS = {
+    "decode": "Cannot decode file {filename}.",
+    "empty": "File {filename} has no urls.",
+    "corrupt": "File {filename} is corrupt.",
+}
+
+
+class _CountingReader:
+    """Binary stream wrapper counting the bytes read from it.
+
+    Reading more than `limit` bytes raises `ArchiveError`, so a stream
+    decompressing to more than allowed is stopped early. The time spent
+    reading, i.e. decompressing, is summed up in `seconds`.
+    """
+
+    def __init__(self, stream: BinaryIO, limit: int | None = None):
+        self.stream = stream
+        self.limit = limit
+        self.count = 0
+        self.seconds = 0.0
+
+    def read(self, size: int = -1) -> bytes:
+        if self.limit is not None:
+            # Read one byte more than allowed to detect an excess.
+            remaining = self.limit - self.count + 1
+            size = remaining if size < 0 else min(size, remaining)
+        started = time.perf_counter()
+        data = self.stream.read(size)
+        self.seconds += time.perf_counter() - started
+        self.count += len(data)
+        if self.limit is not None and self.count > self.limit:
+            raise ArchiveError("Archive is too large uncompressed.")
+        return data
+
+
+def _scan_member(
+    reader: BinaryIO,
+    extractor: UrlExtractor,
+    chunk_size: int | None,
+    overlap: int,
+) -> tuple[Iterable, str | None]:
+    """Find urls in an archive member and the kind of its error if any."""
+    try:
+        if chunk_size:
+            finds = extractor.find_in_stream(reader, chunk_size, overlap)
+        else:
+            finds = extractor.findall(reader.read())
+    except UnicodeDecodeError:
+        return (), "decode"
+    except CORRUPT_DATA_ERRORS:
+        return (), "corrupt"
+    return finds, None if finds else "empty"
+
+
+def _scan_cached_member(
+    reader: _CountingReader,
+    extractor: UrlExtractor,
+    chunk_size: int | None,
+    overlap: int,
+    member_cache: MemberCache,
+) -> tuple[Iterable, str | None]:
+    """Find urls in an archive member unless its content was scanned.
 
+    The member is copied to a spooled temporary file while its SHA-256 is
+    computed, so zip members are CRC-checked before the cache is used.
+    Entries are keyed by the digest and `UrlExtractor.key`, corrupt
+    members are not cached.
+    """
+    digest = hashlib.sha256()
+    with tempfile.SpooledTemporaryFile(MEMBER_SPOOL_SIZE) as copy:
+        try:
+            while chunk := reader.read(chunk_size or MEMBER_COPY_CHUNK_SIZE):
+                digest.update(chunk)
+                copy.write(chunk)
+        except CORRUPT_DATA_ERRORS:
+            return (), "corrupt"
+        sha256 = digest.hexdigest()
+        cached = member_cache.get(sha256, extractor.key)
+        if cached is not None:
+            return cached
+        copy.seek(0)
+        finds, error = _scan_member(copy, extractor, chunk_size, overlap)
+    member_cache.set(sha256, extractor.key, list(set(finds)), error)
+    return finds, error
 
-def parse_zip_file(
-    file: bytes,
+
+def _iter_members(
+    archive: Iterable[tuple[str, BinaryIO]], errors: list[str]
+) -> Iterator[tuple[str, BinaryIO]]:
+    """Yield the files of an archive until its data turns out corrupt.
+
+    Formats without an index find their next file by reading on, so a
+    truncated archive ends the files with an error instead of an
+    exception.
+    """
+    filename = None
+    members = iter(archive)
+    while True:
+        try:
+            filename, stream = next(members)
+        except StopIteration:
+            return
+        except CORRUPT_DATA_ERRORS:
+            if filename is None:
+                raise
+            errors.append(ARCHIVE_CORRUPT_ERROR.format(filename=filename))
+            return
+        yield filename, stream
+
+
+def parse_archive(
+    file: bytes | BinaryIO,
     pattern: re.Pattern | None = None,
+    chunk_size: int | None = None,
+    overlap: int = URL_OVERLAP,
+    members: list[int] | None = None,
+    on_member: Callable[[ArchiveMember, int], None] | None = None,
+    anchor: bytes | None = None,
+    max_members: int | None = None,
+    max_size: int | None = None,
+    member_cache: MemberCache | None = None,
 ) -> dict[str, list[str]]:
-    """Parse a zip file containing text files and extracts URLs."""
-    if pattern is None:
-        pattern = URL_PATTERN
-    zip_buffer = io.BytesIO(file)
+    """Parse an archive containing text files and extracts URLs.
+
+    The format is sniffed from the content, see `open_archive`. If
+    `chunk_size` is set, files are streamed in chunks of that size
+    instead of being read at once, so peak memory depends on the chunk
+    size and not on the file size. If `members` is set, only zip members
+    at these indexes of the central directory are parsed. `on_member` is
+    called after every parsed file with its name and size and the number
+    of distinct urls found in it. Files are matched by `UrlExtractor`
+    with `pattern` and `anchor`.
+
+    The archive is read once: zip members are CRC-checked while they are
+    read, and corrupt or truncated files of any format are reported as
+    errors, keeping the urls found before. Reading more than
+    `max_members` files or `max_size` uncompressed bytes in total stops
+    the parsing, this guards formats without an index against bombs.
+    With `member_cache`, urls of files with content scanned before by an
+    equal extractor are taken from the cache instead of scanned again.
+
+    Raises:
+        ArchiveError: If the archive format is not supported or a limit
+            is exceeded.
+    """
+    extractor = UrlExtractor(pattern, anchor)
+    archive_buffer = io.BytesIO(file) if isinstance(file, bytes) else file
     result = set()
     errors = []
-    with zipfile.ZipFile(zip_buffer, "r") as zipf:
-        for file in zipf.infolist():
-            if file.is_dir():
-                continue
-            with zipf.open(file) as file_in_zip:
-                try:
-                    file_data = file_in_zip.read().decode("utf-8")
-                except UnicodeDecodeError:
-                    errors.append(f"Cannot decode file {file.filename}.")
-                else:
-                    finds = pattern.findall(file_data)
-                    if finds:
-                        result.update(finds)
-                    else:
-                        errors.append(f"File {file.filename} has no urls.")
+    # Stage metrics are recorded once per archive to keep them cheap.
+    decode_seconds = scan_seconds = 0.0
+    scanned_bytes = 0
+    for index, (filename, stream) in enumerate(
+        _iter_members(open_archive(archive_buffer, members), errors)
+    ):
+        if max_members is not None and index >= max_members:
+            raise ArchiveError(f"Archive has more than {max_members} files.")
+        reader = _CountingReader(stream, max_size)
+        started = time.perf_counter()
+        if member_cache is None:
+            finds, error = _scan_member(reader, extractor, chunk_size, overlap)
+        else:
+            finds, error = _scan_cached_member(
+                reader, extractor, chunk_size, overlap, member_cache
+            )
+        decode_seconds += reader.seconds
+        scan_seconds += time.perf_counter() - started - reader.seconds
+        scanned_bytes += reader.count
+        if error is not None:
+            errors.append(MEMBER_ERRORS[error].format(filename=filename))
+        result.update(finds)
+        if max_size is not None:
+            max_size -= reader.count
+        if on_member is not None:
+            on_member(ArchiveMember(filename, reader.count), len(set(finds)))
+    if scanned_bytes:
+        observe_stage("zip_decode", decode_seconds, scanned_bytes)
+        observe_stage("url_scan", scan_seconds, scanned_bytes)
     return {"data": list(result), "errors": errors}
+
+
+# The name used when only zip archives were supported.
+parse_zip_file = parse_archive
+
+
+def split_zip_members(
+    file: bytes | BinaryIO,
+    groups: int,
+    threshold: int = 0,
+) -> list[list[int]]:
+    """Split zip members into groups of about equal uncompressed size.
+
+    Members are given by their index in the central directory, as names
+    may repeat in an archive. Only the central directory is read.
+    Archives with total uncompressed size below `threshold` are returned
+    as a single group.
+    """
+    zip_buffer = io.BytesIO(file) if isinstance(file, bytes) else file
+    with zipfile.ZipFile(zip_buffer, "r") as zipf:
+        infolist = [
+            (position, info)
+            for position, info in enumerate(zipf.infolist())
+            if not info.is_dir()
+        ]
+    total_size = sum(info.file_size for _, info in infolist)
+    if groups <= 1 or total_size < threshold or len(infolist) <= 1:
+        return [[position for position, _ in infolist]]
+    bins = [(0, index, []) for index in range(min(groups, len(infolist)))]
+    heapq.heapify(bins)
+    for position, info in sorted(
+        infolist, key=lambda item: -item[1].file_size
+    ):
+        size, index, positions = heapq.heappop(bins)
+        positions.append(position)
+        heapq.heappush(bins, (size + info.file_size, index, positions))
+    # Members are read in archive order.
+    return [
+        sorted(positions)
+        for _, _, positions in sorted(bins, key=lambda item: item[1])
+    ]
+
+
+def merge_parse_results(
+    results: list[dict[str, list[str]]]
+) -> dict[str, list[str]]:
+    """Merge results of `parse_archive` calls over parts of one archive."""
+    data = set()
+    errors = []
+    for result in results:
+        data.update(result["data"])
+        errors.extend(result["errors"])
+    return {"data": list(data), "errors": errors}